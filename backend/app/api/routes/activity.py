@@ -1,15 +1,19 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session, select, func
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timedelta
-from app.db.database import get_session
+from app.db.database import get_async_read_session
 from app.models.schemas import AgentLog, Job, Candidate, JobCandidate
+from app.services.pipeline_checkpoints import list_timings
+from app.utils.timing import compare_waterfalls
 
 router = APIRouter(prefix="/activity", tags=["activity"])
 
 @router.get("/feed")
-def get_activity_feed(
-    session: Session = Depends(get_session),
+async def get_activity_feed(
+    session: AsyncSession = Depends(get_async_read_session),
     job_id: Optional[int] = Query(None, description="Filter by job ID"),
     limit: int = Query(50, description="Maximum number of activities to return", le=200),
     offset: int = Query(0, description="Number of activities to skip")
@@ -23,7 +27,7 @@ def get_activity_feed(
         query = query.where(AgentLog.job_id == job_id)
     
     query = query.order_by(AgentLog.timestamp.desc()).offset(offset).limit(limit)
-    logs = session.exec(query).all()
+    logs = (await session.exec(query)).all()
     
     # Convert logs to activity format
     activities = []
@@ -45,8 +49,8 @@ def get_activity_feed(
     return activities
 
 @router.get("/stats")
-def get_activity_stats(
-    session: Session = Depends(get_session),
+async def get_activity_stats(
+    session: AsyncSession = Depends(get_async_read_session),
     days: int = Query(7, description="Number of days to look back for stats")
 ):
     """
@@ -55,21 +59,21 @@ def get_activity_stats(
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     # Total activities
-    total_activities = session.exec(
+    total_activities = (await session.exec(
         select(func.count(AgentLog.id)).where(AgentLog.timestamp >= cutoff_date)
-    ).first() or 0
+    )).first() or 0
     
     # Activities by type
-    activity_types = session.exec(
+    activity_types = (await session.exec(
         select(AgentLog.logtype, func.count(AgentLog.id))
         .where(AgentLog.timestamp >= cutoff_date)
         .group_by(AgentLog.logtype)
-    ).all()
+    )).all()
     
     type_counts = {logtype: count for logtype, count in activity_types}
     
     # Recent job activity
-    recent_jobs = session.exec(
+    recent_jobs = (await session.exec(
         select(AgentLog.job_id, func.count(AgentLog.id))
         .where(
             AgentLog.timestamp >= cutoff_date,
@@ -78,7 +82,7 @@ def get_activity_stats(
         .group_by(AgentLog.job_id)
         .order_by(func.count(AgentLog.id).desc())
         .limit(5)
-    ).all()
+    )).all()
     
     job_activity = [{"job_id": job_id, "activity_count": count} for job_id, count in recent_jobs]
     
@@ -90,9 +94,17 @@ def get_activity_stats(
     }
 
 @router.get("/pipeline/{job_id}")
-def get_pipeline_activity(job_id: int, session: Session = Depends(get_session)):
+async def get_pipeline_activity(
+    job_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    runs: int = Query(10, description="Number of recent pipeline runs to include timing for", le=50)
+):
     """
     Get pipeline-specific activity for a job
+    
+    Includes the timing waterfall of the latest pipeline run (per-step and
+    per-call durations, wall clock and concurrency), summaries of earlier
+    runs, and the latest run's deltas against the previous completed one.
     """
     # Get all logs for this job
     query = (
@@ -100,7 +112,7 @@ def get_pipeline_activity(job_id: int, session: Session = Depends(get_session)):
         .where(AgentLog.job_id == job_id)
         .order_by(AgentLog.timestamp.desc())
     )
-    logs = session.exec(query).all()
+    logs = (await session.exec(query)).all()
     
     # Group by pipeline stages
     pipeline_stages = {
@@ -130,15 +142,40 @@ def get_pipeline_activity(job_id: int, session: Session = Depends(get_session)):
                 "metadata": log.context
             })
     
+    # Timing waterfalls, newest first
+    timings = await asyncio.to_thread(list_timings, job_id, runs)
+    latest = timings[0] if timings else None
+    baseline = next((t for t in timings[1:] if t["status"] == "completed"), None)
+    
     return {
         "job_id": job_id,
         "pipeline_stages": pipeline_stages,
-        "other_activities": other_activities
+        "other_activities": other_activities,
+        "timing": {
+            "latest": latest,
+            "history": [
+                {
+                    "pipeline_id": t["pipeline_id"],
+                    "mode": t["mode"],
+                    "status": t["status"],
+                    "created_at": t["created_at"],
+                    "wall_seconds": t["waterfall"]["wall_seconds"],
+                    "total_seconds": t["waterfall"]["total_seconds"],
+                    "concurrency": t["waterfall"]["concurrency"],
+                    "steps": {step["name"]: step["duration"] for step in t["waterfall"]["steps"]}
+                }
+                for t in timings
+            ],
+            "comparison": {
+                "baseline_pipeline_id": baseline["pipeline_id"],
+                **compare_waterfalls(latest["waterfall"], baseline["waterfall"])
+            } if latest and baseline else None
+        }
     }
 
 @router.get("/recent-outreach")
-def get_recent_outreach(
-    session: Session = Depends(get_session),
+async def get_recent_outreach(
+    session: AsyncSession = Depends(get_async_read_session),
     limit: int = Query(20, description="Maximum number of outreach events to return")
 ):
     """
@@ -151,7 +188,7 @@ def get_recent_outreach(
         .limit(limit)
     )
     
-    outreach_logs = session.exec(query).all()
+    outreach_logs = (await session.exec(query)).all()
     
     activities = []
     for log in outreach_logs:
@@ -1,7 +1,8 @@
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
-from app.db.database import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.database import get_async_session, get_async_read_session
 from app.models.schemas import Candidate, JobCandidate, XSignal
 from app.utils.logger import AgentLogger
 from pydantic import BaseModel
@@ -68,8 +69,8 @@ def get_candidate_stages():
     }
 
 @router.get("/")
-def get_candidates(
-    session: Session = Depends(get_session),
+async def get_candidates(
+    session: AsyncSession = Depends(get_async_read_session),
     job_id: Optional[int] = Query(None, description="Filter candidates by job ID"),
     status: Optional[str] = Query(None, description="Filter by candidate status"),
     limit: int = Query(100, description="Maximum number of candidates to return", le=500),
@@ -84,12 +85,12 @@ def get_candidates(
         if status:
             jc_query = jc_query.where(JobCandidate.stage == status)
         jc_query = jc_query.offset(offset).limit(limit)
-        job_candidates = session.exec(jc_query).all()
+        job_candidates = (await session.exec(jc_query)).all()
         
         # Get corresponding candidates and combine data
         candidates = []
         for job_candidate in job_candidates:
-            candidate = session.get(Candidate, job_candidate.candidate_id)
+            candidate = await session.get(Candidate, job_candidate.candidate_id)
             if candidate:
                 candidate_dict = {
                     "id": candidate.id,
@@ -112,13 +113,13 @@ def get_candidates(
     else:
         # Get all candidates with their job relationships
         query = select(Candidate).offset(offset).limit(limit)
-        all_candidates = session.exec(query).all()
+        all_candidates = (await session.exec(query)).all()
         
         result = []
         for candidate in all_candidates:
             # Get all jobs for this candidate
             jc_query = select(JobCandidate).where(JobCandidate.candidate_id == candidate.id)
-            job_candidates = session.exec(jc_query).all()
+            job_candidates = (await session.exec(jc_query)).all()
             
             # If candidate is in jobs, return with best score
             if job_candidates:
@@ -165,39 +166,39 @@ def get_candidates(
         return result
 
 @router.get("/{candidate_id}", response_model=Candidate)
-def get_candidate(candidate_id: int, session: Session = Depends(get_session)):
+async def get_candidate(candidate_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """
     Get a specific candidate by ID
     """
-    candidate = session.get(Candidate, candidate_id)
+    candidate = await session.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
 @router.get("/{candidate_id}/jobs")
-def get_candidate_jobs(candidate_id: int, session: Session = Depends(get_session)):
+async def get_candidate_jobs(candidate_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """
     Get all jobs a candidate has been considered for
     """
     query = select(JobCandidate).where(JobCandidate.candidate_id == candidate_id)
-    job_candidates = session.exec(query).all()
+    job_candidates = (await session.exec(query)).all()
     return job_candidates
 
 @router.get("/{candidate_id}/signals", response_model=List[XSignal])
-def get_candidate_signals(candidate_id: int, session: Session = Depends(get_session)):
+async def get_candidate_signals(candidate_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """
     Get X signals for a candidate
     """
     query = select(XSignal).where(XSignal.candidate_id == candidate_id)
-    signals = session.exec(query).all()
+    signals = (await session.exec(query)).all()
     return signals
 
 @router.post("/{candidate_id}/jobs/{job_id}/update-stage")
-def update_candidate_stage(
+async def update_candidate_stage(
     candidate_id: int,
     job_id: int,
     request: StageUpdateRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Update a candidate's stage for a specific job
@@ -214,13 +215,13 @@ def update_candidate_stage(
         JobCandidate.candidate_id == candidate_id,
         JobCandidate.job_id == job_id
     )
-    job_candidate = session.exec(query).first()
+    job_candidate = (await session.exec(query)).first()
     
     if not job_candidate:
         raise HTTPException(status_code=404, detail="Job-candidate relationship not found")
     
     # Get candidate name for logging
-    candidate = session.get(Candidate, candidate_id)
+    candidate = await session.get(Candidate, candidate_id)
     candidate_name = candidate.name if candidate else f"Candidate {candidate_id}"
     
     # Store previous stage for logging
@@ -230,8 +231,8 @@ def update_candidate_stage(
     job_candidate.stage = request.stage
     job_candidate.updated_at = datetime.utcnow()
     session.add(job_candidate)
-    session.commit()
-    session.refresh(job_candidate)
+    await session.commit()
+    await session.refresh(job_candidate)
     
     # Log the stage change
     stage_display = {
@@ -266,17 +267,17 @@ def update_candidate_stage(
 
 # Keep the old endpoint for backward compatibility
 @router.post("/{candidate_id}/jobs/{job_id}/update-status")
-def update_candidate_status(
+async def update_candidate_status(
     candidate_id: int,
     job_id: int,
     status: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Update a candidate's status for a specific job (legacy endpoint)
     """
     request = StageUpdateRequest(stage=status)
-    return update_candidate_stage(candidate_id, job_id, request, session)
+    return await update_candidate_stage(candidate_id, job_id, request, session)
 
 @router.get("/stages")
 def get_candidate_stages():
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, Optional
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from app.services.event_hub import event_hub
+from app.services.pipeline_queue import get_pipeline_queue
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Don't let a proxy buffer the stream
+}
+
+
+def _sse(event: Dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _stream(
+    request: Request,
+    snapshot: Dict,
+    job_id: Optional[int] = None,
+    pipeline_id: Optional[str] = None,
+    last_event_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    # Current queue state first (no id, so it never moves the resume point)
+    yield f"retry: 3000\nevent: snapshot\ndata: {json.dumps(snapshot, default=str)}\n\n"
+
+    async for event in event_hub.subscribe(job_id, pipeline_id, last_event_id):
+        if await request.is_disconnected():
+            break
+        yield ": keepalive\n\n" if event is None else _sse(event)
+
+
+def _response(request: Request, snapshot: Dict, last_event_id: Optional[str], **filters) -> StreamingResponse:
+    return StreamingResponse(
+        _stream(request, snapshot, last_event_id=last_event_id, **filters),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.get("/stream")
+async def stream_all_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (EventSource sends the header instead)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events for every pipeline and all agent activity
+
+    Starts with a "snapshot" event of active pipelines, then streams
+    "pipeline", "step", "candidate", "counters" and "log" events.
+    """
+    active = await asyncio.to_thread(get_pipeline_queue().list_active)
+    return _response(request, {"pipelines": active}, last_event_id_header or last_event_id)
+
+
+@router.get("/jobs/{job_id}")
+async def stream_job_events(
+    request: Request,
+    job_id: int,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (EventSource sends the header instead)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Server-Sent Events for one job's pipelines and activity"""
+    active = await asyncio.to_thread(get_pipeline_queue().active_for_job, job_id)
+    return _response(
+        request,
+        {"job_id": job_id, "pipeline": active},
+        last_event_id_header or last_event_id,
+        job_id=job_id
+    )
+
+
+@router.get("/pipelines/{pipeline_id}")
+async def stream_pipeline_events(
+    request: Request,
+    pipeline_id: str,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event (EventSource sends the header instead)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Server-Sent Events for one pipeline run"""
+    pipeline = await asyncio.to_thread(get_pipeline_queue().get, pipeline_id)
+    return _response(
+        request,
+        {"pipeline_id": pipeline_id, "pipeline": pipeline},
+        last_event_id_header or last_event_id,
+        pipeline_id=pipeline_id
+    )
+
+
+@router.get("/stats")
+def get_event_stats():
+    """Live subscriber count and the hub's current position"""
+    return {
+        "subscribers": event_hub.subscriber_count,
+        "epoch": event_hub.epoch,
+        "buffered_events": event_hub.buffered_count
+    }
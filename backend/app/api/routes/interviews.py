@@ -3,9 +3,10 @@ Interview API Routes
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_session
+from app.db.database import get_async_session
 from app.models.schemas import InterviewTemplate, InterviewSubmission, Candidate, Job
 from app.services.interview_service import interview_service
 from app.services.interview_eval_service import interview_eval_service
@@ -46,12 +47,12 @@ class ReviewRequest(BaseModel):
 @router.post("/templates")
 async def create_template(
     request: CreateTemplateRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a new interview template"""
     
     # Verify job exists
-    job = session.get(Job, request.job_id)
+    job = await session.get(Job, request.job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -72,7 +73,7 @@ async def create_template(
 async def list_templates(
     job_id: Optional[int] = None,
     interview_type: Optional[str] = None,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List interview templates"""
     
@@ -83,18 +84,18 @@ async def list_templates(
     if interview_type:
         query = query.where(InterviewTemplate.interview_type == interview_type)
     
-    templates = session.exec(query).all()
+    templates = (await session.exec(query)).all()
     return templates
 
 
 @router.get("/templates/{template_id}")
 async def get_template(
     template_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific template"""
     
-    template = session.get(InterviewTemplate, template_id)
+    template = await session.get(InterviewTemplate, template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
@@ -105,7 +106,7 @@ async def get_template(
 @router.post("/dispatch")
 async def dispatch_interview(
     request: DispatchInterviewRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Dispatch an interview to a candidate"""
     
@@ -128,7 +129,7 @@ async def list_submissions(
     job_id: Optional[int] = None,
     candidate_id: Optional[int] = None,
     status: Optional[str] = None,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List interview submissions"""
     
@@ -141,14 +142,14 @@ async def list_submissions(
     if status:
         query = query.where(InterviewSubmission.status == status)
     
-    submissions = session.exec(query).all()
+    submissions = (await session.exec(query)).all()
     
     # Enrich with candidate and job info
     result = []
     for sub in submissions:
-        candidate = session.get(Candidate, sub.candidate_id)
-        job = session.get(Job, sub.job_id)
-        template = session.get(InterviewTemplate, sub.template_id)
+        candidate = await session.get(Candidate, sub.candidate_id)
+        job = await session.get(Job, sub.job_id)
+        template = await session.get(InterviewTemplate, sub.template_id)
         
         result.append({
             **sub.dict(),
@@ -165,18 +166,18 @@ async def list_submissions(
 @router.get("/{submission_id}")
 async def get_submission(
     submission_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get detailed submission information"""
     
-    submission = session.get(InterviewSubmission, submission_id)
+    submission = await session.get(InterviewSubmission, submission_id)
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
     
     # Enrich with related data
-    candidate = session.get(Candidate, submission.candidate_id)
-    job = session.get(Job, submission.job_id)
-    template = session.get(InterviewTemplate, submission.template_id)
+    candidate = await session.get(Candidate, submission.candidate_id)
+    job = await session.get(Job, submission.job_id)
+    template = await session.get(InterviewTemplate, submission.template_id)
     
     return {
         **submission.dict(),
@@ -208,7 +209,7 @@ async def submit_response(
     submission_id: int,
     request: SubmitResponseRequest,
     background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Submit a response to an interview"""
     
@@ -235,11 +236,11 @@ async def submit_response(
 async def trigger_evaluation(
     submission_id: int,
     background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Manually trigger AI evaluation for a submission"""
     
-    submission = session.get(InterviewSubmission, submission_id)
+    submission = await session.get(InterviewSubmission, submission_id)
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
     
@@ -266,7 +267,7 @@ async def trigger_evaluation(
 async def review_submission(
     submission_id: int,
     request: ReviewRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Human review of a submission (approve or reject)"""
     
@@ -303,12 +304,12 @@ async def get_pending_reviews(
 @router.get("/stats/{job_id}")
 async def get_interview_stats(
     job_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get interview statistics for a job"""
     
     query = select(InterviewSubmission).where(InterviewSubmission.job_id == job_id)
-    submissions = session.exec(query).all()
+    submissions = (await session.exec(query)).all()
     
     if not submissions:
         return {
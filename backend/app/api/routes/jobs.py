@@ -1,14 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select, func
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Dict, Any
 from app.models.schemas import Job, JobCandidate
-from app.db.database import get_session
+from app.db.database import get_async_session, get_async_read_session
 from app.services.grok_service import parse_job_description
 
 router = APIRouter()
 
 @router.post("/", response_model=Job)
-async def create_job(job: Job, session: Session = Depends(get_session)):
+async def create_job(job: Job, session: AsyncSession = Depends(get_async_session)):
     """
     Create a new job and parse JD with Grok
     
@@ -24,33 +25,33 @@ async def create_job(job: Job, session: Session = Depends(get_session)):
     job.requirements = requirements
     
     session.add(job)
-    session.commit()
-    session.refresh(job)
+    await session.commit()
+    await session.refresh(job)
     
     return job
 
 @router.get("/")
-async def list_jobs(session: Session = Depends(get_session)):
+async def list_jobs(session: AsyncSession = Depends(get_async_read_session)):
     """Get all jobs with candidate statistics"""
     # Get jobs
     jobs_query = select(Job)
-    jobs = session.exec(jobs_query).all()
+    jobs = (await session.exec(jobs_query)).all()
     
     # Get candidate counts for each job
     result = []
     for job in jobs:
         # Count total candidates
-        total_count = session.exec(
+        total_count = (await session.exec(
             select(func.count(JobCandidate.id)).where(JobCandidate.job_id == job.id)
-        ).first() or 0
+        )).first() or 0
         
         # Count screened candidates (those with scores)
-        screened_count = session.exec(
+        screened_count = (await session.exec(
             select(func.count(JobCandidate.id)).where(
                 JobCandidate.job_id == job.id,
                 JobCandidate.compatibility_score.is_not(None)
             )
-        ).first() or 0
+        )).first() or 0
         
         job_dict = job.dict()
         job_dict.update({
@@ -63,23 +64,23 @@ async def list_jobs(session: Session = Depends(get_session)):
     return result
 
 @router.get("/{job_id}")
-async def get_job(job_id: int, session: Session = Depends(get_session)):
+async def get_job(job_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """Get a specific job by ID with candidate statistics"""
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get candidate statistics
-    total_count = session.exec(
+    total_count = (await session.exec(
         select(func.count(JobCandidate.id)).where(JobCandidate.job_id == job_id)
-    ).first() or 0
+    )).first() or 0
     
-    screened_count = session.exec(
+    screened_count = (await session.exec(
         select(func.count(JobCandidate.id)).where(
             JobCandidate.job_id == job_id,
             JobCandidate.compatibility_score.is_not(None)
         )
-    ).first() or 0
+    )).first() or 0
     
     job_dict = job.dict()
     job_dict.update({
@@ -91,10 +92,10 @@ async def get_job(job_id: int, session: Session = Depends(get_session)):
     return job_dict
 
 @router.get("/{job_id}/candidates")
-async def get_job_candidates(job_id: int, session: Session = Depends(get_session)):
+async def get_job_candidates(job_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """Get all candidates for a specific job"""
     # Verify job exists
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -105,14 +106,14 @@ async def get_job_candidates(job_id: int, session: Session = Depends(get_session
         .order_by(JobCandidate.compatibility_score.desc().nulls_last())
     )
     
-    job_candidates = session.exec(query).all()
+    job_candidates = (await session.exec(query)).all()
     return job_candidates
 
 @router.get("/{job_id}/stats")
-async def get_job_stats(job_id: int, session: Session = Depends(get_session)):
+async def get_job_stats(job_id: int, session: AsyncSession = Depends(get_async_read_session)):
     """Get detailed statistics for a job"""
     # Verify job exists
-    job = session.get(Job, job_id)
+    job = await session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -121,21 +122,21 @@ async def get_job_stats(job_id: int, session: Session = Depends(get_session)):
     stages = ["sourced", "screened", "takehome_assigned", "takehome_reviewed", "interview", "offer", "rejected"]
     
     for stage in stages:
-        count = session.exec(
+        count = (await session.exec(
             select(func.count(JobCandidate.id)).where(
                 JobCandidate.job_id == job_id,
                 JobCandidate.stage == stage
             )
-        ).first() or 0
+        )).first() or 0
         stage_counts[stage] = count
     
     # Average score
-    avg_score = session.exec(
+    avg_score = (await session.exec(
         select(func.avg(JobCandidate.compatibility_score)).where(
             JobCandidate.job_id == job_id,
             JobCandidate.compatibility_score.is_not(None)
         )
-    ).first()
+    )).first()
     
     return {
         "job_id": job_id,
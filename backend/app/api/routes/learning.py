@@ -3,9 +3,10 @@ Learning & Outcomes API Routes - Track AI performance and adaptive learning
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_session
+from app.db.database import get_async_session, get_async_read_session
 from app.models.schemas import CandidateOutcome, AgentLearningParams, Candidate, Job
 from datetime import datetime
 
@@ -41,7 +42,7 @@ class UpdateLearningParamsRequest(BaseModel):
 @router.post("/outcomes")
 async def create_outcome(
     request: CreateOutcomeRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Record a candidate outcome for learning"""
     outcome = CandidateOutcome(
@@ -61,8 +62,8 @@ async def create_outcome(
     )
     
     session.add(outcome)
-    session.commit()
-    session.refresh(outcome)
+    await session.commit()
+    await session.refresh(outcome)
     
     return outcome
 
@@ -71,7 +72,7 @@ async def create_outcome(
 async def list_outcomes(
     job_id: Optional[int] = None,
     outcome: Optional[str] = None,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get all candidate outcomes"""
     query = select(CandidateOutcome)
@@ -82,13 +83,13 @@ async def list_outcomes(
         query = query.where(CandidateOutcome.outcome == outcome)
     
     query = query.order_by(CandidateOutcome.reported_at.desc())
-    outcomes = session.exec(query).all()
+    outcomes = (await session.exec(query)).all()
     
     # Enrich with candidate and job data
     result = []
     for o in outcomes:
-        candidate = session.get(Candidate, o.candidate_id)
-        job = session.get(Job, o.job_id)
+        candidate = await session.get(Candidate, o.candidate_id)
+        job = await session.get(Job, o.job_id)
         
         result.append({
             "id": o.id,
@@ -121,14 +122,14 @@ async def list_outcomes(
 @router.get("/outcomes/stats")
 async def get_outcome_stats(
     job_id: Optional[int] = None,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get aggregate statistics on outcomes"""
     query = select(CandidateOutcome)
     if job_id:
         query = query.where(CandidateOutcome.job_id == job_id)
     
-    outcomes = session.exec(query).all()
+    outcomes = (await session.exec(query)).all()
     
     total = len(outcomes)
     if total == 0:
@@ -171,7 +172,7 @@ async def get_outcome_stats(
 @router.get("/params/{agent_name}")
 async def get_learning_params(
     agent_name: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get current learning parameters for an agent"""
     query = select(AgentLearningParams).where(
@@ -179,7 +180,7 @@ async def get_learning_params(
         AgentLearningParams.is_active == True
     ).order_by(AgentLearningParams.version.desc())
     
-    params = session.exec(query).first()
+    params = (await session.exec(query)).first()
     
     if not params:
         # Return default params if none exist
@@ -208,14 +209,14 @@ async def get_learning_params(
 
 @router.get("/params")
 async def list_all_params(
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get all agent learning parameters"""
     query = select(AgentLearningParams).where(
         AgentLearningParams.is_active == True
     ).order_by(AgentLearningParams.agent_name)
     
-    params = session.exec(query).all()
+    params = (await session.exec(query)).all()
     return params
 
 
@@ -223,7 +224,7 @@ async def list_all_params(
 async def update_learning_params(
     agent_name: str,
     request: UpdateLearningParamsRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update learning parameters for an agent"""
     # Get current params
@@ -231,7 +232,7 @@ async def update_learning_params(
         AgentLearningParams.agent_name == agent_name,
         AgentLearningParams.is_active == True
     )
-    current_params = session.exec(query).first()
+    current_params = (await session.exec(query)).first()
     
     if current_params:
         # Deactivate old version
@@ -261,8 +262,8 @@ async def update_learning_params(
     )
     
     session.add(new_params)
-    session.commit()
-    session.refresh(new_params)
+    await session.commit()
+    await session.refresh(new_params)
     
     return new_params
 
@@ -270,12 +271,12 @@ async def update_learning_params(
 @router.get("/params/{agent_name}/history")
 async def get_params_history(
     agent_name: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """Get version history of learning parameters"""
     query = select(AgentLearningParams).where(
         AgentLearningParams.agent_name == agent_name
     ).order_by(AgentLearningParams.version.desc())
     
-    params = session.exec(query).all()
+    params = (await session.exec(query)).all()
     return params
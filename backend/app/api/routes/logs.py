@@ -1,14 +1,15 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session, select
-from app.db.database import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.database import get_async_read_session
 from app.models.schemas import AgentLog
 
 router = APIRouter(prefix="/logs", tags=["logs"])
 
 @router.get("/", response_model=List[AgentLog])
-def get_logs(
-    session: Session = Depends(get_session),
+async def get_logs(
+    session: AsyncSession = Depends(get_async_read_session),
     logtype: Optional[str] = Query(None, description="Filter by log type"),
     job_id: Optional[int] = Query(None, description="Filter by job ID"),
     candidate_id: Optional[int] = Query(None, description="Filter by candidate ID"),
@@ -31,26 +32,26 @@ def get_logs(
     # Order by timestamp (newest first) and apply pagination
     query = query.order_by(AgentLog.timestamp.desc()).offset(offset).limit(limit)
     
-    logs = session.exec(query).all()
+    logs = (await session.exec(query)).all()
     return logs
 
 @router.get("/types")
-def get_log_types(session: Session = Depends(get_session)):
+async def get_log_types(session: AsyncSession = Depends(get_async_read_session)):
     """
     Get all unique log types in the system
     """
     query = select(AgentLog.logtype).distinct()
-    log_types = session.exec(query).all()
+    log_types = (await session.exec(query)).all()
     return {"log_types": log_types}
 
 @router.get("/recent", response_model=List[AgentLog])
-def get_recent_logs(
-    session: Session = Depends(get_session),
+async def get_recent_logs(
+    session: AsyncSession = Depends(get_async_read_session),
     limit: int = Query(50, description="Number of recent logs to return", le=200)
 ):
     """
     Get the most recent agent logs
     """
     query = select(AgentLog).order_by(AgentLog.timestamp.desc()).limit(limit)
-    logs = session.exec(query).all()
+    logs = (await session.exec(query)).all()
     return logs
\ No newline at end of file
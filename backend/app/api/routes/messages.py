@@ -1,11 +1,10 @@
 import os
-import httpx
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from xdk import Client
-from xdk.users import UsersClient
 from dotenv import load_dotenv
-from app.utils.oauth import create_oauth_request
+from app.services.x_client_registry import get_x_client
+from app.services.x_user_resolver import resolve_user_ids
 
 load_dotenv()
 
@@ -30,45 +29,26 @@ async def send_message(request: MessageRequest):
     if not all([X_CONSUMER_KEY, X_CONSUMER_SECRET, X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET]):
         raise HTTPException(status_code=503, detail="OAuth 1.0a credentials not configured")
     
-    # Get user ID using bearer token (read operation)
-    client = Client(bearer_token=X_BEARER_TOKEN)
-    users_client = UsersClient(client=client)
-    
     username = request.username.replace("@", "")
     
     try:
-        # Get user by username to get their ID
-        user_response = users_client.get_by_username(username)
-        if not user_response.data:
+        # Get user ID (cached after the first lookup)
+        user_ids = await asyncio.to_thread(resolve_user_ids, [username])
+        recipient_id = user_ids.get(username.lower())
+        if not recipient_id:
             raise HTTPException(status_code=404, detail=f"User @{username} not found")
         
-        recipient_id = user_response.data["id"]
-        
-        # Send DM using OAuth 1.0a
-        url = f"https://api.x.com/2/dm_conversations/with/{recipient_id}/messages"
-        
-        # Create OAuth authorization header
-        auth_header = create_oauth_request(
-            "POST", url, X_CONSUMER_KEY, X_CONSUMER_SECRET, X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET
+        # Send DM using OAuth 1.0a through the shared client
+        client = get_x_client()
+        response = await asyncio.to_thread(
+            client.create_direct_message,
+            participant_id=recipient_id,
+            text=request.message
         )
         
-        # Send the request
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.post(
-                url,
-                headers={
-                    "Authorization": auth_header,
-                    "Content-Type": "application/json"
-                },
-                json={"text": request.message}
-            )
-        
-        if response.status_code == 201:
-            return {"success": True, "response": response.json()}
-        else:
-            return {"success": False, "error": response.status_code, "details": response.text}
+        return {"success": True, "response": response.data}
         
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,20 @@
-from typing import Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlmodel import Session, select
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_session
+from app.db.database import get_async_session
 from app.models.schemas import Job
-from app.services.sourcing_agent import SourcingAgent
+from app.services.x_signal_store import refresh_known_users
+from app.services.x_client_registry import get_rate_limit_status
+from app.services.outreach_outbox import get_outbox_status
+from app.services.pipeline_checkpoints import get_run, list_runs
+from app.services.pipeline_queue import get_pipeline_queue
+from app.services.pipeline_tasks import pipeline_tasks
+from app.services.event_hub import event_hub
 from app.utils.logger import AgentLogger
 import asyncio
+import uuid
 
 router = APIRouter(prefix="/sourcing", tags=["sourcing"])
 
@@ -15,6 +23,19 @@ class SourcingRequest(BaseModel):
     send_outreach: bool = False
     dry_run: bool = True
     job_link: Optional[str] = None
+    streaming: bool = False  # Overlap Steps 3-7 through bounded queues
+    incremental: bool = False  # Only process users not already sourced for this job (or materially changed)
+
+class BatchSourcingRequest(BaseModel):
+    job_ids: List[int]
+    send_outreach: bool = False
+    dry_run: bool = True
+    job_link: Optional[str] = None  # Defaults to each job's own link
+
+class SignalRefreshRequest(BaseModel):
+    usernames: Optional[List[str]] = None  # Defaults to every user due for refresh
+    force: bool = False
+    limit: int = 500
 
 class SourcingResponse(BaseModel):
     success: bool
@@ -22,86 +43,176 @@ class SourcingResponse(BaseModel):
     job_id: int
     pipeline_id: Optional[str] = None
 
-# Store running pipelines
-running_pipelines: Dict[int, str] = {}
+class BatchSourcingResponse(BaseModel):
+    success: bool
+    message: str
+    job_ids: List[int]
+    skipped_job_ids: List[int] = []  # Already running
+    pipeline_id: Optional[str] = None
 
 @router.post("/start", response_model=SourcingResponse)
 async def start_sourcing_pipeline(
     request: SourcingRequest,
-    background_tasks: BackgroundTasks,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Start the sourcing pipeline for a specific job
+    Queue the sourcing pipeline for a specific job
+    
+    The pipeline runs in a pipeline worker (see app/workers/pipeline_worker.py);
+    poll /status/{job_id} for progress.
     """
     # Check if job exists
-    job = session.get(Job, request.job_id)
+    job = await session.get(Job, request.job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Check if pipeline is already running for this job
-    if request.job_id in running_pipelines:
+    # Check if pipeline is already queued or running for this job
+    queue = get_pipeline_queue()
+    active = await asyncio.to_thread(queue.active_for_job, request.job_id)
+    if active:
         return SourcingResponse(
             success=False,
-            message=f"Sourcing pipeline is already running for job {request.job_id}",
+            message=f"Sourcing pipeline is already {active['status']} for job {request.job_id}",
             job_id=request.job_id,
-            pipeline_id=running_pipelines[request.job_id]
+            pipeline_id=active["pipeline_id"]
         )
     
-    # Generate pipeline ID
-    pipeline_id = f"pipeline_{request.job_id}_{int(asyncio.get_event_loop().time())}"
-    running_pipelines[request.job_id] = pipeline_id
+    # Generate pipeline ID (unique across processes, since runs and checkpoints outlive them)
+    pipeline_id = f"pipeline_{request.job_id}_{uuid.uuid4().hex}"
+    await asyncio.to_thread(queue.enqueue, pipeline_id, "single", {
+        "job_ids": [request.job_id],
+        "job_link": request.job_link,
+        "send_outreach": request.send_outreach,
+        "dry_run": request.dry_run,
+        "streaming": request.streaming,
+        "incremental": request.incremental
+    })
+    event_hub.publish("pipeline", {"status": "queued"}, pipeline_id=pipeline_id, job_ids=[request.job_id])
     
     # Log pipeline start
     AgentLogger.log_sourcing(
-        f"Starting sourcing pipeline for job {request.job_id}: {job.title}",
+        f"Queued sourcing pipeline for job {request.job_id}: {job.title}",
         job_id=request.job_id,
         pipeline_id=pipeline_id,
         send_outreach=request.send_outreach,
-        dry_run=request.dry_run
-    )
-    
-    # Start pipeline in background
-    background_tasks.add_task(
-        run_sourcing_pipeline_background,
-        request.job_id,
-        job.title,
-        job.description,
-        request.job_link,
-        request.send_outreach,
-        request.dry_run,
-        pipeline_id
+        dry_run=request.dry_run,
+        streaming=request.streaming,
+        incremental=request.incremental
     )
     
     return SourcingResponse(
         success=True,
-        message=f"Sourcing pipeline started for job: {job.title}",
+        message=f"Sourcing pipeline queued for job: {job.title}",
         job_id=request.job_id,
         pipeline_id=pipeline_id
     )
 
+@router.post("/batch", response_model=BatchSourcingResponse)
+async def start_batch_sourcing_pipeline(
+    request: BatchSourcingRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Queue one sourcing pipeline for several jobs
+    
+    X search, role verification and enrichment run once per unique user
+    across all jobs; only compatibility scoring and routing run per job.
+    """
+    job_ids = list(dict.fromkeys(request.job_ids))
+    jobs = (await session.exec(select(Job).where(Job.id.in_(job_ids)))).all()
+    missing = set(job_ids) - {job.id for job in jobs}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Jobs not found: {sorted(missing)}")
+    
+    queue = get_pipeline_queue()
+    active_job_ids = {
+        job_id
+        for active in await asyncio.to_thread(queue.list_active)
+        for job_id in active["payload"].get("job_ids", [])
+    }
+    skipped = [job.id for job in jobs if job.id in active_job_ids]
+    jobs = [job for job in jobs if job.id not in active_job_ids]
+    if not jobs:
+        return BatchSourcingResponse(
+            success=False,
+            message="Sourcing pipelines are already queued or running for every requested job",
+            job_ids=[],
+            skipped_job_ids=skipped
+        )
+    
+    pipeline_id = f"batch_{uuid.uuid4().hex}"
+    await asyncio.to_thread(queue.enqueue, pipeline_id, "batch", {
+        "job_ids": [job.id for job in jobs],
+        "job_link": request.job_link,
+        "send_outreach": request.send_outreach,
+        "dry_run": request.dry_run
+    })
+    event_hub.publish("pipeline", {"status": "queued"}, pipeline_id=pipeline_id, job_ids=[job.id for job in jobs])
+    
+    AgentLogger.log_sourcing(
+        f"Queued batch sourcing pipeline for {len(jobs)} jobs",
+        pipeline_id=pipeline_id,
+        job_ids=[job.id for job in jobs],
+        skipped_job_ids=skipped,
+        send_outreach=request.send_outreach,
+        dry_run=request.dry_run
+    )
+    
+    return BatchSourcingResponse(
+        success=True,
+        message=f"Batch sourcing pipeline queued for {len(jobs)} jobs",
+        job_ids=[job.id for job in jobs],
+        skipped_job_ids=skipped,
+        pipeline_id=pipeline_id
+    )
+
 @router.get("/status/{job_id}")
 async def get_sourcing_status(job_id: int):
     """
     Get the status of sourcing pipeline for a job
+    
+    Status is queued, running or idle; running pipelines report the last
+    step their worker completed.
     """
-    is_running = job_id in running_pipelines
-    pipeline_id = running_pipelines.get(job_id)
+    active = await asyncio.to_thread(get_pipeline_queue().active_for_job, job_id)
     
     return {
         "job_id": job_id,
-        "is_running": is_running,
-        "pipeline_id": pipeline_id,
-        "status": "running" if is_running else "idle"
+        "is_running": bool(active and active["status"] == "running"),
+        "pipeline_id": active["pipeline_id"] if active else None,
+        "status": active["status"] if active else "idle",
+        "worker_id": active["worker_id"] if active else None,
+        "attempts": active["attempts"] if active else 0,
+        "progress": active["progress"] if active else None
     }
 
 @router.post("/stop/{job_id}")
 async def stop_sourcing_pipeline(job_id: int):
     """
-    Stop the sourcing pipeline for a job (if running)
+    Stop the sourcing pipeline for a job (if queued or running)
+    
+    A queued pipeline is cancelled immediately. A running one is flagged and
+    its worker cancels it at the next heartbeat, after which it saves the
+    candidates it has already scored. Stopping one job of a batch run stops
+    the whole batch.
     """
-    if job_id in running_pipelines:
-        pipeline_id = running_pipelines.pop(job_id)
+    queue = get_pipeline_queue()
+    active = await asyncio.to_thread(queue.active_for_job, job_id)
+    if active:
+        pipeline_id = active["pipeline_id"]
+        status = await asyncio.to_thread(queue.request_cancel, pipeline_id)
+        
+        # Running in this process (inline worker): cancel without waiting for a heartbeat
+        if pipeline_tasks.get_pipeline_id(job_id) == pipeline_id:
+            await pipeline_tasks.cancel(job_id)
+            status = "cancelled"
+        
+        event_hub.publish(
+            "pipeline",
+            {"status": "cancelling" if status == "running" else "cancelled"},
+            pipeline_id=pipeline_id,
+            job_ids=active["payload"].get("job_ids", [])
+        )
         
         AgentLogger.log_sourcing(
             f"Sourcing pipeline stopped manually for job {job_id}",
@@ -112,8 +223,10 @@ async def stop_sourcing_pipeline(job_id: int):
         
         return {
             "success": True,
-            "message": f"Sourcing pipeline stopped for job {job_id}",
-            "pipeline_id": pipeline_id
+            "message": f"Sourcing pipeline stop requested for job {job_id}" if status == "running"
+                       else f"Sourcing pipeline stopped for job {job_id}",
+            "pipeline_id": pipeline_id,
+            "status": "cancelling" if status == "running" else "cancelled"
         }
     else:
         return {
@@ -121,68 +234,132 @@ async def stop_sourcing_pipeline(job_id: int):
             "message": f"No running pipeline found for job {job_id}"
         }
 
-async def run_sourcing_pipeline_background(
-    job_id: int,
-    job_title: str,
-    job_description: str,
-    job_link: Optional[str],
-    send_outreach: bool,
-    dry_run: bool,
-    pipeline_id: str
+@router.post("/resume/{pipeline_id}", response_model=SourcingResponse)
+async def resume_sourcing_pipeline(
+    pipeline_id: str,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Run the sourcing pipeline in the background
+    Queue a failed or interrupted pipeline to resume after its last completed step
+    
+    Resumed runs always execute in batch mode, reusing the checkpointed output
+    of every completed step (and partial progress within Steps 4 and 6).
     """
-    try:
-        # Initialize sourcing agent
-        agent = SourcingAgent()
-        
-        # Run the full pipeline
-        result = await agent.run_full_pipeline(
-            job_id=job_id,
-            job_title=job_title,
-            job_description=job_description,
-            job_link=job_link,
-            send_outreach=send_outreach,
-            dry_run=dry_run
-        )
-        
-        # Log completion
-        AgentLogger.log_sourcing(
-            f"Sourcing pipeline completed successfully for job {job_id}",
-            job_id=job_id,
-            pipeline_id=pipeline_id,
-            candidates_sourced=result.get("candidates_sourced", 0),
-            top_candidates_count=len(result.get("top_candidates", [])),
-            result_summary=str(result)[:500]  # First 500 chars
-        )
-        
-    except Exception as e:
-        # Log error
-        AgentLogger.log_error(
-            f"Sourcing pipeline failed for job {job_id}: {job_title}",
-            error=e,
+    run = await asyncio.to_thread(get_run, pipeline_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    if run["status"] == "completed":
+        raise HTTPException(status_code=400, detail="Pipeline run already completed")
+    
+    job_id = run["job_id"]
+    queue = get_pipeline_queue()
+    active = await asyncio.to_thread(queue.active_for_job, job_id)
+    if active:
+        return SourcingResponse(
+            success=False,
+            message=f"Sourcing pipeline is already {active['status']} for job {job_id}",
             job_id=job_id,
-            pipeline_id=pipeline_id
+            pipeline_id=active["pipeline_id"]
         )
-        
-    finally:
-        # Remove from running pipelines
-        if job_id in running_pipelines:
-            running_pipelines.pop(job_id)
+    
+    job = await session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    params = run["params"] or {}
+    await asyncio.to_thread(queue.enqueue, pipeline_id, "single", {
+        "job_ids": [job_id],
+        "job_link": params.get("job_link"),
+        "send_outreach": params.get("send_outreach", False),
+        "dry_run": params.get("dry_run", True),
+        "incremental": params.get("incremental", False)
+    })
+    event_hub.publish("pipeline", {"status": "queued", "resumed": True}, pipeline_id=pipeline_id, job_ids=[job_id])
+    
+    AgentLogger.log_sourcing(
+        f"Resuming sourcing pipeline {pipeline_id} for job {job_id} after step {run['last_completed_step']}",
+        job_id=job_id,
+        pipeline_id=pipeline_id,
+        last_completed_step=run["last_completed_step"]
+    )
+    
+    return SourcingResponse(
+        success=True,
+        message=f"Resuming sourcing pipeline for job: {job.title} after step {run['last_completed_step']}",
+        job_id=job_id,
+        pipeline_id=pipeline_id
+    )
+
+@router.get("/runs")
+async def list_pipeline_runs(job_id: Optional[int] = None, limit: int = 20):
+    """
+    Recent pipeline runs with their status and last completed step
+    """
+    return {
+        "runs": await asyncio.to_thread(list_runs, job_id, limit)
+    }
 
 @router.get("/pipelines")
 async def list_running_pipelines():
     """
-    List all currently running pipelines
+    List all queued and running pipelines
     """
+    active = await asyncio.to_thread(get_pipeline_queue().list_active)
     return {
         "running_pipelines": [
             {
                 "job_id": job_id,
-                "pipeline_id": pipeline_id
+                "pipeline_id": pipeline["pipeline_id"],
+                "status": pipeline["status"],
+                "worker_id": pipeline["worker_id"]
             }
-            for job_id, pipeline_id in running_pipelines.items()
+            for pipeline in active
+            for job_id in pipeline["payload"].get("job_ids", [])
         ],
-        "total_running": len(running_pipelines)
-    }
\ No newline at end of file
+        "total_running": sum(1 for pipeline in active if pipeline["status"] == "running"),
+        "total_queued": sum(1 for pipeline in active if pipeline["status"] == "queued")
+    }
+
+@router.get("/queue")
+async def get_pipeline_queue_status():
+    """
+    Pipeline queue depth by status, plus every queued or running pipeline
+    """
+    queue = get_pipeline_queue()
+    return {
+        "counts": await asyncio.to_thread(queue.counts),
+        "active": await asyncio.to_thread(queue.list_active)
+    }
+
+@router.post("/signals/refresh")
+async def refresh_x_signals(request: SignalRefreshRequest):
+    """
+    Fetch only tweets newer than the stored since_id for known X users
+    """
+    result = await asyncio.to_thread(
+        refresh_known_users,
+        request.usernames,
+        request.force,
+        request.limit
+    )
+    
+    return {
+        "success": True,
+        **result
+    }
+
+@router.get("/x-rate-limits")
+async def get_x_rate_limits():
+    """
+    Latest X API rate-limit state per endpoint, across all X calls in this process
+    """
+    return {
+        "endpoints": get_rate_limit_status()
+    }
+
+@router.get("/outbox")
+async def get_outreach_outbox(job_id: Optional[int] = None):
+    """
+    Delivery status of queued outreach (mentions and DMs), optionally for one job
+    """
+    return await asyncio.to_thread(get_outbox_status, job_id)
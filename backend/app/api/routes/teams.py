@@ -3,9 +3,10 @@ Team Match API Routes
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
-from app.db.database import get_session
+from app.db.database import get_async_session
 from app.models.schemas import Team, TeamMatch, Candidate
 from app.services.team_match_service import team_match_service
 
@@ -39,7 +40,7 @@ class ApproveMatchRequest(BaseModel):
 @router.post("/")
 async def create_team(
     request: CreateTeamRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a new team"""
     team = Team(
@@ -56,8 +57,8 @@ async def create_team(
     )
     
     session.add(team)
-    session.commit()
-    session.refresh(team)
+    await session.commit()
+    await session.refresh(team)
     
     return team
 
@@ -65,24 +66,24 @@ async def create_team(
 @router.get("/")
 async def list_teams(
     active_only: bool = True,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List all teams"""
     query = select(Team)
     if active_only:
         query = query.where(Team.is_active == True)
     
-    teams = session.exec(query).all()
+    teams = (await session.exec(query)).all()
     return teams
 
 
 @router.get("/{team_id}")
 async def get_team(
     team_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get team details"""
-    team = session.get(Team, team_id)
+    team = await session.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -93,10 +94,10 @@ async def get_team(
 async def update_team(
     team_id: int,
     request: CreateTeamRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update team details"""
-    team = session.get(Team, team_id)
+    team = await session.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -111,8 +112,8 @@ async def update_team(
     team.location = request.location
     
     session.add(team)
-    session.commit()
-    session.refresh(team)
+    await session.commit()
+    await session.refresh(team)
     
     return team
 
@@ -121,7 +122,7 @@ async def update_team(
 @router.post("/match")
 async def match_candidate_to_teams(
     request: MatchCandidateRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Match a candidate to teams using AI.
@@ -136,7 +137,7 @@ async def match_candidate_to_teams(
         # Enrich with team data
         result = []
         for match in matches:
-            team = session.get(Team, match.team_id)
+            team = await session.get(Team, match.team_id)
             result.append({
                 "match_id": match.id,
                 "team": {
@@ -177,7 +178,7 @@ async def match_candidate_to_teams(
 async def get_candidate_matches(
     candidate_id: int,
     job_id: Optional[int] = None,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get all team matches for a candidate"""
     query = select(TeamMatch).where(TeamMatch.candidate_id == candidate_id)
@@ -185,13 +186,13 @@ async def get_candidate_matches(
         query = query.where(TeamMatch.job_id == job_id)
     
     query = query.order_by(TeamMatch.final_score.desc())
-    matches = session.exec(query).all()
+    matches = (await session.exec(query)).all()
     
     # Enrich with team and candidate data
     result = []
     for match in matches:
-        team = session.get(Team, match.team_id)
-        candidate = session.get(Candidate, match.candidate_id)
+        team = await session.get(Team, match.team_id)
+        candidate = await session.get(Candidate, match.candidate_id)
         
         result.append({
             "id": match.id,
@@ -256,15 +257,15 @@ async def approve_match(
 @router.get("/matches/{match_id}")
 async def get_match(
     match_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get detailed match information"""
-    match = session.get(TeamMatch, match_id)
+    match = await session.get(TeamMatch, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    team = session.get(Team, match.team_id)
-    candidate = session.get(Candidate, match.candidate_id)
+    team = await session.get(Team, match.team_id)
+    candidate = await session.get(Candidate, match.candidate_id)
     
     return {
         "id": match.id,
@@ -0,0 +1,414 @@
+"""
+Schema Migrations - Versioned schema changes for the app database
+
+Each migration has a version number and runs once, in its own transaction,
+recorded in the schema_migration table. Migrations are written so they are
+also safe on a database that already has their change (a new database gets
+the current schema from the models in migration 1, and the later ones find
+nothing left to do).
+
+check() explains the queries behind the hot list and filter endpoints and
+reports any that scan a whole table instead of using an index.
+
+Run from backend/:
+    python migrate.py            # apply pending migrations
+    python migrate.py status     # applied and pending versions
+    python migrate.py check      # query plans of the hot endpoints
+"""
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text, func
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+from app.db.database import engine
+from app.models.schemas import (
+    AgentLearningParams, AgentLog, Candidate, CandidateOutcome, InterviewSubmission,
+    JobCandidate, TeamMatch, XSignal, XUser
+)
+
+_bookkeeping = MetaData()
+schema_migration = Table(
+    "schema_migration", _bookkeeping,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False)
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration; versions must be added in increasing order"""
+    def register(apply: Callable[[Connection], None]):
+        assert not MIGRATIONS or version > MIGRATIONS[-1].version, "Migration versions must increase"
+        MIGRATIONS.append(Migration(version, name, apply))
+        return apply
+    return register
+
+
+def _tables(conn: Connection) -> set:
+    return set(inspect(conn).get_table_names())
+
+
+def _xsignal_candidate_nullable(conn: Connection):
+    """Drop NOT NULL from xsignal.candidate_id, keeping the rows"""
+    columns = inspect(conn).get_columns("xsignal")
+    if next(column for column in columns if column["name"] == "candidate_id")["nullable"]:
+        return
+
+    print("   📊 Allowing unlinked signals in xsignal (nullable candidate_id)")
+    if conn.dialect.name != "sqlite":
+        conn.execute(text("ALTER TABLE xsignal ALTER COLUMN candidate_id DROP NOT NULL"))
+        return
+
+    # SQLite can't change a column's constraints: copy the rows into a new table
+    copied = ", ".join(column["name"] for column in columns if column["name"] in XSignal.__table__.c)
+    indexes = [index["name"] for index in inspect(conn).get_indexes("xsignal")]
+    conn.execute(text("ALTER TABLE xsignal RENAME TO xsignal_old"))
+    for name in indexes:
+        conn.execute(text(f"DROP INDEX {name}"))
+    XSignal.__table__.create(conn)
+    conn.execute(text(f"INSERT INTO xsignal ({copied}) SELECT {copied} FROM xsignal_old"))
+    conn.execute(text("DROP TABLE xsignal_old"))
+
+
+def _create_indexes(conn: Connection, names: List[str]):
+    """Create model indexes by name (skipping ones that exist)"""
+    indexes = {index.name: index for table in SQLModel.metadata.sorted_tables for index in table.indexes}
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    for name in names:
+        index = indexes[name]
+        if index.table.name not in tables:
+            continue
+        if name not in {existing["name"] for existing in inspector.get_indexes(index.table.name)}:
+            print(f"   📊 Creating {name}")
+            index.create(conn)
+
+
+# ========================================
+# MIGRATIONS
+# ========================================
+
+@migration(1, "create_tables")
+def create_tables(conn: Connection):
+    # Missing tables only; existing tables are changed by the migrations below
+    SQLModel.metadata.create_all(conn)
+
+
+@migration(2, "x_signal_metadata")
+def x_signal_metadata(conn: Connection):
+    # XSignal gained tweet metadata and a nullable candidate_id
+    columns = {column["name"] for column in inspect(conn).get_columns("xsignal")}
+    if "tweet_id" in columns:
+        return
+
+    rows = conn.execute(text("SELECT COUNT(*) FROM xsignal")).scalar()
+    if rows:
+        print(f"   📊 Adding columns to xsignal ({rows} existing rows)")
+        for column, column_type in [
+            ("tweet_id", "VARCHAR"),
+            ("x_user_id", "VARCHAR"),
+            ("job_id", "INTEGER REFERENCES job (id)"),
+            ("engagement", "JSON"),
+            ("posted_at", "VARCHAR"),
+        ]:
+            conn.execute(text(f"ALTER TABLE xsignal ADD COLUMN {column} {column_type}"))
+        _xsignal_candidate_nullable(conn)
+    else:
+        # The table was never written, so recreate it with the new schema
+        print("   📊 Recreating empty xsignal table with the new schema")
+        conn.execute(text("DROP TABLE xsignal"))
+        XSignal.__table__.create(conn)
+
+
+# Tables whose candidate_id must follow a merged candidate
+CANDIDATE_REFERENCES = [
+    "jobcandidate", "xsignal", "outreachmessage", "agentlog",
+    "interviewsubmission", "teammatch", "candidateoutcome"
+]
+
+
+@migration(3, "candidate_unique_constraints")
+def candidate_unique_constraints(conn: Connection):
+    # Bulk candidate saves use INSERT ... ON CONFLICT on these
+    tables = _tables(conn)
+
+    duplicates = conn.execute(text(
+        "SELECT c.id, keep.id FROM candidate c "
+        "JOIN (SELECT x_handle, MIN(id) AS id FROM candidate "
+        "      WHERE x_handle IS NOT NULL GROUP BY x_handle HAVING COUNT(*) > 1) keep "
+        "ON c.x_handle = keep.x_handle AND c.id != keep.id"
+    )).all()
+    if duplicates:
+        print(f"   📊 Merging {len(duplicates)} duplicate candidates into the oldest row")
+    for duplicate_id, keep_id in duplicates:
+        for table in CANDIDATE_REFERENCES:
+            if table in tables:
+                conn.execute(
+                    text(f"UPDATE {table} SET candidate_id = :keep WHERE candidate_id = :duplicate"),
+                    {"keep": keep_id, "duplicate": duplicate_id}
+                )
+        conn.execute(text("DELETE FROM candidate WHERE id = :id"), {"id": duplicate_id})
+
+    # Keep the most recently updated row of each job/candidate pair
+    removed = conn.execute(text(
+        "DELETE FROM jobcandidate WHERE id NOT IN ("
+        "  SELECT id FROM ("
+        "    SELECT id, ROW_NUMBER() OVER ("
+        "      PARTITION BY job_id, candidate_id ORDER BY updated_at DESC, id DESC"
+        "    ) AS position FROM jobcandidate"
+        "  ) ranked WHERE position = 1"
+        ")"
+    )).rowcount
+    if removed:
+        print(f"   📊 Removed {removed} duplicate job-candidate rows")
+
+    _create_indexes(conn, ["ix_candidate_x_handle", "ix_jobcandidate_job_id_candidate_id"])
+
+
+@migration(4, "hot_path_indexes")
+def hot_path_indexes(conn: Connection):
+    # Foreign-key and filter columns of the list endpoints
+    _create_indexes(conn, [
+        "ix_jobcandidate_candidate_id",
+        "ix_jobcandidate_job_id_stage",
+        "ix_agentlog_timestamp",
+        "ix_agentlog_job_id_timestamp",
+        "ix_agentlog_logtype_timestamp",
+        "ix_agentlog_candidate_id_timestamp",
+        "ix_teammatch_candidate_id_job_id",
+        "ix_interviewsubmission_job_id_status",
+        "ix_interviewsubmission_candidate_id",
+        "ix_candidateoutcome_job_id_reported_at",
+        "ix_xsignal_candidate_id",
+        "ix_xsignal_tweet_id",
+        "ix_xuser_username",
+        "ix_xuser_next_crawl_at",
+    ])
+
+
+@migration(5, "default_learning_params")
+def default_learning_params(conn: Connection):
+    # Version 1 thresholds for the agents that read adaptive learning params
+    for agent_name in ("sourcing_agent", "interview_agent"):
+        existing = conn.execute(
+            select(AgentLearningParams.id).where(
+                AgentLearningParams.agent_name == agent_name,
+                AgentLearningParams.is_active == True
+            )
+        ).first()
+        if existing:
+            print(f"   ✅ {agent_name} params already exist")
+            continue
+        conn.execute(AgentLearningParams.__table__.insert().values(
+            **AgentLearningParams(agent_name=agent_name, version=1, is_active=True).model_dump(exclude={"id"})
+        ))
+        print(f"   🤖 Created default {agent_name} params (version 1)")
+
+
+@migration(6, "xsignal_nullable_candidate")
+def xsignal_nullable_candidate(conn: Connection):
+    # Databases migrated by an earlier version 2 kept candidate_id NOT NULL
+    if "xsignal" in _tables(conn):
+        _xsignal_candidate_nullable(conn)
+
+
+@migration(7, "x_unique_constraints")
+def x_unique_constraints(conn: Connection):
+    # Step 3 upserts X users by username and skips known tweets with ON CONFLICT on these
+    tables = _tables(conn)
+
+    if "xuser" in tables:
+        # Keep the most recently crawled row of each username
+        removed = conn.execute(text(
+            "DELETE FROM xuser WHERE id NOT IN ("
+            "  SELECT id FROM ("
+            "    SELECT id, ROW_NUMBER() OVER ("
+            "      PARTITION BY username"
+            "      ORDER BY (last_crawled_at IS NULL), last_crawled_at DESC, updated_at DESC, id DESC"
+            "    ) AS position FROM xuser"
+            "  ) ranked WHERE position = 1"
+            ")"
+        )).rowcount
+        if removed:
+            print(f"   📊 Removed {removed} duplicate X users")
+
+    if "xsignal" in tables:
+        # Keep the oldest row of each tweet, preferring one linked to a candidate
+        removed = conn.execute(text(
+            "DELETE FROM xsignal WHERE tweet_id IS NOT NULL AND id NOT IN ("
+            "  SELECT id FROM ("
+            "    SELECT id, ROW_NUMBER() OVER ("
+            "      PARTITION BY tweet_id ORDER BY (candidate_id IS NULL), id"
+            "    ) AS position FROM xsignal WHERE tweet_id IS NOT NULL"
+            "  ) ranked WHERE position = 1"
+            ")"
+        )).rowcount
+        if removed:
+            print(f"   📊 Removed {removed} duplicate X signals")
+
+    # Replace the plain indexes created by hot_path_indexes
+    for table, name in [("xuser", "ix_xuser_username"), ("xsignal", "ix_xsignal_tweet_id")]:
+        if table not in tables:
+            continue
+        existing = next((index for index in inspect(conn).get_indexes(table) if index["name"] == name), None)
+        if existing and not existing["unique"]:
+            conn.execute(text(f"DROP INDEX {name}"))
+    _create_indexes(conn, ["ix_xuser_username", "ix_xsignal_tweet_id"])
+
+
+@migration(8, "outreach_last_attempt_at")
+def outreach_last_attempt_at(conn: Connection):
+    # Failed writes that reached X count against the outbox write window too
+    if "outreachmessage" not in _tables(conn):
+        return
+    columns = {column["name"] for column in inspect(conn).get_columns("outreachmessage")}
+    if "last_attempt_at" not in columns:
+        print("   📊 Adding outreachmessage.last_attempt_at")
+        column_type = "DATETIME" if conn.dialect.name == "sqlite" else "TIMESTAMP"
+        conn.execute(text(f"ALTER TABLE outreachmessage ADD COLUMN last_attempt_at {column_type}"))
+
+
+# ========================================
+# RUNNER
+# ========================================
+
+def applied_versions() -> Dict[int, datetime]:
+    """Applied migration versions and when they were applied"""
+    _bookkeeping.create_all(engine)
+    with engine.connect() as conn:
+        return dict(conn.execute(select(schema_migration.c.version, schema_migration.c.applied_at)).all())
+
+
+def upgrade() -> List[Migration]:
+    """
+    Apply pending migrations in version order
+
+    Returns:
+        Migrations applied by this call
+    """
+    applied = applied_versions()
+    pending = [m for m in MIGRATIONS if m.version not in applied]
+    for pending_migration in pending:
+        print(f"🔄 {pending_migration.version:04d} {pending_migration.name}")
+        with engine.begin() as conn:
+            pending_migration.apply(conn)
+            conn.execute(schema_migration.insert().values(
+                version=pending_migration.version,
+                name=pending_migration.name,
+                applied_at=datetime.utcnow()
+            ))
+    return pending
+
+
+def status() -> List[Dict]:
+    """Every known migration with its applied time (None when pending)"""
+    applied = applied_versions()
+    return [
+        {"version": m.version, "name": m.name, "applied_at": applied.get(m.version)}
+        for m in MIGRATIONS
+    ]
+
+
+# ========================================
+# QUERY PLAN CHECK
+# ========================================
+
+def _hot_queries() -> Dict[str, Tuple[object, bool]]:
+    """{name: (statement, must seek)}; a seek looks up its filter in an index instead of walking one"""
+    since = datetime(2000, 1, 1)
+    return {
+        "GET /jobs/{id}/candidates": (
+            select(JobCandidate).where(JobCandidate.job_id == 1).order_by(JobCandidate.compatibility_score.desc()), True
+        ),
+        "GET /candidates?job_id&status": (
+            select(JobCandidate).where(JobCandidate.job_id == 1, JobCandidate.stage == "interview"), True
+        ),
+        "GET /candidates/{id}/jobs": (select(JobCandidate).where(JobCandidate.candidate_id == 1), True),
+        "GET /candidates/{id}/signals": (select(XSignal).where(XSignal.candidate_id == 1), True),
+        "GET /logs?job_id": (
+            select(AgentLog).where(AgentLog.job_id == 1).order_by(AgentLog.timestamp.desc()).limit(100), True
+        ),
+        "GET /logs?logtype": (
+            select(AgentLog).where(AgentLog.logtype == "sourcing").order_by(AgentLog.timestamp.desc()).limit(100), True
+        ),
+        "GET /logs?candidate_id": (
+            select(AgentLog).where(AgentLog.candidate_id == 1).order_by(AgentLog.timestamp.desc()).limit(100), True
+        ),
+        # Newest rows first: walking the timestamp index and stopping at the limit is the plan we want
+        "GET /logs/recent": (select(AgentLog).order_by(AgentLog.timestamp.desc()).limit(50), False),
+        "GET /activity/stats": (
+            select(AgentLog.logtype, func.count(AgentLog.id)).where(AgentLog.timestamp >= since).group_by(AgentLog.logtype),
+            False
+        ),
+        "GET /teams/matches/{candidate_id}": (
+            select(TeamMatch).where(TeamMatch.candidate_id == 1, TeamMatch.job_id == 1), True
+        ),
+        "GET /interviews?job_id&status": (
+            select(InterviewSubmission).where(InterviewSubmission.job_id == 1, InterviewSubmission.status == "submitted"),
+            True
+        ),
+        "GET /learning/outcomes?job_id": (
+            select(CandidateOutcome).where(CandidateOutcome.job_id == 1).order_by(CandidateOutcome.reported_at.desc()),
+            True
+        ),
+        "Step 3 signal dedupe": (select(XSignal.tweet_id).where(XSignal.tweet_id.in_(["1", "2"])), True),
+        "Step 3 known X users": (select(XUser).where(XUser.username.in_(["a", "b"])), True),
+        "Step 7 existing candidates": (select(Candidate).where(Candidate.x_handle.in_(["@a", "@b"])), True),
+    }
+
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)|USING INTEGER PRIMARY KEY")
+_POSTGRES_INDEX = re.compile(r"Index (?:Only )?Scan (?:Backward )?using (\w+)|Bitmap Index Scan on (\w+)")
+
+
+def explain(conn: Connection, statement, must_seek: bool = True) -> Dict:
+    """
+    Query plan of a statement and the indexes it uses
+
+    full_scan is set when the plan reads a whole table, or (with must_seek)
+    a whole index instead of looking its filter up.
+    """
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    if conn.dialect.name == "sqlite":
+        plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()]
+        indexes = [m.group(1) or "rowid" for line in plan for m in _SQLITE_INDEX.finditer(line)]
+        full_scan = any(line.startswith("SCAN ") and (must_seek or "USING" not in line) for line in plan)
+    else:
+        plan = [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {compiled}", params).all()]
+        indexes = [m.group(1) or m.group(2) for line in plan for m in _POSTGRES_INDEX.finditer(line)]
+        full_scan = any("Seq Scan on" in line for line in plan) or (
+            must_seek and not any("Index Cond" in line for line in plan)
+        )
+    return {"plan": plan, "indexes": indexes, "full_scan": full_scan}
+
+
+def check() -> Dict[str, Dict]:
+    """
+    Explain the hot endpoint queries against the current database
+
+    Returns:
+        {query name: explain() result}
+    """
+    results = {}
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # Small tables are cheaper to scan; ask whether an index *could* serve the query
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, (statement, must_seek) in _hot_queries().items():
+            results[name] = explain(conn, statement, must_seek)
+        conn.rollback()
+    return results
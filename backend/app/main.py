@@ -1,7 +1,9 @@
+import os
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import init_db
-from app.api.routes import jobs, logs, candidates, activity, sourcing, interviews, teams, learning, learning
+from app.api.routes import jobs, logs, candidates, activity, sourcing, interviews, teams, learning, learning, events
 
 app = FastAPI(title="Grok Recruiter API")
 
@@ -19,6 +21,80 @@ app.add_middleware(
 def on_startup():
     init_db()
 
+@app.on_event("startup")
+async def start_recrawl_scheduler():
+    # Opt-in: re-crawl known X users whose signals have gone stale
+    interval_minutes = os.getenv("X_RECRAWL_INTERVAL_MINUTES")
+    if interval_minutes:
+        from app.services.x_signal_store import run_recrawl_scheduler
+        app.state.recrawl_task = asyncio.create_task(
+            run_recrawl_scheduler(float(interval_minutes) * 60)
+        )
+
+@app.on_event("startup")
+async def start_outbox_worker():
+    # Drain queued mentions/DMs in the background (disable with OUTBOX_WORKER_ENABLED=false)
+    if os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() != "false":
+        from app.services.outreach_outbox import outbox_worker
+        outbox_worker.start()
+
+@app.on_event("startup")
+async def start_pipeline_worker():
+    # Run queued sourcing pipelines in this process too
+    # (set PIPELINE_INLINE_WORKER=false when dedicated workers run them)
+    if os.getenv("PIPELINE_INLINE_WORKER", "true").lower() != "false":
+        from app.workers.pipeline_worker import PipelineWorker
+        app.state.pipeline_worker = PipelineWorker()
+        app.state.pipeline_worker.start()
+
+@app.on_event("startup")
+async def start_event_relay():
+    # Pipelines in other processes (dedicated workers, other API instances)
+    # publish to their own hub; relay their activity from the database to
+    # this process's subscribers, skipping the inline worker's own pipelines
+    from app.services.event_hub import run_event_relay
+    worker = getattr(app.state, "pipeline_worker", None)
+    app.state.event_relay_task = asyncio.create_task(
+        run_event_relay(local_worker_ids={worker.worker_id} if worker else None)
+    )
+
+@app.on_event("shutdown")
+async def stop_outbox_worker():
+    from app.services.outreach_outbox import outbox_worker
+    await outbox_worker.stop()
+
+@app.on_event("shutdown")
+async def stop_sourcing_pipelines():
+    # Cancel running pipelines so they save partial results before exit
+    worker = getattr(app.state, "pipeline_worker", None)
+    if worker:
+        await worker.stop()
+    from app.services.pipeline_tasks import pipeline_tasks
+    await pipeline_tasks.cancel_all()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    # Stop the event relay and recrawl scheduler before the engines are disposed
+    tasks = [
+        task for task in (
+            getattr(app.state, "event_relay_task", None),
+            getattr(app.state, "recrawl_task", None)
+        ) if task is not None
+    ]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def close_database():
+    # Write log rows still queued, then close pooled async connections
+    from app.db.database import async_engine, async_read_engine
+    from app.utils.logger import AgentLogger
+    await asyncio.to_thread(AgentLogger.flush)
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
 # Health check
 @app.get("/")
 async def root():
@@ -34,4 +110,5 @@ app.include_router(interviews.router, prefix="/api")
 app.include_router(teams.router, prefix="/api")
 app.include_router(learning.router, prefix="/api")
 app.include_router(learning.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
 
@@ -1,5 +1,6 @@
 from typing import Optional, List, Dict
-from sqlmodel import Field, SQLModel, JSON, Column, String, Text
+from sqlmodel import Field, SQLModel, JSON, Column, String, Text, LargeBinary, Index
+from sqlalchemy import text
 from datetime import datetime
 
 class Job(SQLModel, table=True):
@@ -15,23 +16,65 @@ class Candidate(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
     email: Optional[str] = None
-    x_handle: Optional[str] = None  # X (Twitter) handle
+    x_handle: Optional[str] = Field(default=None, unique=True, index=True)  # X (Twitter) handle
     x_bio: Optional[str] = Field(default=None, sa_column=Column(Text))
     linkedin_data: Optional[Dict] = Field(default=None, sa_type=JSON)  # Mocked LinkedIn profile
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class XSignal(SQLModel, table=True):
     """Behavioral signals from X (Twitter)"""
+    __table_args__ = (
+        Index("ix_xsignal_candidate_id", "candidate_id"),
+        # One row per tweet; signals without a tweet ID are not deduplicated
+        Index(
+            "ix_xsignal_tweet_id", "tweet_id", unique=True,
+            sqlite_where=text("tweet_id IS NOT NULL"),
+            postgresql_where=text("tweet_id IS NOT NULL")
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    candidate_id: int = Field(foreign_key="candidate.id")
-    x_handle: str
+    candidate_id: Optional[int] = Field(default=None, foreign_key="candidate.id")  # Linked once the user is saved as a candidate
+    x_handle: str  # "@username"
     post_text: Optional[str] = Field(default=None, sa_column=Column(Text))
     engagement_type: str  # "post", "reply", "like", "retweet"
     topic: str  # Topic this signal relates to
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Source tweet metadata
+    tweet_id: Optional[str] = None
+    x_user_id: Optional[str] = None
+    job_id: Optional[int] = Field(default=None, foreign_key="job.id")  # Job whose sourcing run found it
+    engagement: Optional[Dict] = Field(default=None, sa_type=JSON)  # {"retweets", "likes", "replies"}
+    posted_at: Optional[str] = None  # Tweet created_at as returned by X
+
+class XUser(SQLModel, table=True):
+    """Known X accounts with their incremental crawl state"""
+    __table_args__ = (
+        Index("ix_xuser_username", "username", unique=True),
+        Index("ix_xuser_next_crawl_at", "next_crawl_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    username: str  # Lowercase, without @
+    user_id: Optional[str] = None  # X numeric user ID
+    
+    # Incremental refresh
+    since_id: Optional[str] = None  # Newest tweet ID already stored
+    last_crawled_at: Optional[datetime] = None
+    next_crawl_at: Optional[datetime] = None  # last_crawled_at + freshness TTL
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class JobCandidate(SQLModel, table=True):
     """Relationship between jobs and candidates with sourcing metadata"""
+    __table_args__ = (
+        Index("ix_jobcandidate_job_id_candidate_id", "job_id", "candidate_id", unique=True),
+        Index("ix_jobcandidate_candidate_id", "candidate_id"),
+        Index("ix_jobcandidate_job_id_stage", "job_id", "stage"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     job_id: int = Field(foreign_key="job.id")
     candidate_id: int = Field(foreign_key="candidate.id")
@@ -48,8 +91,102 @@ class JobCandidate(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class OutreachMessage(SQLModel, table=True):
+    """Outbox of queued X mentions and DMs, drained by the outreach worker"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: Optional[int] = Field(default=None, foreign_key="job.id")
+    candidate_id: Optional[int] = Field(default=None, foreign_key="candidate.id")
+    username: str  # X username (without @)
+    channel: str  # "mention" or "dm"
+    message: str = Field(sa_column=Column(Text))
+    recommendation: Optional[str] = None  # fasttrack, interview, takehome
+    dry_run: bool = True
+    
+    # Delivery state
+    status: str = "queued"  # queued, sending, sent, failed
+    attempts: int = 0
+    max_attempts: int = 5
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_attempt_at: Optional[datetime] = None  # Last write request that reached X
+    last_error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    external_id: Optional[str] = None  # Tweet ID or DM event ID
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+class PipelineRun(SQLModel, table=True):
+    """One sourcing pipeline execution, resumable from its last checkpoint"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    pipeline_id: str = Field(index=True, unique=True)
+    job_id: int = Field(foreign_key="job.id")
+    mode: str = "batch"  # batch, streaming
+    params: Optional[Dict] = Field(default=None, sa_type=JSON)  # job_link, send_outreach, dry_run
+    
+    status: str = "running"  # running, completed, failed, cancelled
+    last_completed_step: int = 0  # Highest step with a complete checkpoint
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+
+class PipelineCheckpoint(SQLModel, table=True):
+    """Output of one pipeline step, stored as zlib-compressed JSON"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    pipeline_id: str = Field(index=True)
+    step: int  # 1-7
+    step_name: str
+    complete: bool = True  # False for partial progress within a step
+    item_count: int = 0
+    payload: bytes = Field(sa_column=Column(LargeBinary))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PipelineTiming(SQLModel, table=True):
+    """Step and external-call timing waterfall of one pipeline attempt"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    pipeline_id: str = Field(index=True)
+    job_id: int = Field(foreign_key="job.id", index=True)  # One row per job of a batch run
+    mode: str = "batch"  # batch, streaming, multi_job
+    status: str  # completed, failed, cancelled
+    wall_seconds: float = 0.0
+    total_seconds: float = 0.0  # Summed external call time
+    concurrency: float = 0.0  # total_seconds / wall_seconds
+    waterfall: bytes = Field(sa_column=Column(LargeBinary))  # zlib-compressed JSON
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PipelineJob(SQLModel, table=True):
+    """Queued sourcing pipeline, claimed and run by a pipeline worker"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    pipeline_id: str = Field(index=True, unique=True)
+    kind: str  # single, batch
+    payload: Dict = Field(default={}, sa_type=JSON)  # job_ids, job_link, send_outreach, dry_run, streaming
+    
+    # Queue state
+    status: str = Field(default="queued", index=True)  # queued, running, completed, failed, cancelled
+    attempts: int = 0
+    max_attempts: int = 3
+    cancel_requested: bool = False
+    worker_id: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    progress: Optional[Dict] = Field(default=None, sa_type=JSON)
+    result: Optional[Dict] = Field(default=None, sa_type=JSON)
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
 class AgentLog(SQLModel, table=True):
     """Logs for tracking all agent actions and operations"""
+    __table_args__ = (
+        Index("ix_agentlog_timestamp", "timestamp"),
+        Index("ix_agentlog_job_id_timestamp", "job_id", "timestamp"),
+        Index("ix_agentlog_logtype_timestamp", "logtype", "timestamp"),
+        Index("ix_agentlog_candidate_id_timestamp", "candidate_id", "timestamp"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     logtype: str  # Type of action: "sourcing", "scoring", "outreach", "search", "embedding", etc.
     log: str = Field(sa_column=Column(Text))  # Detailed log message/description
@@ -74,6 +211,11 @@ class InterviewTemplate(SQLModel, table=True):
 
 class InterviewSubmission(SQLModel, table=True):
     """Tracks interview submissions and AI + human evaluations"""
+    __table_args__ = (
+        Index("ix_interviewsubmission_job_id_status", "job_id", "status"),
+        Index("ix_interviewsubmission_candidate_id", "candidate_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     candidate_id: int = Field(foreign_key="candidate.id")
     job_id: int = Field(foreign_key="job.id")
@@ -128,6 +270,10 @@ class Team(SQLModel, table=True):
 
 class TeamMatch(SQLModel, table=True):
     """AI-generated team matches for candidates"""
+    __table_args__ = (
+        Index("ix_teammatch_candidate_id_job_id", "candidate_id", "job_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     candidate_id: int = Field(foreign_key="candidate.id")
     job_id: int = Field(foreign_key="job.id")
@@ -169,6 +315,10 @@ class TeamMatch(SQLModel, table=True):
 
 class CandidateOutcome(SQLModel, table=True):
     """Tracks actual hiring outcomes for adaptive learning"""
+    __table_args__ = (
+        Index("ix_candidateoutcome_job_id_reported_at", "job_id", "reported_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     candidate_id: int = Field(foreign_key="candidate.id")
     job_id: int = Field(foreign_key="job.id")
@@ -7,13 +7,14 @@ This service implements a simple reinforcement learning approach:
 3. Update feature weights to improve accuracy
 4. Learn from both positive (hired) and negative (rejected) outcomes
 """
+import asyncio
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from app.models.schemas import (
     CandidateOutcome, AgentLearningParams, JobCandidate, 
     InterviewSubmission, TeamMatch
 )
-from app.db.database import engine
+from app.db.database import engine, async_session
 from app.utils.logger import AgentLogger
 from sqlmodel import Session, select
 import math
@@ -58,14 +59,14 @@ class AdaptiveLearningService:
             retention_months: How long they stayed (if hired)
             would_hire_again: Manager feedback (if hired)
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Get the original AI prediction
-            job_candidate = session.exec(
+            job_candidate = (await session.exec(
                 select(JobCandidate).where(
                     JobCandidate.candidate_id == candidate_id,
                     JobCandidate.job_id == job_id
                 )
-            ).first()
+            )).first()
             
             if not job_candidate:
                 raise ValueError("Job-candidate relationship not found")
@@ -95,8 +96,8 @@ class AdaptiveLearningService:
             )
             
             session.add(outcome_record)
-            session.commit()
-            session.refresh(outcome_record)
+            await session.commit()
+            await session.refresh(outcome_record)
             
             AgentLogger.log(
                 logtype="learning",
@@ -184,20 +185,20 @@ class AdaptiveLearningService:
         - Track precision/recall per stage
         - Maintain running accuracy
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Get current active params
-            params = session.exec(
+            params = (await session.exec(
                 select(AgentLearningParams).where(
                     AgentLearningParams.agent_name == agent_name,
                     AgentLearningParams.is_active == True
                 )
-            ).first()
+            )).first()
             
             if not params:
                 # Create initial params
                 params = AgentLearningParams(agent_name=agent_name)
                 session.add(params)
-                session.flush()
+                await session.flush()
             
             # Update metrics
             if outcome.ai_was_correct is not None:
@@ -236,8 +237,8 @@ class AdaptiveLearningService:
             params.version += 1
             
             session.add(params)
-            session.commit()
-            session.refresh(params)
+            await session.commit()
+            await session.refresh(params)
             
             AgentLogger.log(
                 logtype="learning",
@@ -350,17 +351,17 @@ class AdaptiveLearningService:
         """
         Get learning metrics and performance over time
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Get current params
-            params = self.get_active_params(agent_name)
+            params = await asyncio.to_thread(self.get_active_params, agent_name)
             
             # Get recent outcomes
             since_date = datetime.utcnow() - timedelta(days=days)
-            outcomes = session.exec(
+            outcomes = (await session.exec(
                 select(CandidateOutcome).where(
                     CandidateOutcome.reported_at >= since_date
                 )
-            ).all()
+            )).all()
             
             # Calculate metrics
             total_outcomes = len(outcomes)
@@ -0,0 +1,143 @@
+"""
+Candidate Pre-Score - Cheap deterministic ranking before Grok scoring (Step 6)
+
+Ranks enriched candidates from data already in hand (no API calls):
+- Skill overlap between linkedin_data.skills and the job's required_skills
+  (Job.requirements, from parse_job_description)
+- Years of experience against the job's experience_years
+- Role-classification confidence from Step 4
+- Engagement on their X posts
+
+Step 6 then spends its Grok scoring budget in pre-score order and stops
+early once enough candidates clear the interview threshold to fill the
+job's headcount, so low-ranked candidates never cost a full scoring call.
+Candidates it skips are still saved for the job, as sourced with their
+pre-score.
+
+    SCORING_BUDGET               - max Grok scoring calls per job run (0 = unlimited, default 50)
+    SCORING_HEADCOUNT_MULTIPLIER - interview-worthy candidates wanted per opening (default 3)
+"""
+import math
+import os
+from typing import Dict, List, Optional
+
+SCORING_BUDGET = int(os.getenv("SCORING_BUDGET", "50"))
+SCORING_HEADCOUNT_MULTIPLIER = int(os.getenv("SCORING_HEADCOUNT_MULTIPLIER", "3"))
+
+# Component weights (sum to 100)
+PRESCORE_WEIGHTS = {
+    "skills": 40,
+    "experience": 20,
+    "confidence": 25,
+    "engagement": 15
+}
+
+
+def _normalize_skill(skill: str) -> str:
+    return " ".join(str(skill).lower().replace("-", " ").split())
+
+
+def _skill_matches(required: str, skills: List[str]) -> bool:
+    # "Python" matches "Python 3", "PostgreSQL" matches "postgresql"
+    return any(required == s or required in s.split() or s in required.split() for s in skills)
+
+
+def prescore_candidate(candidate: Dict, requirements: Optional[Dict] = None) -> Dict:
+    """
+    Deterministic 0-100 pre-score of an enriched candidate
+
+    Returns:
+        {"prescore": float, "matched_skills": [...], "components": {name: 0-1}}
+    """
+    requirements = requirements or {}
+    linkedin = candidate.get("linkedin_data") or {}
+
+    # Skill overlap (neutral when the job lists no skills)
+    required = [_normalize_skill(s) for s in requirements.get("required_skills", []) if s]
+    skills = [_normalize_skill(s) for s in linkedin.get("skills", []) if s]
+    matched = [r for r in required if _skill_matches(r, skills)]
+    skill_score = len(matched) / len(required) if required else 0.5
+
+    # Experience, capped at the requirement
+    wanted_years = requirements.get("experience_years") or 3
+    years = linkedin.get("years_of_experience") or 0
+    experience_score = min(years / wanted_years, 1.0) if wanted_years else 1.0
+
+    confidence_score = (candidate.get("classification", {}).get("confidence") or 0) / 100
+
+    # Average likes + retweets + replies per post, log-scaled (100 per post ≈ 1.0)
+    posts = candidate.get("signals", [])
+    interactions = sum(sum((p.get("engagement") or {}).values()) for p in posts)
+    average = interactions / len(posts) if posts else 0
+    engagement_score = min(math.log10(1 + average) / 2, 1.0)
+
+    components = {
+        "skills": skill_score,
+        "experience": experience_score,
+        "confidence": confidence_score,
+        "engagement": engagement_score
+    }
+    prescore = sum(PRESCORE_WEIGHTS[name] * value for name, value in components.items())
+    return {
+        "prescore": round(prescore, 2),
+        "matched_skills": matched,
+        "components": {name: round(value, 3) for name, value in components.items()}
+    }
+
+
+def rank_by_prescore(candidates: List[Dict], requirements: Optional[Dict] = None) -> List[Dict]:
+    """Attach 'prescore' to every candidate and return them best first (stable on ties)"""
+    for candidate in candidates:
+        candidate["prescore"] = prescore_candidate(candidate, requirements)
+    return sorted(candidates, key=lambda c: -c["prescore"]["prescore"])
+
+
+class ScoringBudget:
+    """
+    Limits Grok scoring calls for one job run
+
+    Exhausted once `limit` calls are spent, or once `target` scored candidates
+    reach `interview_threshold`.
+    """
+
+    def __init__(
+        self,
+        interview_threshold: int,
+        headcount: int = 1,
+        limit: int = SCORING_BUDGET,
+        multiplier: int = SCORING_HEADCOUNT_MULTIPLIER
+    ):
+        self.interview_threshold = interview_threshold
+        self.limit = limit
+        self.target = max(headcount, 1) * multiplier
+        self.spent = 0
+        self.hits = 0
+        self.skipped = 0
+
+    def record(self, candidate: Dict):
+        """Count one scored candidate"""
+        self.spent += 1
+        if candidate.get("compatibility", {}).get("compatibility_score", 0) >= self.interview_threshold:
+            self.hits += 1
+
+    @property
+    def stop_reason(self) -> Optional[str]:
+        if self.target and self.hits >= self.target:
+            return f"found {self.hits} candidates at or above {self.interview_threshold}"
+        if self.limit and self.spent >= self.limit:
+            return f"scoring budget of {self.limit} calls spent"
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.stop_reason is not None
+
+    def summary(self) -> Dict:
+        return {
+            "scoring_calls": self.spent,
+            "scoring_budget": self.limit,
+            "interview_worthy": self.hits,
+            "interview_target": self.target,
+            "skipped_by_budget": self.skipped,
+            "stop_reason": self.stop_reason
+        }
@@ -0,0 +1,171 @@
+"""
+Candidate Store - Bulk upsert of scored candidates for a job (Step 7)
+
+Saving a run's candidates takes one transaction and a handful of statements
+regardless of how many there are:
+- An IN (...) query prefetches existing candidates by X handle, with their
+  current stage on the job
+- INSERT ... ON CONFLICT upserts Candidate rows (unique x_handle) and
+  JobCandidate rows (unique job_id + candidate_id), in chunks of
+  CANDIDATE_UPSERT_BATCH_SIZE rows
+
+Databases created before the unique constraints existed need migration 3
+(python migrate.py), otherwise ON CONFLICT has nothing to match.
+
+    CANDIDATE_UPSERT_BATCH_SIZE - rows per INSERT statement (default 500)
+"""
+import os
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from app.db.database import engine
+from app.models.schemas import Candidate, JobCandidate
+
+CANDIDATE_UPSERT_BATCH_SIZE = int(os.getenv("CANDIDATE_UPSERT_BATCH_SIZE", "500"))
+
+# Routing recommendation → JobCandidate stage
+STAGE_MAPPING = {
+    'fasttrack': 'interview',
+    'interview': 'interview',
+    'takehome': 'takehome_assigned',
+    'reject': 'rejected',
+    'sourced': 'sourced'
+}
+
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _chunks(rows: List, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def upsert_job_candidates(scored_candidates: List[Dict], job_id: int) -> Dict:
+    """
+    Upsert candidates and their JobCandidate rows in one transaction
+
+    Sets candidate_data['candidate_id'] on every candidate. A handle that
+    appears twice in the batch is saved once, with its last occurrence.
+    Candidates without 'compatibility' (not scored this run, e.g. past the
+    scoring budget) are added as sourced with their pre-score, and never
+    overwrite the score or stage the job already has for them.
+
+    Args:
+        scored_candidates: Routed candidates (username, bio, linkedin_data, compatibility, recommendation)
+        job_id: Job ID to associate candidates with
+
+    Returns:
+        {"saved_count", "updated_count", "handles": {"@username": candidate_id},
+         "stage_changes": [{"candidate_id", "old_stage", "new_stage"}]}
+    """
+    insert = _DIALECT_INSERTS[engine.dialect.name]
+    now = datetime.utcnow()
+
+    latest = {f"@{c.get('username')}": c for c in scored_candidates}
+    handles = list(latest)
+
+    with Session(engine) as session:
+        # Existing candidates and their stage on this job
+        existing: Dict[str, tuple] = {}
+        for chunk in _chunks(handles, CANDIDATE_UPSERT_BATCH_SIZE):
+            rows = session.exec(
+                select(Candidate.x_handle, Candidate.id, JobCandidate.stage)
+                .outerjoin(JobCandidate, and_(
+                    JobCandidate.candidate_id == Candidate.id,
+                    JobCandidate.job_id == job_id
+                ))
+                .where(Candidate.x_handle.in_(chunk))
+            ).all()
+            existing.update({handle: (candidate_id, stage) for handle, candidate_id, stage in rows})
+
+        # Candidates: insert new handles, refresh bio and LinkedIn data on existing ones
+        candidate_ids: Dict[str, int] = {}
+        for chunk in _chunks(handles, CANDIDATE_UPSERT_BATCH_SIZE):
+            statement = insert(Candidate).values([
+                {
+                    "name": latest[handle].get('name', latest[handle].get('username', 'Unknown')),
+                    "x_handle": handle,
+                    "x_bio": latest[handle].get('bio', ''),
+                    "linkedin_data": latest[handle].get('linkedin_data', {}),
+                    "created_at": now
+                }
+                for handle in chunk
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements=["x_handle"],
+                set_={
+                    "x_bio": statement.excluded.x_bio,
+                    "linkedin_data": statement.excluded.linkedin_data
+                }
+            ).returning(Candidate.x_handle, Candidate.id)
+            candidate_ids.update(dict(session.execute(statement).all()))
+
+        # JobCandidates: score, reasoning and stage from this run
+        stage_changes = []
+        job_candidate_rows = []
+        unscored_rows = []
+        for handle in handles:
+            candidate_data = latest[handle]
+            if 'compatibility' not in candidate_data:
+                prescore = (candidate_data.get('prescore') or {}).get('prescore')
+                unscored_rows.append({
+                    "job_id": job_id,
+                    "candidate_id": candidate_ids[handle],
+                    "compatibility_score": None,
+                    "ai_reasoning": f"Not scored by Grok in this run (pre-score {prescore}/100)"
+                                    if prescore is not None else "Not scored by Grok in this run",
+                    "stage": "sourced",
+                    "created_at": now,
+                    "updated_at": now
+                })
+                continue
+            compatibility = candidate_data['compatibility']
+            stage = STAGE_MAPPING.get(candidate_data.get('recommendation', 'sourced'), 'sourced')
+            old_stage = existing.get(handle, (None, None))[1] or 'sourced'
+            if stage != old_stage:
+                stage_changes.append({
+                    "candidate_id": candidate_ids[handle],
+                    "old_stage": old_stage,
+                    "new_stage": stage
+                })
+            job_candidate_rows.append({
+                "job_id": job_id,
+                "candidate_id": candidate_ids[handle],
+                "compatibility_score": compatibility.get('compatibility_score', 0),
+                "ai_reasoning": compatibility.get('reasoning', ''),
+                "stage": stage,
+                "created_at": now,
+                "updated_at": now
+            })
+
+        for chunk in _chunks(job_candidate_rows, CANDIDATE_UPSERT_BATCH_SIZE):
+            statement = insert(JobCandidate).values(chunk)
+            statement = statement.on_conflict_do_update(
+                index_elements=["job_id", "candidate_id"],
+                set_={
+                    "compatibility_score": statement.excluded.compatibility_score,
+                    "ai_reasoning": statement.excluded.ai_reasoning,
+                    "stage": statement.excluded.stage,
+                    "updated_at": statement.excluded.updated_at
+                }
+            )
+            session.execute(statement)
+
+        for chunk in _chunks(unscored_rows, CANDIDATE_UPSERT_BATCH_SIZE):
+            statement = insert(JobCandidate).values(chunk)
+            session.execute(statement.on_conflict_do_nothing(index_elements=["job_id", "candidate_id"]))
+
+        session.commit()
+
+    for candidate_data in scored_candidates:
+        candidate_data['candidate_id'] = candidate_ids[f"@{candidate_data.get('username')}"]
+
+    updated_count = sum(1 for handle in handles if handle in existing)
+    return {
+        "saved_count": len(handles) - updated_count,
+        "updated_count": updated_count,
+        "handles": candidate_ids,
+        "stage_changes": stage_changes
+    }
@@ -2,6 +2,7 @@ import os
 from typing import List
 from openai import OpenAI
 from dotenv import load_dotenv
+from app.utils.timing import span
 
 load_dotenv()
 
@@ -24,10 +25,11 @@ def generate_embedding(text: str, model: str = "text-embedding-3-small") -> List
         List of floats representing the embedding vector
     """
     client = get_client()
-    response = client.embeddings.create(
-        input=text,
-        model=model
-    )
+    with span("openai.embedding"):
+        response = client.embeddings.create(
+            input=text,
+            model=model
+        )
     return response.data[0].embedding
 
 def generate_embeddings_batch(texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
@@ -42,9 +44,10 @@ def generate_embeddings_batch(texts: List[str], model: str = "text-embedding-3-s
         List of embedding vectors
     """
     client = get_client()
-    response = client.embeddings.create(
-        input=texts,
-        model=model
-    )
+    with span("openai.embedding", batch=len(texts)):
+        response = client.embeddings.create(
+            input=texts,
+            model=model
+        )
     return [item.embedding for item in response.data]
 
@@ -0,0 +1,335 @@
+"""
+Event Hub - In-process pipeline events for live dashboards
+
+Pipelines publish step transitions, per-candidate results and running
+counters here, and every AgentLog row is published as a "log" event.
+Subscribers (the SSE routes) receive them as they happen, filtered to one
+job or pipeline or unfiltered for the global channel.
+
+Events carry ids of the form "<hub epoch>-<sequence>". A reconnecting
+client sends the last id it saw and gets the buffered events after it; a
+client whose id is from an earlier server process (another epoch) gets the
+whole buffer. A subscriber that falls too far behind is disconnected and
+resumes the same way.
+
+Pipelines run by other processes (dedicated workers, or the inline worker
+of another API process) do not reach this process's hub; run_event_relay()
+republishes their AgentLog rows and queue status changes from the database,
+with one query per tick for all subscribers. Pipelines this process runs or
+has already announced are skipped, so subscribers don't see them twice.
+
+    EVENT_HUB_BUFFER_SIZE         - events kept for resume (default 1000)
+    EVENT_SUBSCRIBER_QUEUE_SIZE   - undelivered events before a subscriber is dropped (default 500)
+    EVENT_KEEPALIVE_SECONDS       - idle time before a keepalive is sent (default 15)
+    EVENT_RELAY_INTERVAL_SECONDS  - database relay poll interval (default 1)
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set
+from app.utils.timing import add_step_listener
+
+EVENT_HUB_BUFFER_SIZE = int(os.getenv("EVENT_HUB_BUFFER_SIZE", "1000"))
+EVENT_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_SUBSCRIBER_QUEUE_SIZE", "500"))
+EVENT_KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE_SECONDS", "15"))
+EVENT_RELAY_INTERVAL_SECONDS = float(os.getenv("EVENT_RELAY_INTERVAL_SECONDS", "1"))
+
+# Pipeline the current task (and the tasks and threads it starts) is running
+_current_pipeline: ContextVar[Optional[Dict]] = ContextVar("current_pipeline", default=None)
+
+_LAGGED = object()
+
+
+class _Subscriber:
+    def __init__(self, job_id: Optional[int], pipeline_id: Optional[str]):
+        self.job_id = job_id
+        self.pipeline_id = pipeline_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_SUBSCRIBER_QUEUE_SIZE)
+
+    def matches(self, event: Dict) -> bool:
+        if self.pipeline_id is not None and event["pipeline_id"] != self.pipeline_id:
+            return False
+        if self.job_id is not None and event["job_id"] != self.job_id and self.job_id not in event["job_ids"]:
+            return False
+        return True
+
+
+class PipelineEventHub:
+    """Fan-out of pipeline events to live subscribers, with a replay buffer"""
+
+    def __init__(self, buffer_size: int = EVENT_HUB_BUFFER_SIZE):
+        self.epoch = format(int(time.time() * 1000), "x")
+        self._sequence = 0
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._subscribers: Set[_Subscriber] = set()
+        self._counters: Dict[tuple, Dict[str, int]] = {}
+        self._recent_log_ids: OrderedDict = OrderedDict()
+        self._pipeline_statuses: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---- publishing ----
+
+    def publish(
+        self,
+        event_type: str,
+        data: Optional[Dict] = None,
+        job_id: Optional[int] = None,
+        pipeline_id: Optional[str] = None,
+        job_ids: Optional[List[int]] = None
+    ) -> Dict:
+        """
+        Publish an event (safe from any thread)
+
+        job_id, job_ids and pipeline_id default to the pipeline running in the
+        caller's context; a pipeline covering one job tags its events with it.
+        """
+        context = _current_pipeline.get() or {}
+        job_ids = list(job_ids) if job_ids is not None else context.get("job_ids", [])
+        if job_id is None and len(job_ids) == 1:
+            job_id = job_ids[0]
+
+        with self._lock:
+            self._sequence += 1
+            event = {
+                "id": f"{self.epoch}-{self._sequence}",
+                "type": event_type,
+                "pipeline_id": pipeline_id or context.get("pipeline_id"),
+                "job_id": job_id,
+                "job_ids": job_ids,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "data": data or {}
+            }
+            self._buffer.append(event)
+            subscribers = [s for s in self._subscribers if s.matches(event)]
+            if event_type == "pipeline" and event["pipeline_id"] and "status" in event["data"]:
+                self._pipeline_statuses[event["pipeline_id"]] = event["data"]["status"]
+                self._pipeline_statuses.move_to_end(event["pipeline_id"])
+                if len(self._pipeline_statuses) > self._buffer.maxlen:
+                    self._pipeline_statuses.popitem(last=False)
+
+        loop = self._loop
+        if subscribers and loop is not None and not loop.is_closed():
+            # Always via the loop, so events reach subscribers in publish order
+            loop.call_soon_threadsafe(self._deliver, event, subscribers)
+        return event
+
+    def _deliver(self, event: Dict, subscribers: List[_Subscriber]):
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind: end its stream, the client resumes from the buffer
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(_LAGGED)
+
+    def count(self, job_id: Optional[int] = None, **increments: int) -> Dict[str, int]:
+        """Add to the running counters of the current pipeline and publish them"""
+        context = _current_pipeline.get() or {}
+        if job_id is None and len(context.get("job_ids", [])) == 1:
+            job_id = context["job_ids"][0]
+        key = (context.get("pipeline_id"), job_id)
+        with self._lock:
+            counters = self._counters.setdefault(key, {})
+            for name, value in increments.items():
+                counters[name] = counters.get(name, 0) + value
+            snapshot = dict(counters)
+        self.publish("counters", snapshot, job_id=job_id)
+        return snapshot
+
+    def publish_log(self, entry: Dict) -> Optional[Dict]:
+        """Publish an AgentLog row once, whether it comes from this process or the relay"""
+        with self._lock:
+            if entry["log_id"] in self._recent_log_ids:
+                return None
+            self._recent_log_ids[entry["log_id"]] = True
+            if len(self._recent_log_ids) > self._buffer.maxlen:
+                self._recent_log_ids.popitem(last=False)
+        return self.publish("log", entry, job_id=entry.get("job_id"))
+
+    def announced_status(self, pipeline_id: str) -> Optional[str]:
+        """Status of the last "pipeline" event published for a pipeline"""
+        with self._lock:
+            return self._pipeline_statuses.get(pipeline_id)
+
+    def _forget_counters(self, pipeline_id: str):
+        with self._lock:
+            for key in [k for k in self._counters if k[0] == pipeline_id]:
+                del self._counters[key]
+
+    # ---- subscribing ----
+
+    def _since(self, last_event_id: Optional[str]) -> List[Dict]:
+        if not last_event_id:
+            return []
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return list(self._buffer)
+        return [e for e in self._buffer if int(e["id"].rsplit("-", 1)[1]) > int(sequence)]
+
+    async def subscribe(
+        self,
+        job_id: Optional[int] = None,
+        pipeline_id: Optional[str] = None,
+        last_event_id: Optional[str] = None,
+        keepalive: float = EVENT_KEEPALIVE_SECONDS
+    ) -> AsyncIterator[Optional[Dict]]:
+        """
+        Events for one job, one pipeline or (no filters) everything
+
+        Yields buffered events after last_event_id first, then live ones.
+        Yields None after `keepalive` idle seconds, and returns when the
+        subscriber has fallen behind.
+        """
+        self._loop = asyncio.get_running_loop()
+        subscriber = _Subscriber(job_id, pipeline_id)
+        with self._lock:
+            backlog = [e for e in self._since(last_event_id) if subscriber.matches(e)]
+            self._subscribers.add(subscriber)
+        try:
+            for event in backlog:
+                yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is _LAGGED:
+                    return
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def buffered_count(self) -> int:
+        return len(self._buffer)
+
+
+event_hub = PipelineEventHub()
+
+
+@contextmanager
+def pipeline_events(pipeline_id: str, job_ids: List[int]):
+    """Tag events published inside the block with the pipeline and its jobs"""
+    token = _current_pipeline.set({"pipeline_id": pipeline_id, "job_ids": list(job_ids)})
+    try:
+        yield
+    finally:
+        _current_pipeline.reset(token)
+        event_hub._forget_counters(pipeline_id)
+
+
+def _on_step(name: str, status: str, seconds: Optional[float]):
+    if _current_pipeline.get() is not None:
+        event_hub.publish("step", {
+            "step": name,
+            "status": status,
+            "seconds": round(seconds, 3) if seconds is not None else None
+        })
+
+
+add_step_listener(_on_step)
+
+
+# ========================================
+# DATABASE RELAY (out-of-process workers)
+# ========================================
+
+def _relay_tick(
+    last_log_id: Optional[int],
+    active: Dict[str, Dict],
+    local_worker_ids: Set[str]
+) -> tuple[int, Dict[str, Dict]]:
+    from sqlmodel import Session, select, func
+    from app.db.database import engine
+    from app.models.schemas import AgentLog
+    from app.services.pipeline_queue import get_pipeline_queue
+    from app.services.pipeline_tasks import pipeline_tasks
+
+    with Session(engine) as session:
+        if last_log_id is None:
+            last_log_id = session.exec(select(func.max(AgentLog.id))).first() or 0
+        logs = session.exec(
+            select(AgentLog).where(AgentLog.id > last_log_id).order_by(AgentLog.id).limit(500)
+        ).all()
+        for log in logs:
+            event_hub.publish_log(log_event(log))
+            last_log_id = log.id
+
+    # This process's pipelines publish their own status and step events
+    queue = get_pipeline_queue()
+    running_here = set(pipeline_tasks.running().values())
+    current = {job["pipeline_id"]: job for job in queue.list_active()}
+    for pipeline_id, job in current.items():
+        if pipeline_id in running_here or job["worker_id"] in local_worker_ids:
+            continue
+        previous = active.get(pipeline_id)
+        progress_changed = previous is not None and previous["progress"] != job["progress"]
+        if progress_changed or event_hub.announced_status(pipeline_id) != job["status"]:
+            event_hub.publish(
+                "pipeline",
+                {"status": job["status"], "progress": job["progress"], "worker_id": job["worker_id"]},
+                pipeline_id=pipeline_id,
+                job_ids=job["payload"].get("job_ids", [])
+            )
+    for pipeline_id in set(active) - set(current):
+        finished = queue.get(pipeline_id) or {"status": "unknown", "error": None, "worker_id": None}
+        if finished["worker_id"] in local_worker_ids or event_hub.announced_status(pipeline_id) == finished["status"]:
+            continue
+        event_hub.publish(
+            "pipeline",
+            {"status": finished["status"], "error": finished["error"]},
+            pipeline_id=pipeline_id,
+            job_ids=active[pipeline_id]["payload"].get("job_ids", [])
+        )
+    return last_log_id, current
+
+
+def log_event(log) -> Dict:
+    """Event payload of an AgentLog row"""
+    return {
+        "log_id": log.id,
+        "logtype": log.logtype,
+        "message": log.log,
+        "job_id": log.job_id,
+        "candidate_id": log.candidate_id,
+        "context": log.context or {},
+        "timestamp": log.timestamp.isoformat() + "Z"
+    }
+
+
+async def run_event_relay(
+    interval_seconds: float = EVENT_RELAY_INTERVAL_SECONDS,
+    local_worker_ids: Optional[Set[str]] = None
+):
+    """
+    Republish AgentLog rows and pipeline queue changes written by other processes
+
+    Runs until cancelled. Starts from the newest log row, so only new
+    activity is relayed.
+
+    Args:
+        interval_seconds: Database poll interval
+        local_worker_ids: Pipeline workers of this process, whose pipelines are skipped
+    """
+    print(f"📡 Event relay started (every {interval_seconds:.1f}s)")
+    last_log_id, active = None, {}
+    local_worker_ids = set(local_worker_ids or ())
+    while True:
+        try:
+            last_log_id, active = await asyncio.to_thread(_relay_tick, last_log_id, active, local_worker_ids)
+        except Exception as e:
+            print(f"Event relay failed: {e}")
+        await asyncio.sleep(interval_seconds)
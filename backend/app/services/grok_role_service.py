@@ -8,6 +8,8 @@ import json
 import httpx
 from typing import Dict, Optional
 from dotenv import load_dotenv
+from app.utils.retry import post_with_retries
+from app.services.role_prefilter import PrefilterStats, classify_user
 
 load_dotenv()
 
@@ -93,8 +95,11 @@ Rules:
 
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.post(
+            # Retries timeouts, 429s and 5xx before giving up on this user
+            response = await post_with_retries(
+                client,
                 GROK_API_URL,
+                span_name="grok.verify_role",
                 headers={
                     "Authorization": f"Bearer {XAI_API_KEY}",
                     "Content-Type": "application/json"
@@ -149,13 +154,60 @@ Rules:
         print(f"⚠️ Error in role verification for @{username}: {e}")
         return None
 
-async def verify_developers_batch(x_users: list, job_title: str) -> list:
+async def verify_developer(user: Dict, job_title: str, stats: Optional[PrefilterStats] = None) -> Optional[Dict]:
+    """
+    Verify a single X user from Step 3
+    
+    The local pre-filter drops clear non-developers and passes clear developers
+    without a Grok call; only ambiguous users are classified by Grok.
+    
+    Args:
+        stats: Optional counter of pre-filter decisions
+    
+    Returns:
+        The user dict with a classification field added, or None if not a developer
+    """
+    print(f"🔍 Verifying @{user['username']}...")
+    
+    decision, prefilter = classify_user(user)
+    if stats is not None:
+        stats.record(decision)
+    if decision == "drop":
+        print(f"  ⏭️ Dropped by pre-filter (score {prefilter['prefilter_score']:.0f}: {'; '.join(prefilter['reasons'])})")
+        return None
+    if decision == "pass":
+        user['classification'] = prefilter
+        print(f"  ✅ Developer (pre-filter): {prefilter['role_type']} (confidence: {prefilter['confidence']}%)")
+        return user
+    
+    # Extract recent post texts
+    recent_posts = [signal['text'] for signal in user.get('signals', [])]
+    
+    # Verify with Grok
+    classification = await verify_developer_role(
+        username=user['username'],
+        bio=user.get('bio', ''),
+        recent_posts=recent_posts,
+        job_title=job_title
+    )
+    
+    if not classification:
+        print(f"  ❌ Not a developer or low confidence")
+        return None
+    
+    # Add classification to user profile
+    user['classification'] = classification
+    print(f"  ✅ Developer: {classification['role_type']} (confidence: {classification['confidence']}%)")
+    return user
+
+async def verify_developers_batch(x_users: list, job_title: str, stats: Optional[PrefilterStats] = None) -> list:
     """
     Verify a batch of X users
     
     Args:
         x_users: List of user dicts from Step 3
         job_title: Job title for context
+        stats: Optional counter of pre-filter decisions
         
     Returns:
         List of verified developer profiles
@@ -163,26 +215,7 @@ async def verify_developers_batch(x_users: list, job_title: str) -> list:
     verified = []
     
     for user in x_users:
-        print(f"🔍 Verifying @{user['username']}...")
-        
-        # Extract recent post texts
-        recent_posts = [signal['text'] for signal in user.get('signals', [])]
-        
-        # Verify with Grok
-        classification = await verify_developer_role(
-            username=user['username'],
-            bio=user.get('bio', ''),
-            recent_posts=recent_posts,
-            job_title=job_title
-        )
-        
-        if classification:
-            # Add classification to user profile
-            user['classification'] = classification
+        if await verify_developer(user, job_title, stats):
             verified.append(user)
-            print(f"  ✅ Developer: {classification['role_type']} (confidence: {classification['confidence']}%)")
-        else:
-            print(f"  ❌ Not a developer or low confidence")
     
     return verified
-
@@ -8,6 +8,7 @@ import json
 import httpx
 from typing import Dict
 from dotenv import load_dotenv
+from app.utils.retry import post_with_retries
 
 load_dotenv()
 
@@ -104,8 +105,11 @@ Be honest and critical. NO markdown, ONLY JSON.
 
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.post(
+            # Retries timeouts, 429s and 5xx before falling back
+            response = await post_with_retries(
+                client,
                 GROK_API_URL,
+                span_name="grok.score",
                 headers={
                     "Authorization": f"Bearer {XAI_API_KEY}",
                     "Content-Type": "application/json"
@@ -8,6 +8,7 @@ import json
 import httpx
 from typing import Dict, List
 from dotenv import load_dotenv
+from app.utils.timing import span
 
 load_dotenv()
 
@@ -66,28 +67,29 @@ Rules:
 
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GROK_API_URL,
-                headers={
-                    "Authorization": f"Bearer {XAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "grok-3",
-                    "messages": [
-                        {
-                            "role": "system", 
-                            "content": "You are a technical recruiter AI. Return only valid JSON, no markdown."
-                        },
-                        {
-                            "role": "user", 
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7
-                },
-                timeout=30.0
-            )
+            with span("grok.topics"):
+                response = await client.post(
+                    GROK_API_URL,
+                    headers={
+                        "Authorization": f"Bearer {XAI_API_KEY}",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "model": "grok-3",
+                        "messages": [
+                            {
+                                "role": "system", 
+                                "content": "You are a technical recruiter AI. Return only valid JSON, no markdown."
+                            },
+                            {
+                                "role": "user", 
+                                "content": prompt
+                            }
+                        ],
+                        "temperature": 0.7
+                    },
+                    timeout=30.0
+                )
             
             if response.status_code != 200:
                 print(f"⚠️ Grok API error: {response.status_code} - {response.text}")
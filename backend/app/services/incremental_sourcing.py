@@ -0,0 +1,117 @@
+"""
+Incremental Sourcing - Re-source a job by processing only what is new
+
+A re-run for a job skips X users who are already JobCandidates of that job,
+unless their signals changed materially since they were last scored. The
+check is local: the candidate's bio is compared with the stored one, and
+the tweets found in this run are compared with the XSignal rows that were
+stored before the JobCandidate was last updated.
+
+Unchanged users keep their existing score and stage. Only new and changed
+users go through role verification and scoring, so a daily re-run costs
+in proportion to what is new.
+
+    INCREMENTAL_MIN_NEW_SIGNALS - unseen posts that make a known user worth re-scoring (default 3)
+"""
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+from sqlmodel import Session, select
+from app.db.database import engine
+from app.models.schemas import Candidate, JobCandidate, XSignal
+
+INCREMENTAL_MIN_NEW_SIGNALS = int(os.getenv("INCREMENTAL_MIN_NEW_SIGNALS", "3"))
+
+
+class IncrementalIndex:
+    """A job's existing candidates and the signals each was scored on"""
+
+    def __init__(self, job_id: int, existing: Dict[str, Dict], min_new_signals: int = INCREMENTAL_MIN_NEW_SIGNALS):
+        self.job_id = job_id
+        self.existing = existing  # {"@handle": {candidate_id, score, stage, bio, known_tweet_ids}}
+        self.min_new_signals = min_new_signals
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+        self.reused: List[Dict] = []
+
+    def classify(self, user: Dict) -> str:
+        """
+        "new" (not linked to the job), "changed" (worth re-scoring) or "unchanged"
+
+        Unchanged users are recorded in `reused` with their carried-forward score.
+        """
+        known = self.existing.get(f"@{user['username']}")
+        if known is None:
+            decision = "new"
+        elif known["score"] is None or (user.get("bio") or "") != (known["bio"] or ""):
+            decision = "changed"
+        else:
+            unseen = [
+                s for s in user.get("signals", [])
+                if s.get("tweet_id") and s["tweet_id"] not in known["known_tweet_ids"]
+            ]
+            decision = "changed" if len(unseen) >= self.min_new_signals else "unchanged"
+
+        self.counts[decision] += 1
+        if decision == "unchanged":
+            self.reused.append({
+                "username": user["username"],
+                "candidate_id": known["candidate_id"],
+                "compatibility_score": known["score"],
+                "stage": known["stage"]
+            })
+        return decision
+
+    def split(self, users: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """(users to process, users reused as-is)"""
+        to_process, reused = [], []
+        for user in users:
+            (reused if self.classify(user) == "unchanged" else to_process).append(user)
+        return to_process, reused
+
+    def summary(self) -> Dict:
+        total = sum(self.counts.values())
+        return {
+            "users_seen": total,
+            "new_users": self.counts["new"],
+            "changed_users": self.counts["changed"],
+            "reused_users": self.counts["unchanged"],
+            "reuse_rate": round(self.counts["unchanged"] / total, 3) if total else 0.0,
+            "existing_candidates": len(self.existing)
+        }
+
+
+def load_incremental_index(job_id: int, min_new_signals: int = INCREMENTAL_MIN_NEW_SIGNALS) -> IncrementalIndex:
+    """Load a job's candidates and their already-seen tweets in two queries"""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(Candidate, JobCandidate)
+            .join(JobCandidate, JobCandidate.candidate_id == Candidate.id)
+            .where(JobCandidate.job_id == job_id, Candidate.x_handle.is_not(None))
+        ).all()
+        existing = {
+            candidate.x_handle: {
+                "candidate_id": candidate.id,
+                "score": job_candidate.compatibility_score,
+                "stage": job_candidate.stage,
+                "bio": candidate.x_bio,
+                "scored_at": job_candidate.updated_at or job_candidate.created_at,
+                "known_tweet_ids": set()
+            }
+            for candidate, job_candidate in rows
+        }
+
+        known: Dict[str, Set[str]] = defaultdict(set)
+        if existing:
+            signals = session.exec(
+                select(XSignal.x_handle, XSignal.tweet_id, XSignal.timestamp)
+                .where(XSignal.x_handle.in_(list(existing)), XSignal.tweet_id.is_not(None))
+            ).all()
+            for handle, tweet_id, stored_at in signals:
+                # Only tweets the previous scoring could have seen
+                if stored_at <= (existing[handle]["scored_at"] or datetime.utcnow()):
+                    known[handle].add(tweet_id)
+        for handle, tweet_ids in known.items():
+            existing[handle]["known_tweet_ids"] = tweet_ids
+
+    return IncrementalIndex(job_id, existing, min_new_signals)
@@ -4,9 +4,9 @@ Interview Evaluation Service - AI-powered scoring of interview submissions
 from typing import Dict, List, Optional
 from datetime import datetime
 from app.models.schemas import InterviewSubmission, InterviewTemplate, Job
-from app.db.database import engine
+from app.db.database import async_session
 from app.utils.logger import AgentLogger
-from sqlmodel import Session
+import asyncio
 import httpx
 import json
 import os
@@ -40,13 +40,13 @@ class InterviewEvaluationService:
         Returns:
             Evaluation results with score, reasoning, strengths, weaknesses
         """
-        with Session(engine) as session:
-            submission = session.get(InterviewSubmission, submission_id)
+        async with async_session() as session:
+            submission = await session.get(InterviewSubmission, submission_id)
             if not submission:
                 raise ValueError("Submission not found")
             
-            template = session.get(InterviewTemplate, submission.template_id)
-            job = session.get(Job, submission.job_id)
+            template = await session.get(InterviewTemplate, submission.template_id)
+            job = await session.get(Job, submission.job_id)
             
             if submission.status != "submitted":
                 raise ValueError("Submission not in submitted status")
@@ -55,7 +55,7 @@ class InterviewEvaluationService:
             submission.status = "evaluating"
             submission.updated_at = datetime.utcnow()
             session.add(submission)
-            session.commit()
+            await session.commit()
             
             AgentLogger.log_interview(
                 f"Starting AI evaluation for submission {submission_id}",
@@ -85,8 +85,8 @@ class InterviewEvaluationService:
                 submission.updated_at = datetime.utcnow()
                 
                 session.add(submission)
-                session.commit()
-                session.refresh(submission)
+                await session.commit()
+                await session.refresh(submission)
                 
                 AgentLogger.log_interview(
                     f"AI evaluation complete for submission {submission_id}: {evaluation['score']}/100",
@@ -99,7 +99,7 @@ class InterviewEvaluationService:
                 
                 # Apply adaptive learning adjustments if enabled
                 if ADAPTIVE_LEARNING_ENABLED:
-                    evaluation = self._apply_learned_adjustments(evaluation)
+                    evaluation = await asyncio.to_thread(self._apply_learned_adjustments, evaluation)
                 
                 return evaluation
                 
@@ -107,7 +107,7 @@ class InterviewEvaluationService:
                 submission.status = "error"
                 submission.updated_at = datetime.utcnow()
                 session.add(submission)
-                session.commit()
+                await session.commit()
                 
                 AgentLogger.log_error(
                     f"AI evaluation failed for submission {submission_id}",
@@ -4,9 +4,9 @@ Interview Service - Manages interview dispatch, tracking, and workflow
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from app.models.schemas import InterviewTemplate, InterviewSubmission, Candidate, Job
-from app.db.database import engine
+from app.db.database import async_session
 from app.utils.logger import AgentLogger
-from sqlmodel import Session, select
+from sqlmodel import select
 import os
 
 
@@ -41,7 +41,7 @@ class InterviewService:
         Returns:
             Created template
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             template = InterviewTemplate(
                 job_id=job_id,
                 interview_type=interview_type,
@@ -52,8 +52,8 @@ class InterviewService:
                 time_limit_hours=time_limit_hours
             )
             session.add(template)
-            session.commit()
-            session.refresh(template)
+            await session.commit()
+            await session.refresh(template)
             
             AgentLogger.log_interview(
                 f"Created {interview_type} template: {title}",
@@ -80,11 +80,11 @@ class InterviewService:
         Returns:
             Created submission record
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Get candidate and job info
-            candidate = session.get(Candidate, candidate_id)
-            job = session.get(Job, job_id)
-            template = session.get(InterviewTemplate, template_id)
+            candidate = await session.get(Candidate, candidate_id)
+            job = await session.get(Job, job_id)
+            template = await session.get(InterviewTemplate, template_id)
             
             if not all([candidate, job, template]):
                 raise ValueError("Invalid candidate, job, or template ID")
@@ -97,8 +97,8 @@ class InterviewService:
                 status="sent"
             )
             session.add(submission)
-            session.commit()
-            session.refresh(submission)
+            await session.commit()
+            await session.refresh(submission)
             
             AgentLogger.log_interview(
                 f"Dispatched {template.interview_type} to {candidate.name} for {job.title}",
@@ -146,8 +146,8 @@ class InterviewService:
         Returns:
             Updated submission record
         """
-        with Session(engine) as session:
-            submission = session.get(InterviewSubmission, submission_id)
+        async with async_session() as session:
+            submission = await session.get(InterviewSubmission, submission_id)
             if not submission:
                 raise ValueError("Submission not found")
             
@@ -157,8 +157,8 @@ class InterviewService:
             submission.updated_at = datetime.utcnow()
             
             session.add(submission)
-            session.commit()
-            session.refresh(submission)
+            await session.commit()
+            await session.refresh(submission)
             
             AgentLogger.log_interview(
                 f"Candidate submitted response for submission {submission_id}",
@@ -179,7 +179,7 @@ class InterviewService:
         Returns:
             List of submissions ready for review
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             query = select(InterviewSubmission).where(
                 InterviewSubmission.status == "reviewed",
                 InterviewSubmission.human_reviewed == False
@@ -188,7 +188,7 @@ class InterviewService:
             if job_id:
                 query = query.where(InterviewSubmission.job_id == job_id)
             
-            submissions = session.exec(query).all()
+            submissions = (await session.exec(query)).all()
             return submissions
     
     async def approve_submission(
@@ -210,8 +210,8 @@ class InterviewService:
         Returns:
             Result with status and next actions
         """
-        with Session(engine) as session:
-            submission = session.get(InterviewSubmission, submission_id)
+        async with async_session() as session:
+            submission = await session.get(InterviewSubmission, submission_id)
             if not submission:
                 raise ValueError("Submission not found")
             
@@ -225,7 +225,7 @@ class InterviewService:
             submission.updated_at = datetime.utcnow()
             
             session.add(submission)
-            session.commit()
+            await session.commit()
             
             AgentLogger.log_interview(
                 f"Submission {submission_id} approved by {reviewer_name}",
@@ -274,8 +274,8 @@ class InterviewService:
         Returns:
             Result with status
         """
-        with Session(engine) as session:
-            submission = session.get(InterviewSubmission, submission_id)
+        async with async_session() as session:
+            submission = await session.get(InterviewSubmission, submission_id)
             if not submission:
                 raise ValueError("Submission not found")
             
@@ -288,7 +288,7 @@ class InterviewService:
             submission.updated_at = datetime.utcnow()
             
             session.add(submission)
-            session.commit()
+            await session.commit()
             
             AgentLogger.log_interview(
                 f"Submission {submission_id} rejected by {reviewer_name}",
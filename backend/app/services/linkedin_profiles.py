@@ -0,0 +1,314 @@
+"""
+LinkedIn Profile Index - Profile lookup for Step 5 enrichment
+
+Built in one pass over a profile source, keeping only handles and names:
+    - handle: a dict keyed by X handle ("@<handle>"), first profile wins
+    - name:   an inverted index from character trigram to profile positions
+
+Profile bodies stay in the source and are read when a lookup matches:
+    - .jsonl   one profile per line, read back by byte offset
+    - .db      SQLite table linkedin_profile(x_handle, name, profile), read back by rowid
+    - .json    a JSON array (loaded whole; fine for the mock dataset only)
+
+Name matching generates candidates from the query's trigrams (skipping
+trigrams so common their posting lists would dominate the work), ranks them
+by Dice similarity of the full names' trigram sets, and returns the best
+match at or above a confidence threshold. Trigrams are taken per word, so
+word order and punctuation don't matter ("Chen, Sarah" matches "Sarah Chen").
+
+    LINKEDIN_MATCH_THRESHOLD     - minimum similarity for a name match, 0-1 (default 0.7)
+    LINKEDIN_MATCH_MAX_POSTINGS  - trigrams in more profiles than this are skipped (default 50000)
+    LINKEDIN_MATCH_CANDIDATES    - candidates scored per lookup (default 100)
+    LINKEDIN_PROFILES_PATH       - profile dataset (default data/mock_linkedin_profiles.json)
+    LINKEDIN_PROFILE_CACHE_SIZE  - matched profile bodies kept in memory (default 1024)
+
+Convert a dataset to a streamable store:
+    python -m app.services.linkedin_profiles data/mock_linkedin_profiles.json profiles.db
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+LINKEDIN_MATCH_THRESHOLD = float(os.getenv("LINKEDIN_MATCH_THRESHOLD", "0.7"))
+LINKEDIN_MATCH_MAX_POSTINGS = int(os.getenv("LINKEDIN_MATCH_MAX_POSTINGS", "50000"))
+LINKEDIN_MATCH_CANDIDATES = int(os.getenv("LINKEDIN_MATCH_CANDIDATES", "100"))
+LINKEDIN_PROFILES_PATH = os.path.abspath(os.getenv(
+    "LINKEDIN_PROFILES_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "data", "mock_linkedin_profiles.json")
+))
+LINKEDIN_PROFILE_CACHE_SIZE = int(os.getenv("LINKEDIN_PROFILE_CACHE_SIZE", "1024"))
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize_handle(x_handle: str) -> str:
+    """X handle with a leading @"""
+    return x_handle if x_handle.startswith("@") else f"@{x_handle}"
+
+
+def name_trigrams(name: str) -> frozenset:
+    """Character trigrams of each lowercase word, padded so word edges count"""
+    grams = set()
+    for word in _WORD.findall(name.lower()):
+        padded = f"${word}$"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Dice coefficient of two trigram sets"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+# ========================================
+# PROFILE SOURCES
+# ========================================
+
+class ListProfileSource:
+    """Profiles already in memory"""
+
+    def __init__(self, profiles: List[Dict]):
+        self.profiles = profiles
+
+    def entries(self) -> Iterator[Tuple[Optional[str], str]]:
+        for profile in self.profiles:
+            yield profile.get("x_handle"), profile.get("name") or ""
+
+    def load(self, position: int) -> Dict:
+        return self.profiles[position]
+
+
+class JsonlProfileSource:
+    """One JSON profile per line; bodies are re-read by byte offset"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets = array("Q")
+
+    def entries(self) -> Iterator[Tuple[Optional[str], str]]:
+        self._offsets = array("Q")
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                start, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                profile = json.loads(line)
+                self._offsets.append(start)
+                yield profile.get("x_handle"), profile.get("name") or ""
+
+    def load(self, position: int) -> Dict:
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[position])
+            return json.loads(f.readline())
+
+
+class SqliteProfileSource:
+    """SQLite profile store; bodies are read by rowid"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._rowids = array("q")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def entries(self) -> Iterator[Tuple[Optional[str], str]]:
+        self._rowids = array("q")
+        connection = self._connect()
+        try:
+            for rowid, x_handle, name in connection.execute(
+                "SELECT rowid, x_handle, name FROM linkedin_profile ORDER BY rowid"
+            ):
+                self._rowids.append(rowid)
+                yield x_handle, name or ""
+        finally:
+            connection.close()
+
+    def load(self, position: int) -> Dict:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT profile FROM linkedin_profile WHERE rowid = ?", (self._rowids[position],)
+            ).fetchone()
+        finally:
+            connection.close()
+        return json.loads(row[0])
+
+
+ProfileSource = Union[ListProfileSource, JsonlProfileSource, SqliteProfileSource]
+
+
+def open_profile_source(path: str) -> ProfileSource:
+    """Profile source for a .jsonl, .db/.sqlite or .json dataset"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return JsonlProfileSource(path)
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        return SqliteProfileSource(path)
+    with open(path, "r") as f:
+        return ListProfileSource(json.load(f))
+
+
+def iter_profiles(path: str) -> Iterator[Dict]:
+    """Profiles of a .jsonl (streamed) or .json dataset"""
+    if os.path.splitext(path)[1].lower() == ".jsonl":
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r") as f:
+            yield from json.load(f)
+
+
+def write_sqlite_store(profiles: Iterable[Dict], path: str, batch_size: int = 1000) -> int:
+    """
+    Write profiles to a SQLite profile store
+
+    Args:
+        profiles: Profile dicts (consumed as a stream)
+        path: SQLite file to create, or replace the table in
+        batch_size: Rows per insert batch
+
+    Returns:
+        Number of profiles written
+    """
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("DROP TABLE IF EXISTS linkedin_profile")
+        connection.execute("CREATE TABLE linkedin_profile (x_handle TEXT, name TEXT, profile TEXT NOT NULL)")
+        written, batch = 0, []
+        for profile in profiles:
+            batch.append((profile.get("x_handle"), profile.get("name"), json.dumps(profile)))
+            if len(batch) >= batch_size:
+                connection.executemany("INSERT INTO linkedin_profile VALUES (?, ?, ?)", batch)
+                written, batch = written + len(batch), []
+        connection.executemany("INSERT INTO linkedin_profile VALUES (?, ?, ?)", batch)
+        connection.commit()
+        return written + len(batch)
+    finally:
+        connection.close()
+
+
+# ========================================
+# INDEX
+# ========================================
+
+class LinkedInProfileIndex:
+    """Handle dict and name-trigram inverted index over a profile source"""
+
+    def __init__(self, source: Union[ProfileSource, List[Dict]]):
+        """
+        Args:
+            source: Profile source, or a list of profile dicts
+        """
+        if isinstance(source, list):
+            source = ListProfileSource(source)
+        self.source = source
+        self._load = lru_cache(maxsize=LINKEDIN_PROFILE_CACHE_SIZE)(source.load)
+        self._names: List[str] = []
+        self._by_handle: Dict[str, int] = {}
+        self._by_trigram: Dict[str, array] = {}
+
+        for position, (handle, name) in enumerate(source.entries()):
+            self._names.append(name)
+            if handle:
+                self._by_handle.setdefault(handle, position)
+            # Appended in source order, so each posting list is sorted
+            for gram in name_trigrams(name):
+                postings = self._by_trigram.get(gram)
+                if postings is None:
+                    postings = self._by_trigram[gram] = array("I")
+                postings.append(position)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def by_handle(self, x_handle: str) -> Optional[Dict]:
+        """
+        Profile with this X handle
+
+        Args:
+            x_handle: X handle (with or without @)
+
+        Returns:
+            LinkedIn profile dict or None
+        """
+        position = self._by_handle.get(normalize_handle(x_handle))
+        return self._load(position) if position is not None else None
+
+    def match_name(
+        self,
+        name: str,
+        threshold: float = LINKEDIN_MATCH_THRESHOLD
+    ) -> Optional[Tuple[Dict, float]]:
+        """
+        Most similar profile name, if it is similar enough
+
+        Args:
+            name: Real name from X profile
+            threshold: Minimum Dice similarity (0-1)
+
+        Returns:
+            (profile, similarity) or None. Ties go to the earlier profile.
+        """
+        query = name_trigrams(name)
+        if not query:
+            return None
+
+        postings = sorted(
+            (self._by_trigram[gram] for gram in query if gram in self._by_trigram),
+            key=len
+        )
+        # Rare trigrams are the selective ones; always keep the rarest so a
+        # name made only of common trigrams still gets candidates
+        selective = [p for p in postings if len(p) <= LINKEDIN_MATCH_MAX_POSTINGS] or postings[:1]
+        shared = Counter()
+        for positions in selective:
+            shared.update(positions)
+
+        best = None
+        for position, _ in shared.most_common(LINKEDIN_MATCH_CANDIDATES):
+            score = similarity(query, name_trigrams(self._names[position]))
+            if score >= threshold and (best is None or (score, -position) > (best[1], -best[0])):
+                best = (position, score)
+
+        return (self._load(best[0]), round(best[1], 3)) if best else None
+
+    def by_name(self, name: str) -> Optional[Dict]:
+        """Best-matching profile for `name` at the default threshold, or None"""
+        match = self.match_name(name)
+        return match[0] if match else None
+
+
+_index: Optional[LinkedInProfileIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_profile_index() -> LinkedInProfileIndex:
+    """Index over LINKEDIN_PROFILES_PATH, built on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LinkedInProfileIndex(open_profile_source(LINKEDIN_PROFILES_PATH))
+                print(f"💼 Indexed {len(_index)} LinkedIn profiles from {LINKEDIN_PROFILES_PATH}")
+    return _index
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m app.services.linkedin_profiles <profiles.json|.jsonl> <store.db>")
+        sys.exit(1)
+    count = write_sqlite_store(iter_profiles(sys.argv[1]), sys.argv[2])
+    print(f"✅ Wrote {count} profiles to {sys.argv[2]}")
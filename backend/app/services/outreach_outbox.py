@@ -0,0 +1,441 @@
+"""
+Outreach Outbox - Durable, rate-limited delivery of X mentions and DMs
+
+Outreach is queued as OutreachMessage rows instead of being sent inline.
+A background worker drains due rows at the X write-rate limit with bounded
+concurrency, retries failures with exponential backoff, and records the
+outcome per candidate, so a crash mid-batch never loses who was contacted.
+
+The write limit is enforced from the database: a claim only takes as many
+real (non dry-run) messages as the window has left after the writes that
+reached X or are in flight, so any number of API and worker processes can
+run the outbox.
+"""
+import os
+import random
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import tweepy
+from sqlalchemy import case, or_
+from sqlmodel import Session, select, func, update
+from app.db.database import engine
+from app.models.schemas import OutreachMessage
+from app.services.x_mention_service import generate_mention_message, send_mention_to_candidate
+from app.services.x_outreach_service import generate_outreach_message, send_dm_to_candidate
+from app.services.x_client_registry import rate_limit_reset
+from app.services.x_user_resolver import get_cached_user_ids, resolve_user_ids
+from app.utils.logger import AgentLogger
+
+# X write limits (POST /2/tweets and DM create share a 15-minute window)
+WRITES_PER_WINDOW = int(os.getenv("OUTBOX_WRITES_PER_WINDOW", "200"))
+WINDOW_SECONDS = float(os.getenv("OUTBOX_WINDOW_SECONDS", "900"))
+
+# Worker tuning
+CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+POLL_INTERVAL_SECONDS = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "5"))
+BASE_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BASE_BACKOFF_SECONDS", "30"))
+# "sending" lease; sends never sleep through a 429, so none outlives it
+STALE_SENDING_MINUTES = 10
+
+# PostgreSQL advisory lock key that serializes real-write claims across processes
+OUTBOX_CLAIM_LOCK_ID = 300001
+
+
+# ========================================
+# ENQUEUE
+# ========================================
+
+def _enqueue(rows: List[OutreachMessage]) -> Dict:
+    """
+    Insert rows, skipping recipients already queued or contacted for the same job/channel
+
+    Dry runs and real sends are deduplicated separately, so a preview never
+    blocks the real message.
+    """
+    if not rows:
+        return {"queued": 0, "skipped": 0, "message_ids": []}
+
+    with Session(engine) as session:
+        existing = set(session.exec(
+            select(
+                OutreachMessage.job_id, OutreachMessage.username, OutreachMessage.channel, OutreachMessage.dry_run
+            ).where(
+                OutreachMessage.username.in_([r.username for r in rows]),
+                OutreachMessage.status != "failed"
+            )
+        ).all())
+
+        queued = []
+        for row in rows:
+            key = (row.job_id, row.username, row.channel, row.dry_run)
+            if key in existing:
+                continue
+            existing.add(key)
+            queued.append(row)
+
+        session.add_all(queued)
+        session.commit()
+        message_ids = [row.id for row in queued]
+
+    return {
+        "queued": len(message_ids),
+        "skipped": len(rows) - len(message_ids),
+        "message_ids": message_ids
+    }
+
+
+def enqueue_mentions(
+    candidates: List[Dict],
+    job_title: str,
+    job_link: str,
+    job_id: Optional[int] = None,
+    dry_run: bool = True
+) -> Dict:
+    """
+    Queue tweet mentions for a batch of routed candidates
+
+    Returns:
+        {"queued": int, "skipped": int, "message_ids": [...]}
+    """
+    rows = []
+    for candidate in candidates:
+        # Skip rejected candidates
+        if candidate.get('recommendation') == 'reject':
+            continue
+
+        username = candidate['username']
+        name = candidate.get('name', username)
+        recommendation = candidate.get('recommendation', 'interview')
+
+        rows.append(OutreachMessage(
+            job_id=job_id,
+            candidate_id=candidate.get('candidate_id'),
+            username=username,
+            channel="mention",
+            message=generate_mention_message(
+                username=username,
+                candidate_name=name.split()[0] if name else username,  # Use first name
+                job_title=job_title,
+                job_link=job_link,
+                recommendation=recommendation
+            ),
+            recommendation=recommendation,
+            dry_run=dry_run
+        ))
+
+    result = _enqueue(rows)
+    AgentLogger.log_outreach(
+        f"Queued {result['queued']} tweet mentions for {job_title} ({result['skipped']} already queued or sent)",
+        job_id=job_id,
+        queued=result['queued'],
+        skipped=result['skipped'],
+        dry_run=dry_run
+    )
+    return result
+
+
+def enqueue_dms(
+    candidates: List[Dict],
+    job_title: str,
+    job_link: str,
+    job_id: Optional[int] = None,
+    dry_run: bool = True
+) -> Dict:
+    """
+    Queue DMs for a batch of routed candidates
+
+    Returns:
+        {"queued": int, "skipped": int, "message_ids": [...]}
+    """
+    rows = []
+    for candidate in candidates:
+        # Skip rejected candidates
+        if candidate.get('recommendation') == 'reject':
+            continue
+
+        username = candidate['username']
+        recommendation = candidate.get('recommendation', 'interview')
+
+        rows.append(OutreachMessage(
+            job_id=job_id,
+            candidate_id=candidate.get('candidate_id'),
+            username=username,
+            channel="dm",
+            message=generate_outreach_message(
+                candidate_name=candidate.get('name', username),
+                job_title=job_title,
+                job_link=job_link,
+                recommendation=recommendation,
+                compatibility_score=candidate.get('compatibility', {}).get('compatibility_score', 0)
+            ),
+            recommendation=recommendation,
+            dry_run=dry_run
+        ))
+
+    result = _enqueue(rows)
+    AgentLogger.log_outreach(
+        f"Queued {result['queued']} DMs for {job_title} ({result['skipped']} already queued or sent)",
+        job_id=job_id,
+        queued=result['queued'],
+        skipped=result['skipped'],
+        dry_run=dry_run
+    )
+    return result
+
+
+def get_outbox_status(job_id: Optional[int] = None) -> Dict:
+    """Message counts by status, optionally for one job"""
+    with Session(engine) as session:
+        query = select(OutreachMessage.status, func.count(OutreachMessage.id)).group_by(OutreachMessage.status)
+        if job_id is not None:
+            query = query.where(OutreachMessage.job_id == job_id)
+        counts = {status: count for status, count in session.exec(query).all()}
+
+    return {
+        "job_id": job_id,
+        "queued": counts.get("queued", 0),
+        "sending": counts.get("sending", 0),
+        "sent": counts.get("sent", 0),
+        "failed": counts.get("failed", 0),
+        "total": sum(counts.values())
+    }
+
+
+# ========================================
+# WORKER
+# ========================================
+
+class OutboxWorker:
+    """Drains queued outreach at the X write-rate limit"""
+
+    def __init__(
+        self,
+        concurrency: int = CONCURRENCY,
+        writes_per_window: int = WRITES_PER_WINDOW,
+        window_seconds: float = WINDOW_SECONDS
+    ):
+        self.concurrency = concurrency
+        self.writes_per_window = writes_per_window
+        self.window_seconds = window_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- lifecycle ----
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        """Poll for due messages until cancelled"""
+        print(f"📬 Outreach outbox worker started (concurrency {self.concurrency})")
+        while True:
+            try:
+                # Every poll, so rows orphaned by another crashed process are picked up too
+                await asyncio.to_thread(self._requeue_stale)
+                drained = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                AgentLogger.log_error("Outreach outbox worker iteration failed", error=e)
+                drained = 0
+            if not drained:
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def drain_once(self, limit: int = BATCH_SIZE) -> int:
+        """Claim and send one batch of due messages. Returns the number processed."""
+        messages = await asyncio.to_thread(
+            self._claim_due, limit, self.writes_per_window, self.window_seconds
+        )
+        if not messages:
+            return 0
+
+        # Resolve all DM recipients in one lookup
+        dm_usernames = [m.username for m in messages if m.channel == "dm" and not m.dry_run]
+        user_ids, lookup_retry_at = (
+            await asyncio.to_thread(self._resolve_recipients, dm_usernames) if dm_usernames else ({}, None)
+        )
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(message: OutreachMessage):
+            async with semaphore:
+                result = await asyncio.to_thread(self._send, message, user_ids, lookup_retry_at)
+                await asyncio.to_thread(self._record_result, message, result)
+
+        await asyncio.gather(*(deliver(m) for m in messages))
+        return len(messages)
+
+    # ---- database state transitions ----
+
+    @staticmethod
+    def _requeue_stale():
+        """Requeue messages left in "sending" by a crashed worker (at-least-once delivery)"""
+        cutoff = datetime.utcnow() - timedelta(minutes=STALE_SENDING_MINUTES)
+        with Session(engine) as session:
+            session.exec(
+                update(OutreachMessage)
+                .where(OutreachMessage.status == "sending", OutreachMessage.updated_at < cutoff)
+                .values(status="queued", updated_at=datetime.utcnow())
+            )
+            session.commit()
+
+    @staticmethod
+    def _claim_due(limit: int, writes_per_window: int, window_seconds: float) -> List[OutreachMessage]:
+        """
+        Claim due messages, taking real writes only up to the window's remaining budget
+
+        Each claim is one conditional UPDATE ... RETURNING, so concurrent workers
+        never claim the same row and each gets back exactly the rows it claimed.
+        SQLite runs one writer at a time, which makes counting and claiming real
+        writes atomic; on PostgreSQL the real-write claim holds a transaction
+        advisory lock, so two workers can't both spend the same budget.
+        """
+        now = datetime.utcnow()
+        due = (OutreachMessage.status == "queued", OutreachMessage.next_attempt_at <= now)
+
+        # Real writes that reached X within the window (sent or not) or are in
+        # flight, by every outbox process
+        window_start = now - timedelta(seconds=window_seconds)
+        used = select(func.count(OutreachMessage.id)).where(
+            OutreachMessage.dry_run == False,
+            or_(
+                OutreachMessage.status == "sending",
+                OutreachMessage.last_attempt_at >= window_start,
+                OutreachMessage.sent_at >= window_start
+            )
+        ).scalar_subquery()
+        remaining = writes_per_window - used
+        write_limit = case((remaining <= 0, 0), (remaining < limit, remaining), else_=limit)
+
+        claimed = []
+        with Session(engine) as session:
+            for dry_run, batch_limit in ((True, limit), (False, write_limit)):
+                if not dry_run and engine.dialect.name == "postgresql":
+                    session.exec(select(func.pg_advisory_xact_lock(OUTBOX_CLAIM_LOCK_ID)))
+                rows = session.exec(
+                    update(OutreachMessage)
+                    .where(OutreachMessage.id.in_(
+                        select(OutreachMessage.id)
+                        .where(*due, OutreachMessage.dry_run == dry_run)
+                        .order_by(OutreachMessage.next_attempt_at)
+                        .limit(batch_limit)
+                    ), *due)
+                    .values(status="sending", updated_at=now)
+                    .returning(OutreachMessage)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                # Detach before committing, so the commit doesn't expire them
+                for message in rows:
+                    session.expunge(message)
+                claimed.extend(rows)
+                session.commit()
+
+        return claimed
+
+    # ---- delivery ----
+    # The X calls never sleep through a 429: a send still waiting for its window
+    # when the "sending" lease runs out would be requeued, claimed by another
+    # slot and sent twice. A rate-limited send is requeued until the reset instead.
+
+    @staticmethod
+    def _resolve_recipients(usernames: List[str]) -> Tuple[Dict[str, str], Optional[datetime]]:
+        """DM recipient user IDs, and when to retry the lookup if it was rate limited"""
+        try:
+            return resolve_user_ids(usernames, wait_on_rate_limit=False), None
+        except tweepy.TooManyRequests as e:
+            return get_cached_user_ids(usernames), rate_limit_reset(e) or datetime.utcnow()
+
+    @staticmethod
+    def _send(message: OutreachMessage, user_ids: Dict[str, str], lookup_retry_at: Optional[datetime]) -> Dict:
+        if message.channel == "mention":
+            result = send_mention_to_candidate(
+                message.username, message.message, dry_run=message.dry_run, wait_on_rate_limit=False
+            )
+            result["external_id"] = result.get("tweet_id")
+            result["reached_x"] = not message.dry_run and not result.get("rate_limited")
+            return result
+
+        user_id = user_ids.get(message.username.lower())
+        if not message.dry_run and not user_id:
+            if lookup_retry_at:
+                return {
+                    "success": False, "external_id": None, "reached_x": False,
+                    "error": "Rate limited: user lookup", "rate_limited": True, "retry_at": lookup_retry_at
+                }
+            return {
+                "success": False, "external_id": None, "reached_x": False,
+                "error": f"User @{message.username} not found"
+            }
+        result = send_dm_to_candidate(
+            message.username, message.message, dry_run=message.dry_run, user_id=user_id, wait_on_rate_limit=False
+        )
+        result["external_id"] = result.get("message_id")
+        result["reached_x"] = not message.dry_run and not result.get("rate_limited")
+        return result
+
+    @staticmethod
+    def _record_result(message: OutreachMessage, result: Dict):
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            row = session.get(OutreachMessage, message.id)
+            row.updated_at = now
+            if result.get("reached_x"):
+                row.last_attempt_at = now
+
+            if result.get("rate_limited"):
+                # X refused before doing anything: wait for the window without using an attempt
+                row.status = "queued"
+                row.last_error = result.get("error")
+                row.next_attempt_at = max(
+                    result.get("retry_at") or now + timedelta(seconds=BASE_BACKOFF_SECONDS),
+                    now + timedelta(seconds=1)
+                )
+                session.add(row)
+                session.commit()
+                return
+
+            row.attempts += 1
+            if result.get("success"):
+                row.status = "sent"
+                row.sent_at = now
+                row.external_id = result.get("external_id")
+                row.last_error = None
+            else:
+                row.last_error = result.get("error")
+                if row.attempts >= row.max_attempts:
+                    row.status = "failed"
+                else:
+                    # Exponential backoff with jitter
+                    delay = BASE_BACKOFF_SECONDS * (2 ** (row.attempts - 1)) * random.uniform(0.8, 1.2)
+                    row.status = "queued"
+                    row.next_attempt_at = now + timedelta(seconds=delay)
+
+            session.add(row)
+            session.commit()
+
+            if row.status in ("sent", "failed"):
+                AgentLogger.log_outreach(
+                    f"{'Sent' if row.status == 'sent' else 'Failed'} {row.channel} to @{row.username}"
+                    + (" [DRY RUN]" if row.dry_run else ""),
+                    job_id=row.job_id,
+                    candidate_id=row.candidate_id,
+                    outbox_id=row.id,
+                    status=row.status,
+                    attempts=row.attempts,
+                    external_id=row.external_id,
+                    error=row.last_error
+                )
+
+
+outbox_worker = OutboxWorker()
@@ -0,0 +1,249 @@
+"""
+Pipeline Checkpoints - Resumable sourcing runs
+
+Every sourcing run is a PipelineRun keyed by pipeline_id. Each completed
+step stores its output as a PipelineCheckpoint (zlib-compressed JSON), and
+long per-item steps also store partial progress, one row per chunk. A
+resumed run loads the checkpoints and continues after the last completed
+step, so a failure in Step 6 does not repeat embedding, topic discovery,
+X search or role verification.
+
+Each attempt also stores its timing waterfall (see app/utils/timing.py) as a
+PipelineTiming, so runs of the same job can be compared.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlmodel import Session, select, delete
+from app.db.database import engine
+from app.models.schemas import PipelineRun, PipelineCheckpoint, PipelineTiming
+
+STEP_NAMES = {
+    1: "embedding",
+    2: "topics",
+    3: "x_users",
+    4: "verified_developers",
+    5: "enriched_candidates",
+    6: "scored_candidates"
+}
+
+
+def encode_payload(data: Any) -> bytes:
+    return zlib.compress(json.dumps(data, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_payload(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _item_count(data: Any) -> int:
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        return len(data.get("results", []))  # Partial progress
+    return 0
+
+
+# ========================================
+# RUNS
+# ========================================
+
+def _run_to_dict(run: PipelineRun) -> Dict:
+    return {
+        "pipeline_id": run.pipeline_id,
+        "job_id": run.job_id,
+        "mode": run.mode,
+        "params": run.params,
+        "status": run.status,
+        "last_completed_step": run.last_completed_step,
+        "last_completed_step_name": STEP_NAMES.get(run.last_completed_step),
+        "error": run.error,
+        "created_at": run.created_at.isoformat(),
+        "updated_at": run.updated_at.isoformat(),
+        "completed_at": run.completed_at.isoformat() if run.completed_at else None
+    }
+
+
+def start_run(pipeline_id: str, job_id: int, mode: str = "batch", params: Optional[Dict] = None) -> Dict:
+    """Create a run, or mark an existing one as running again when it is resumed"""
+    with Session(engine) as session:
+        run = session.exec(select(PipelineRun).where(PipelineRun.pipeline_id == pipeline_id)).first()
+        if run is None:
+            run = PipelineRun(pipeline_id=pipeline_id, job_id=job_id, mode=mode, params=params)
+        run.status = "running"
+        run.error = None
+        run.updated_at = datetime.utcnow()
+        session.add(run)
+        session.commit()
+        session.refresh(run)
+        return _run_to_dict(run)
+
+
+def finish_run(pipeline_id: str, status: str, error: Optional[str] = None) -> None:
+    """Mark a run as completed or failed"""
+    with Session(engine) as session:
+        run = session.exec(select(PipelineRun).where(PipelineRun.pipeline_id == pipeline_id)).first()
+        if run is None:
+            return
+        now = datetime.utcnow()
+        run.status = status
+        run.error = error
+        run.updated_at = now
+        if status == "completed":
+            run.completed_at = now
+        session.add(run)
+        session.commit()
+
+
+def get_run(pipeline_id: str) -> Optional[Dict]:
+    with Session(engine) as session:
+        run = session.exec(select(PipelineRun).where(PipelineRun.pipeline_id == pipeline_id)).first()
+        return _run_to_dict(run) if run else None
+
+
+def list_runs(job_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+    """Most recent runs first, optionally for one job"""
+    with Session(engine) as session:
+        query = select(PipelineRun).order_by(PipelineRun.created_at.desc()).limit(limit)
+        if job_id is not None:
+            query = query.where(PipelineRun.job_id == job_id)
+        return [_run_to_dict(run) for run in session.exec(query).all()]
+
+
+# ========================================
+# CHECKPOINTS
+# ========================================
+
+def save_checkpoint(pipeline_id: str, step: int, data: Any, complete: bool = True) -> None:
+    """
+    Store a step's output, replacing any earlier checkpoint (or partial
+    chunks) for the same step
+
+    Args:
+        pipeline_id: Run the checkpoint belongs to
+        step: Pipeline step number (1-6)
+        data: JSON-serializable step output
+        complete: False for partial progress within a step
+    """
+    payload = encode_payload(data)
+    with Session(engine) as session:
+        session.exec(
+            delete(PipelineCheckpoint).where(
+                PipelineCheckpoint.pipeline_id == pipeline_id,
+                PipelineCheckpoint.step == step
+            )
+        )
+        session.add(PipelineCheckpoint(
+            pipeline_id=pipeline_id,
+            step=step,
+            step_name=STEP_NAMES.get(step, f"step{step}"),
+            complete=complete,
+            item_count=_item_count(data),
+            payload=payload
+        ))
+
+        run = session.exec(select(PipelineRun).where(PipelineRun.pipeline_id == pipeline_id)).first()
+        if run is not None:
+            if complete:
+                run.last_completed_step = max(run.last_completed_step, step)
+            run.updated_at = datetime.utcnow()
+            session.add(run)
+        session.commit()
+
+
+def append_checkpoint(pipeline_id: str, step: int, data: Dict) -> None:
+    """
+    Store one chunk of a step's partial progress next to the earlier chunks
+
+    Args:
+        pipeline_id: Run the checkpoint belongs to
+        step: Pipeline step number (1-6)
+        data: {"processed": [...], "results": [...]} for this chunk only
+    """
+    with Session(engine) as session:
+        session.add(PipelineCheckpoint(
+            pipeline_id=pipeline_id,
+            step=step,
+            step_name=STEP_NAMES.get(step, f"step{step}"),
+            complete=False,
+            item_count=_item_count(data),
+            payload=encode_payload(data)
+        ))
+        session.commit()
+
+
+def load_checkpoints(pipeline_id: str) -> Dict[int, Dict]:
+    """
+    Load every checkpoint of a run
+
+    Partial chunks of a step are merged, in the order they were stored.
+
+    Returns:
+        {step: {"complete": bool, "data": ...}}
+    """
+    with Session(engine) as session:
+        rows = session.exec(
+            select(PipelineCheckpoint)
+            .where(PipelineCheckpoint.pipeline_id == pipeline_id)
+            .order_by(PipelineCheckpoint.id)
+        ).all()
+
+        checkpoints: Dict[int, Dict] = {}
+        for row in rows:
+            data = decode_payload(row.payload)
+            entry = checkpoints.get(row.step)
+            if row.complete or entry is None or entry["complete"]:
+                checkpoints[row.step] = {"complete": row.complete, "data": data}
+            else:
+                entry["data"]["processed"].extend(data["processed"])
+                entry["data"]["results"].extend(data["results"])
+        return checkpoints
+
+
+# ========================================
+# TIMINGS
+# ========================================
+
+def save_timing(pipeline_id: str, job_ids: List[int], mode: str, status: str, waterfall: Dict) -> None:
+    """Store the waterfall of one pipeline attempt for every job it covered"""
+    payload = encode_payload(waterfall)
+    with Session(engine) as session:
+        for job_id in job_ids:
+            session.add(PipelineTiming(
+                pipeline_id=pipeline_id,
+                job_id=job_id,
+                mode=mode,
+                status=status,
+                wall_seconds=waterfall["wall_seconds"],
+                total_seconds=waterfall["total_seconds"],
+                concurrency=waterfall["concurrency"],
+                waterfall=payload
+            ))
+        session.commit()
+
+
+def list_timings(job_id: int, limit: int = 10) -> List[Dict]:
+    """
+    Timing of a job's most recent pipeline attempts, newest first
+
+    Returns:
+        [{"pipeline_id", "mode", "status", "created_at", "waterfall": {...}}]
+    """
+    with Session(engine) as session:
+        rows = session.exec(
+            select(PipelineTiming)
+            .where(PipelineTiming.job_id == job_id)
+            .order_by(PipelineTiming.created_at.desc(), PipelineTiming.id.desc())
+            .limit(limit)
+        ).all()
+        return [
+            {
+                "pipeline_id": row.pipeline_id,
+                "mode": row.mode,
+                "status": row.status,
+                "created_at": row.created_at.isoformat(),
+                "waterfall": decode_payload(row.waterfall)
+            }
+            for row in rows
+        ]
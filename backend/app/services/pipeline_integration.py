@@ -5,8 +5,8 @@ from typing import Optional
 from app.models.schemas import JobCandidate, InterviewTemplate
 from app.services.interview_service import interview_service
 from app.utils.logger import AgentLogger
-from app.db.database import engine
-from sqlmodel import Session, select
+from app.db.database import async_session
+from sqlmodel import select
 
 
 class PipelineIntegration:
@@ -47,13 +47,13 @@ class PipelineIntegration:
         """
         Automatically dispatch take-home interview when candidate reaches that stage
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Check if template exists for this job
             query = select(InterviewTemplate).where(
                 InterviewTemplate.job_id == job_id,
                 InterviewTemplate.interview_type == "takehome"
             )
-            template = session.exec(query).first()
+            template = (await session.exec(query)).first()
             
             if not template:
                 AgentLogger.log_interview(
@@ -67,13 +67,13 @@ class PipelineIntegration:
             
             # Check if interview already dispatched
             from app.models.schemas import InterviewSubmission
-            existing = session.exec(
+            existing = (await session.exec(
                 select(InterviewSubmission).where(
                     InterviewSubmission.candidate_id == candidate_id,
                     InterviewSubmission.job_id == job_id,
                     InterviewSubmission.template_id == template.id
                 )
-            ).first()
+            )).first()
             
             if existing:
                 AgentLogger.log_interview(
@@ -121,20 +121,20 @@ class PipelineIntegration:
         
         Advances candidate stage and triggers next steps
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Update candidate stage
-            job_candidate = session.exec(
+            job_candidate = (await session.exec(
                 select(JobCandidate).where(
                     JobCandidate.candidate_id == candidate_id,
                     JobCandidate.job_id == job_id
                 )
-            ).first()
+            )).first()
             
             if job_candidate:
                 old_stage = job_candidate.stage
                 job_candidate.stage = "interview"  # Move to next stage
                 session.add(job_candidate)
-                session.commit()
+                await session.commit()
                 
                 AgentLogger.log_interview(
                     f"Candidate {candidate_id} advanced from {old_stage} to interview after approval",
@@ -148,8 +148,8 @@ class PipelineIntegration:
                 try:
                     from app.services.email_service import email_service
                     from app.models.schemas import Candidate, Job
-                    candidate = session.get(Candidate, candidate_id)
-                    job = session.get(Job, job_id)
+                    candidate = await session.get(Candidate, candidate_id)
+                    job = await session.get(Job, job_id)
                     if candidate and candidate.email and job:
                         await email_service.send_approval_notification(
                             to_email=candidate.email,
@@ -175,20 +175,20 @@ class PipelineIntegration:
         
         Updates candidate stage and triggers rejection email
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Update candidate stage
-            job_candidate = session.exec(
+            job_candidate = (await session.exec(
                 select(JobCandidate).where(
                     JobCandidate.candidate_id == candidate_id,
                     JobCandidate.job_id == job_id
                 )
-            ).first()
+            )).first()
             
             if job_candidate:
                 old_stage = job_candidate.stage
                 job_candidate.stage = "rejected"
                 session.add(job_candidate)
-                session.commit()
+                await session.commit()
                 
                 AgentLogger.log_interview(
                     f"Candidate {candidate_id} rejected after interview evaluation",
@@ -203,9 +203,9 @@ class PipelineIntegration:
                 try:
                     from app.services.email_service import email_service
                     from app.models.schemas import Candidate, Job, InterviewSubmission
-                    candidate = session.get(Candidate, candidate_id)
-                    job = session.get(Job, job_id)
-                    submission = session.get(InterviewSubmission, submission_id)
+                    candidate = await session.get(Candidate, candidate_id)
+                    job = await session.get(Job, job_id)
+                    submission = await session.get(InterviewSubmission, submission_id)
                     
                     positive_note = None
                     if submission and submission.ai_strengths:
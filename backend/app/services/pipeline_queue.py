@@ -0,0 +1,355 @@
+"""
+Pipeline Queue - Durable queue of sourcing pipelines for worker processes
+
+The API enqueues pipelines; pipeline workers (app/workers/pipeline_worker.py)
+claim them, heartbeat while they run and record the outcome. PipelineQueue
+is the interface workers and routes use; SQLitePipelineQueue implements it
+on the app database with conditional updates, so any number of workers on
+any number of machines sharing the database never claim the same pipeline.
+Other backends (Redis, Postgres SKIP LOCKED, SQS) implement the same class.
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlmodel import Session, select, update, func
+from app.db.database import engine
+from app.models.schemas import PipelineJob
+
+# Backend used by get_pipeline_queue()
+PIPELINE_QUEUE_BACKEND = os.getenv("PIPELINE_QUEUE_BACKEND", "sqlite")
+
+# A running pipeline whose worker has not heartbeat for this long is requeued
+STALE_HEARTBEAT_SECONDS = float(os.getenv("PIPELINE_STALE_HEARTBEAT_SECONDS", "120"))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _job_to_dict(job: PipelineJob) -> Dict:
+    return {
+        "id": job.id,
+        "pipeline_id": job.pipeline_id,
+        "kind": job.kind,
+        "payload": job.payload,
+        "status": job.status,
+        "attempts": job.attempts,
+        "cancel_requested": job.cancel_requested,
+        "worker_id": job.worker_id,
+        "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+class PipelineQueue(ABC):
+    """Interface of a durable pipeline queue"""
+
+    @abstractmethod
+    def enqueue(self, pipeline_id: str, kind: str, payload: Dict) -> Dict:
+        """Add a pipeline to the queue (a finished pipeline_id is queued again)"""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Atomically claim the oldest queued pipeline, or None if the queue is empty"""
+
+    @abstractmethod
+    def heartbeat(self, pipeline_id: str, worker_id: str, progress: Optional[Dict] = None) -> str:
+        """
+        Record that the worker is alive
+
+        Returns:
+            "running", "cancel_requested", or "lost" when the pipeline no longer
+            belongs to this worker (requeued as stale and claimed elsewhere)
+        """
+
+    @abstractmethod
+    def finish(
+        self,
+        pipeline_id: str,
+        worker_id: str,
+        status: str,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Record the outcome (completed, failed or cancelled) if the worker still owns the pipeline
+
+        A failed single-job pipeline is requeued until max_attempts; a failed
+        batch pipeline has no checkpoints to resume from and fails directly.
+        """
+
+    @abstractmethod
+    def release(self, pipeline_id: str, worker_id: str) -> Optional[str]:
+        """
+        Put a running pipeline back in the queue when its worker shuts down;
+        one the user asked to cancel is cancelled instead. Returns the new
+        status, or None if the worker no longer owns the pipeline.
+        """
+
+    @abstractmethod
+    def request_cancel(self, pipeline_id: str) -> Optional[str]:
+        """Cancel a queued pipeline, or flag a running one for its worker. Returns the new status."""
+
+    @abstractmethod
+    def requeue_stale(self) -> int:
+        """
+        Requeue running pipelines whose worker stopped heartbeating; those
+        already at max_attempts fail instead, and those the user asked to
+        cancel are cancelled. Returns the requeued count.
+        """
+
+    @abstractmethod
+    def get(self, pipeline_id: str) -> Optional[Dict]:
+        """A pipeline's queue entry"""
+
+    @abstractmethod
+    def active_for_job(self, job_id: int) -> Optional[Dict]:
+        """The queued or running pipeline covering a job, if any"""
+
+    @abstractmethod
+    def list_active(self) -> List[Dict]:
+        """Every queued or running pipeline"""
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Pipeline counts by status"""
+
+
+class SQLitePipelineQueue(PipelineQueue):
+    """PipelineQueue stored in the PipelineJob table"""
+
+    def enqueue(self, pipeline_id: str, kind: str, payload: Dict) -> Dict:
+        with Session(engine) as session:
+            # Re-enqueueing a finished pipeline (resume) resets its entry
+            job = session.exec(select(PipelineJob).where(PipelineJob.pipeline_id == pipeline_id)).first()
+            if job is None:
+                job = PipelineJob(pipeline_id=pipeline_id, kind=kind, payload=payload)
+            elif job.status in ACTIVE_STATUSES:
+                return _job_to_dict(job)
+            else:
+                job.kind = kind
+                job.payload = payload
+                job.status = "queued"
+                job.attempts = 0
+                job.cancel_requested = False
+                job.worker_id = None
+                job.error = None
+                job.finished_at = None
+                job.updated_at = datetime.utcnow()
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+            return _job_to_dict(job)
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            candidates = session.exec(
+                select(PipelineJob.id)
+                .where(PipelineJob.status == "queued")
+                .order_by(PipelineJob.created_at)
+                .limit(5)
+            ).all()
+
+            # Conditional update: only one worker can move a row out of "queued"
+            for job_id in candidates:
+                claimed = session.exec(
+                    update(PipelineJob)
+                    .where(PipelineJob.id == job_id, PipelineJob.status == "queued")
+                    .values(
+                        status="running",
+                        worker_id=worker_id,
+                        claimed_at=now,
+                        heartbeat_at=now,
+                        attempts=PipelineJob.attempts + 1,
+                        updated_at=now
+                    )
+                )
+                session.commit()
+                if claimed.rowcount:
+                    return _job_to_dict(session.get(PipelineJob, job_id))
+        return None
+
+    def heartbeat(self, pipeline_id: str, worker_id: str, progress: Optional[Dict] = None) -> str:
+        now = datetime.utcnow()
+        values = {"heartbeat_at": now, "updated_at": now}
+        if progress is not None:
+            values["progress"] = progress
+        with Session(engine) as session:
+            beat = session.exec(
+                update(PipelineJob)
+                .where(
+                    PipelineJob.pipeline_id == pipeline_id,
+                    PipelineJob.worker_id == worker_id,
+                    PipelineJob.status == "running"
+                )
+                .values(**values)
+            )
+            session.commit()
+            if not beat.rowcount:
+                return "lost"
+            cancel_requested = session.exec(
+                select(PipelineJob.cancel_requested).where(PipelineJob.pipeline_id == pipeline_id)
+            ).first()
+            return "cancel_requested" if cancel_requested else "running"
+
+    def finish(
+        self,
+        pipeline_id: str,
+        worker_id: str,
+        status: str,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            job = session.exec(
+                select(PipelineJob).where(
+                    PipelineJob.pipeline_id == pipeline_id,
+                    PipelineJob.worker_id == worker_id,
+                    PipelineJob.status == "running"
+                )
+            ).first()
+            if job is None:
+                # Requeued as stale and now owned by another worker
+                return False
+            # Failed single-job attempts go back to the queue until max_attempts and resume
+            # from their checkpoints. Batch runs don't checkpoint, so a retry would repeat
+            # all of their search and scoring spend; they fail directly.
+            retry = job.kind == "single" and job.attempts < job.max_attempts and not job.cancel_requested
+            if status == "failed" and retry:
+                job.status = "queued"
+                job.worker_id = None
+            else:
+                job.status = status
+                job.finished_at = now
+            job.result = result
+            job.error = error
+            job.updated_at = now
+            session.add(job)
+            session.commit()
+            return True
+
+    def release(self, pipeline_id: str, worker_id: str) -> Optional[str]:
+        now = datetime.utcnow()
+        owned = (
+            PipelineJob.pipeline_id == pipeline_id,
+            PipelineJob.worker_id == worker_id,
+            PipelineJob.status == "running"
+        )
+        with Session(engine) as session:
+            # Stopped by the user while shutting down: don't run it again
+            cancelled = session.exec(
+                update(PipelineJob)
+                .where(*owned, PipelineJob.cancel_requested == True)
+                .values(status="cancelled", worker_id=None, finished_at=now, updated_at=now)
+            )
+            # A shutdown does not count as an attempt
+            released = session.exec(
+                update(PipelineJob)
+                .where(*owned, PipelineJob.cancel_requested == False)
+                .values(
+                    status="queued",
+                    worker_id=None,
+                    attempts=PipelineJob.attempts - 1,
+                    updated_at=now
+                )
+            )
+            session.commit()
+            if cancelled.rowcount:
+                return "cancelled"
+            return "queued" if released.rowcount else None
+
+    def request_cancel(self, pipeline_id: str) -> Optional[str]:
+        now = datetime.utcnow()
+        with Session(engine) as session:
+            job = session.exec(select(PipelineJob).where(PipelineJob.pipeline_id == pipeline_id)).first()
+            if job is None or job.status not in ACTIVE_STATUSES:
+                return None
+            job.cancel_requested = True
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = now
+            job.updated_at = now
+            session.add(job)
+            session.commit()
+            return job.status
+
+    def requeue_stale(self) -> int:
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=STALE_HEARTBEAT_SECONDS)
+        stale = (PipelineJob.status == "running", PipelineJob.heartbeat_at < cutoff)
+        with Session(engine) as session:
+            # Stopped by the user while its worker was down: don't run it again
+            session.exec(
+                update(PipelineJob)
+                .where(*stale, PipelineJob.cancel_requested == True)
+                .values(status="cancelled", worker_id=None, finished_at=now, updated_at=now)
+            )
+            # A pipeline that keeps taking its worker down stops at max_attempts
+            session.exec(
+                update(PipelineJob)
+                .where(*stale, PipelineJob.attempts >= PipelineJob.max_attempts)
+                .values(
+                    status="failed",
+                    worker_id=None,
+                    error="Worker stopped heartbeating on the last attempt",
+                    finished_at=now,
+                    updated_at=now
+                )
+            )
+            result = session.exec(
+                update(PipelineJob)
+                .where(*stale, PipelineJob.cancel_requested == False)
+                .values(status="queued", worker_id=None, updated_at=now)
+            )
+            session.commit()
+            return result.rowcount
+
+    def get(self, pipeline_id: str) -> Optional[Dict]:
+        with Session(engine) as session:
+            job = session.exec(select(PipelineJob).where(PipelineJob.pipeline_id == pipeline_id)).first()
+            return _job_to_dict(job) if job else None
+
+    def active_for_job(self, job_id: int) -> Optional[Dict]:
+        for job in self.list_active():
+            if job_id in job["payload"].get("job_ids", []):
+                return job
+        return None
+
+    def list_active(self) -> List[Dict]:
+        with Session(engine) as session:
+            jobs = session.exec(
+                select(PipelineJob)
+                .where(PipelineJob.status.in_(ACTIVE_STATUSES))
+                .order_by(PipelineJob.created_at)
+            ).all()
+            return [_job_to_dict(job) for job in jobs]
+
+    def counts(self) -> Dict[str, int]:
+        with Session(engine) as session:
+            rows = session.exec(
+                select(PipelineJob.status, func.count(PipelineJob.id)).group_by(PipelineJob.status)
+            ).all()
+            return {status: count for status, count in rows}
+
+
+_QUEUE_BACKENDS = {
+    "sqlite": SQLitePipelineQueue
+}
+
+_queue: Optional[PipelineQueue] = None
+
+
+def get_pipeline_queue() -> PipelineQueue:
+    """The configured pipeline queue (PIPELINE_QUEUE_BACKEND)"""
+    global _queue
+    if _queue is None:
+        backend = _QUEUE_BACKENDS.get(PIPELINE_QUEUE_BACKEND)
+        if backend is None:
+            raise ValueError(f"Unknown PIPELINE_QUEUE_BACKEND: {PIPELINE_QUEUE_BACKEND}")
+        _queue = backend()
+    return _queue
@@ -0,0 +1,198 @@
+"""
+Pipeline Runner - Executes queued sourcing pipelines
+
+Called by pipeline workers for each claimed PipelineJob. Loads the jobs from
+the database, runs the SourcingAgent and records the PipelineRun outcome.
+Runs of a requeued or resumed pipeline reuse their pipeline_id, so they
+continue from the last checkpoint. Every attempt is traced and its timing
+waterfall stored for comparison with earlier runs, and the events it
+publishes are tagged with its pipeline and jobs.
+"""
+import asyncio
+from typing import Dict
+from sqlmodel import Session, select
+from app.db.database import engine
+from app.models.schemas import Job
+from app.services.sourcing_agent import SourcingAgent
+from app.services.pipeline_checkpoints import start_run, finish_run, get_run, save_timing
+from app.services.event_hub import pipeline_events
+from app.utils.logger import AgentLogger
+from app.utils.timing import RunTrace, trace_run
+
+
+def _load_jobs(job_ids) -> Dict[int, Job]:
+    with Session(engine) as session:
+        return {job.id: job for job in session.exec(select(Job).where(Job.id.in_(job_ids))).all()}
+
+
+async def _record_timing(trace: RunTrace, pipeline_id: str, job_ids, mode: str, status: str):
+    trace.finish()
+    try:
+        waterfall = trace.waterfall()
+        await asyncio.to_thread(save_timing, pipeline_id, job_ids, mode, status, waterfall)
+        print(f"⏱️ {pipeline_id} {status} in {waterfall['wall_seconds']}s "
+              f"({waterfall['total_seconds']}s of external calls, concurrency {waterfall['concurrency']})")
+    except Exception as e:
+        AgentLogger.log_error("Failed to store pipeline timing", error=e, pipeline_id=pipeline_id)
+
+
+async def run_single_pipeline(pipeline_id: str, payload: Dict) -> Dict:
+    """
+    Run the sourcing pipeline for one job
+
+    Returns:
+        Summary of the run (counts only, safe to store as JSON)
+    """
+    job_id = payload["job_ids"][0]
+    job = (await asyncio.to_thread(_load_jobs, [job_id])).get(job_id)
+    if job is None:
+        raise ValueError(f"Job {job_id} not found")
+
+    # A retried or resumed run continues from its checkpoints in batch mode
+    previous = await asyncio.to_thread(get_run, pipeline_id)
+    streaming = payload.get("streaming", False) and not (previous and previous["last_completed_step"] > 2)
+    mode = "streaming" if streaming else "batch"
+    await asyncio.to_thread(
+        start_run,
+        pipeline_id,
+        job_id,
+        mode,
+        {key: payload.get(key) for key in ("job_link", "send_outreach", "dry_run", "incremental")}
+    )
+
+    status = "failed"
+    with trace_run(pipeline_id) as trace, pipeline_events(pipeline_id, [job_id]):
+        try:
+            result = await _run_single(pipeline_id, payload, job, streaming)
+            status = "completed"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            await _record_timing(trace, pipeline_id, [job_id], mode, status)
+
+
+async def _run_single(pipeline_id: str, payload: Dict, job: Job, streaming: bool) -> Dict:
+    job_id = job.id
+    try:
+        agent = SourcingAgent()
+        run_pipeline = agent.run_streaming_pipeline if streaming else agent.run_full_pipeline
+        result = await run_pipeline(
+            job_id=job_id,
+            job_title=job.title,
+            job_description=job.description,
+            job_link=payload.get("job_link"),
+            send_outreach=payload.get("send_outreach", False),
+            dry_run=payload.get("dry_run", True),
+            pipeline_id=pipeline_id,
+            incremental=payload.get("incremental", False)
+        )
+        await asyncio.to_thread(finish_run, pipeline_id, "completed")
+
+        AgentLogger.log_sourcing(
+            f"Sourcing pipeline completed successfully for job {job_id}",
+            job_id=job_id,
+            pipeline_id=pipeline_id,
+            result_summary=str(result)[:500]  # First 500 chars
+        )
+
+        return {
+            "job_id": job_id,
+            "x_users_found": result.get("x_users_found", 0),
+            "verified_developers": result.get("verified_developers", 0),
+            "scored_candidates": result.get("scored_candidates", 0),
+            "reach_out_count": result.get("reach_out_count", 0),
+            "incremental": {
+                key: value for key, value in result["incremental"].items() if key != "reused_candidates"
+            } if result.get("incremental") else None
+        }
+
+    except asyncio.CancelledError:
+        await asyncio.to_thread(finish_run, pipeline_id, "cancelled")
+        raise
+
+    except Exception as e:
+        await asyncio.to_thread(finish_run, pipeline_id, "failed", error=str(e))
+        AgentLogger.log_error(
+            f"Sourcing pipeline failed for job {job_id}: {job.title}",
+            error=e,
+            job_id=job_id,
+            pipeline_id=pipeline_id
+        )
+        raise
+
+
+async def run_batch_pipeline(pipeline_id: str, payload: Dict) -> Dict:
+    """
+    Run the multi-job sourcing pipeline
+
+    Returns:
+        Shared counts plus per-job reach-out counts
+    """
+    job_ids = payload["job_ids"]
+    jobs = await asyncio.to_thread(_load_jobs, job_ids)
+
+    status = "failed"
+    with trace_run(pipeline_id) as trace, pipeline_events(pipeline_id, list(jobs)):
+        try:
+            result = await _run_batch(pipeline_id, payload, jobs)
+            status = "completed"
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            await _record_timing(trace, pipeline_id, list(jobs), "multi_job", status)
+
+
+async def _run_batch(pipeline_id: str, payload: Dict, jobs: Dict[int, Job]) -> Dict:
+    job_ids = list(jobs)
+    try:
+        agent = SourcingAgent()
+        result = await agent.run_multi_job_pipeline(
+            jobs=[
+                {"id": job.id, "title": job.title, "description": job.description}
+                for job in jobs.values()
+            ],
+            job_link=payload.get("job_link"),
+            send_outreach=payload.get("send_outreach", False),
+            dry_run=payload.get("dry_run", True),
+            pipeline_id=pipeline_id
+        )
+
+        AgentLogger.log_sourcing(
+            f"Batch sourcing pipeline completed successfully for {len(jobs)} jobs",
+            pipeline_id=pipeline_id,
+            job_ids=job_ids,
+            **result["shared"]
+        )
+
+        return {
+            "shared": result["shared"],
+            "reach_out_count": {job_id: summary["reach_out_count"] for job_id, summary in result["jobs"].items()}
+        }
+
+    except asyncio.CancelledError:
+        AgentLogger.log_sourcing(
+            f"Batch sourcing pipeline cancelled for jobs {job_ids}",
+            pipeline_id=pipeline_id,
+            job_ids=job_ids
+        )
+        raise
+
+    except Exception as e:
+        AgentLogger.log_error(
+            f"Batch sourcing pipeline failed for jobs {job_ids}",
+            error=e,
+            pipeline_id=pipeline_id,
+            job_ids=job_ids
+        )
+        raise
+
+
+async def run_queued_pipeline(pipeline_job: Dict) -> Dict:
+    """Run a claimed pipeline queue entry"""
+    if pipeline_job["kind"] == "batch":
+        return await run_batch_pipeline(pipeline_job["pipeline_id"], pipeline_job["payload"])
+    return await run_single_pipeline(pipeline_job["pipeline_id"], pipeline_job["payload"])
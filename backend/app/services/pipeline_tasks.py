@@ -0,0 +1,73 @@
+"""
+Pipeline Tasks - Tracked, cancellable sourcing pipeline tasks
+
+Each running pipeline is an asyncio.Task registered under the job IDs it
+covers. Stopping a job cancels its task: the CancelledError surfaces at
+the pipeline's next await, in-flight Grok and X calls are abandoned, and
+the pipeline saves what it has scored so far before exiting.
+"""
+import asyncio
+from typing import Coroutine, Dict, List, Optional
+
+# How long stop waits for a cancelled pipeline to save partial results
+CANCEL_TIMEOUT_SECONDS = 15.0
+
+
+class PipelineTaskRegistry:
+    """Running pipeline tasks by job ID"""
+
+    def __init__(self):
+        self._pipeline_ids: Dict[int, str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, job_ids: List[int], pipeline_id: str, coro: Coroutine) -> asyncio.Task:
+        """Run `coro` as a task registered under every job in `job_ids`"""
+        task = asyncio.create_task(coro, name=pipeline_id)
+        self._tasks[pipeline_id] = task
+        for job_id in job_ids:
+            self._pipeline_ids[job_id] = pipeline_id
+        task.add_done_callback(lambda _: self._forget(pipeline_id))
+        return task
+
+    def _forget(self, pipeline_id: str):
+        self._tasks.pop(pipeline_id, None)
+        for job_id in [j for j, p in self._pipeline_ids.items() if p == pipeline_id]:
+            del self._pipeline_ids[job_id]
+
+    def is_running(self, job_id: int) -> bool:
+        return job_id in self._pipeline_ids
+
+    def get_pipeline_id(self, job_id: int) -> Optional[str]:
+        return self._pipeline_ids.get(job_id)
+
+    def running(self) -> Dict[int, str]:
+        """{job_id: pipeline_id} for every running pipeline"""
+        return dict(self._pipeline_ids)
+
+    async def cancel(self, job_id: int, timeout: float = CANCEL_TIMEOUT_SECONDS) -> Optional[str]:
+        """
+        Cancel the pipeline running for a job and wait for it to wind down
+
+        A batch pipeline covers several jobs, so cancelling one of them stops all.
+
+        Returns:
+            The cancelled pipeline_id, or None if nothing was running
+        """
+        pipeline_id = self._pipeline_ids.get(job_id)
+        task = self._tasks.get(pipeline_id) if pipeline_id else None
+        if task is None:
+            return None
+
+        task.cancel()
+        await asyncio.wait([task], timeout=timeout)
+        return pipeline_id
+
+    async def cancel_all(self, timeout: float = CANCEL_TIMEOUT_SECONDS):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+
+pipeline_tasks = PipelineTaskRegistry()
@@ -0,0 +1,193 @@
+"""
+Role Pre-Filter - Local screening before Grok role verification (Step 4)
+
+Scores each X user from data Step 3 already has: bio, post text, follower
+and following counts, and the density of tech keywords in their posts.
+Clear negatives (news bots, marketing accounts, zero-post profiles) are
+dropped, clear positives pass with a locally built classification, and only
+the ambiguous middle is sent to Grok.
+
+Thresholds are configurable:
+    ROLE_PREFILTER_ENABLED      - "false" sends every user to Grok
+    ROLE_PREFILTER_DROP_BELOW   - score under which a user is dropped (default 20)
+    ROLE_PREFILTER_PASS_AT      - score at or above which a user passes (default 80)
+"""
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+ROLE_PREFILTER_ENABLED = os.getenv("ROLE_PREFILTER_ENABLED", "true").lower() != "false"
+ROLE_PREFILTER_DROP_BELOW = float(os.getenv("ROLE_PREFILTER_DROP_BELOW", "20"))
+ROLE_PREFILTER_PASS_AT = float(os.getenv("ROLE_PREFILTER_PASS_AT", "80"))
+
+# Technical vocabulary in posts (superset of the list in grok_service.analyze_candidate_activity)
+TECH_KEYWORDS = {
+    "code", "coding", "programming", "development", "software", "api", "database",
+    "python", "javascript", "typescript", "react", "node", "sql", "git", "github",
+    "opensource", "developer", "engineer", "rust", "golang", "java", "kotlin", "swift",
+    "c++", "kubernetes", "docker", "terraform", "aws", "gcp", "linux", "compiler",
+    "backend", "frontend", "fullstack", "devops", "pytorch", "tensorflow", "llm",
+    "ml", "inference", "postgres", "redis", "kafka", "graphql", "css", "async",
+    "refactor", "deploy", "debugging", "latency", "microservices", "cuda"
+}
+
+# Bio phrases of people who write code
+DEVELOPER_BIO_KEYWORDS = {
+    "engineer", "engineering", "developer", "dev", "swe", "sde", "programmer", "hacker",
+    "maintainer", "contributor", "founding engineer", "cto", "architect", "sre",
+    "researcher", "open source", "oss", "building", "github.com"
+}
+
+# Bio phrases of accounts that are almost never hireable developers
+NON_DEVELOPER_BIO_KEYWORDS = {
+    "news", "breaking", "official account", "marketing", "promo", "giveaway", "deals",
+    "crypto signals", "nft", "affiliate", "brand", "agency", "coach", "influencer",
+    "dm for collab", "follow back", "bot", "automated", "recruiter", "hiring manager",
+    "talent acquisition"
+}
+
+# role_type → vocabulary, for the classification given to clear positives
+ROLE_KEYWORDS = {
+    "ml_engineer": {"ml", "llm", "pytorch", "tensorflow", "inference", "model", "models", "cuda", "training", "embeddings"},
+    "frontend": {"react", "css", "frontend", "javascript", "typescript", "ui", "nextjs", "vue", "svelte"},
+    "backend": {"backend", "api", "postgres", "database", "sql", "django", "redis", "kafka", "microservices", "golang"},
+    "infra": {"kubernetes", "docker", "terraform", "devops", "sre", "aws", "gcp", "deploy", "observability"},
+    "systems": {"rust", "c++", "compiler", "kernel", "linux", "latency", "performance", "embedded", "distributed"}
+}
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.strip(".") for t in _WORD.findall(text.lower()) if t.strip(".")]
+
+
+def _phrase_hits(text: str, phrases) -> List[str]:
+    text = f" {' '.join(_tokens(text))} "
+    return sorted(p for p in phrases if f" {p} " in text)
+
+
+def _infer_role_type(tokens: List[str]) -> str:
+    counts = {role: sum(1 for t in tokens if t in vocab) for role, vocab in ROLE_KEYWORDS.items()}
+    if counts["frontend"] and counts["backend"] and abs(counts["frontend"] - counts["backend"]) <= 1:
+        return "fullstack"
+    return max(counts, key=counts.get)
+
+
+def _tech_skills(tokens: List[str], limit: int = 10) -> List[str]:
+    """Tech keywords in the tokens, most frequent first (the classification's skill signals)"""
+    counts = Counter(t for t in tokens if t in TECH_KEYWORDS)
+    return [keyword for keyword, _ in counts.most_common(limit)]
+
+
+def score_user(user: Dict) -> Tuple[float, List[str]]:
+    """
+    Local developer-likelihood score for a Step 3 user
+
+    Returns:
+        (score 0-100, reasons)
+    """
+    posts = [signal.get("text", "") for signal in user.get("signals", [])]
+    if not posts:
+        return 0.0, ["no posts"]
+
+    reasons = []
+    score = 40.0
+
+    # Tech keyword density across posts
+    post_tokens = [t for post in posts for t in _tokens(post)]
+    tech_hits = sum(1 for t in post_tokens if t in TECH_KEYWORDS)
+    density = tech_hits / max(len(post_tokens), 1)
+    tech_posts = sum(1 for post in posts if any(t in TECH_KEYWORDS for t in _tokens(post)))
+    score += min(density * 150, 20)
+    score += 20 * tech_posts / len(posts)
+    reasons.append(f"tech density {density:.2f}, {tech_posts}/{len(posts)} tech posts")
+
+    # Bio
+    bio = user.get("bio", "") or ""
+    developer_terms = _phrase_hits(bio, DEVELOPER_BIO_KEYWORDS)
+    negative_terms = _phrase_hits(bio, NON_DEVELOPER_BIO_KEYWORDS)
+    if developer_terms:
+        score += 20
+        reasons.append(f"developer bio: {', '.join(developer_terms[:3])}")
+    if negative_terms:
+        score -= 30
+        reasons.append(f"non-developer bio: {', '.join(negative_terms[:3])}")
+
+    # Follower graph: follow-for-follow and broadcast accounts
+    followers = user.get("followers", 0) or 0
+    following = user.get("following", 0) or 0
+    if following > 1000 and followers < following / 10:
+        score -= 15
+        reasons.append(f"follows {following}, followed by {followers}")
+    if followers > 100000 and following < 50 and not developer_terms:
+        score -= 15
+        reasons.append("broadcast account")
+
+    if tech_hits == 0:
+        score -= 30
+        reasons.append("no tech keywords in posts")
+
+    return max(0.0, min(100.0, score)), reasons
+
+
+def classify_user(
+    user: Dict,
+    drop_below: float = ROLE_PREFILTER_DROP_BELOW,
+    pass_at: float = ROLE_PREFILTER_PASS_AT
+) -> Tuple[str, Dict]:
+    """
+    Decide what happens to a user before Grok
+
+    Returns:
+        ("drop" | "pass" | "llm", classification) - for "pass" the classification
+        has the same shape as verify_developer_role's, built locally
+    """
+    score, reasons = score_user(user)
+    if not ROLE_PREFILTER_ENABLED:
+        return "llm", {"prefilter_score": score}
+    if score < drop_below:
+        return "drop", {"prefilter_score": score, "reasons": reasons}
+    if score >= pass_at:
+        tokens = _tokens(user.get("bio", "") or "") + [
+            t for signal in user.get("signals", []) for t in _tokens(signal.get("text", ""))
+        ]
+        return "pass", {
+            "is_developer": True,
+            "role_type": _infer_role_type(tokens),
+            "confidence": int(min(score, 95)),
+            "reasoning": f"Local pre-filter: {'; '.join(reasons)}",
+            "signals": _tech_skills(tokens),
+            "source": "prefilter",
+            "prefilter_score": score
+        }
+    return "llm", {"prefilter_score": score}
+
+
+class PrefilterStats:
+    """Counts of pre-filter decisions, for logging drop rates"""
+
+    def __init__(self):
+        self.counts = {"drop": 0, "pass": 0, "llm": 0}
+
+    def record(self, decision: str):
+        self.counts[decision] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def summary(self) -> Dict:
+        total = self.total
+        return {
+            "users": total,
+            "dropped": self.counts["drop"],
+            "passed_locally": self.counts["pass"],
+            "sent_to_llm": self.counts["llm"],
+            "drop_rate": round(self.counts["drop"] / total, 3) if total else 0.0,
+            "llm_calls_saved": self.counts["drop"] + self.counts["pass"],
+            "drop_below": ROLE_PREFILTER_DROP_BELOW,
+            "pass_at": ROLE_PREFILTER_PASS_AT,
+            "enabled": ROLE_PREFILTER_ENABLED
+        }
@@ -3,22 +3,34 @@ Sourcing Agent (A1) - X-First Candidate Discovery Pipeline
 
 This module implements the 7-step sourcing flow defined in SOURCING_AGENT_SPEC.md
 """
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, FrozenSet, Optional
 from app.services.embedding_service import generate_embedding
 from app.services.vector_store import store_job_embedding
 from app.services.grok_service import parse_job_description
 from app.services.grok_topic_service import discover_topics_from_job
-from app.services.x_api_service import discover_users_from_topics
-from app.services.grok_role_service import verify_developers_batch
+from app.services.x_api_service import discover_users_from_topics, stream_users_from_topics
+from app.services.x_query_planner import term_tokens
+from app.services.x_signal_store import persist_signals, link_signals_to_candidates
+from app.services.grok_role_service import verify_developers_batch, verify_developer
+from app.services.role_prefilter import PrefilterStats
+from app.services.candidate_prescore import ScoringBudget, prescore_candidate, rank_by_prescore
+from app.services.incremental_sourcing import IncrementalIndex, load_incremental_index
+from app.services.candidate_store import upsert_job_candidates
+from app.services.linkedin_profiles import get_profile_index
 from app.services.grok_scoring_service import compute_compatibility_score
-from app.services.x_outreach_service import send_outreach_batch  # DM (won't work)
-from app.services.x_mention_service import send_mentions_batch  # Public mentions (works!)
+from app.services.pipeline_checkpoints import STEP_NAMES, append_checkpoint, load_checkpoints, save_checkpoint
+from app.services.outreach_outbox import enqueue_mentions  # Public mentions (works!), sent by the outbox worker
 from app.utils.logger import AgentLogger
+from app.utils.timing import span, traced
+from app.services.event_hub import event_hub
 from app.db.database import engine
-from app.models.schemas import Candidate, JobCandidate
+from app.models.schemas import Job
 from sqlmodel import Session
-import json
+import asyncio
+import copy
 import os
+import threading
+import time
 
 # Import adaptive learning for dynamic thresholds
 try:
@@ -27,9 +39,15 @@ try:
 except ImportError:
     ADAPTIVE_LEARNING_ENABLED = False
 
-# Load mock LinkedIn profiles
-with open("data/mock_linkedin_profiles.json", "r") as f:
-    MOCK_LINKEDIN_PROFILES = json.load(f)
+# Streaming mode: queue size between stages, workers per Grok stage, X user budget
+STREAM_QUEUE_SIZE = int(os.getenv("SOURCING_STREAM_QUEUE_SIZE", "20"))
+STREAM_CONCURRENCY = int(os.getenv("SOURCING_STREAM_CONCURRENCY", "4"))
+STREAM_MAX_USERS = int(os.getenv("SOURCING_STREAM_MAX_USERS", "100"))
+
+_END_OF_STREAM = object()
+
+# Users per partial checkpoint in Steps 4 and 6
+CHECKPOINT_EVERY = int(os.getenv("PIPELINE_CHECKPOINT_EVERY", "10"))
 
 class SourcingAgent:
     """
@@ -45,13 +63,16 @@ class SourcingAgent:
     7. Score → Ranked Candidate List
     """
     
-    def __init__(self):
-        self.mock_profiles = MOCK_LINKEDIN_PROFILES
+    @property
+    def profile_index(self):
+        """LinkedIn profile index, built from LINKEDIN_PROFILES_PATH on first use"""
+        return get_profile_index()
     
     # ========================================
     # STEP 1: JOB DESCRIPTION → EMBEDDING
     # ========================================
     
+    @traced("step1_generate_job_embedding", kind="step")
     async def step1_generate_job_embedding(
         self, 
         job_id: int, 
@@ -110,6 +131,7 @@ class SourcingAgent:
     # STEP 2: EMBEDDING → TOPIC DISCOVERY
     # ========================================
     
+    @traced("step2_discover_topics", kind="step")
     async def step2_discover_topics(
         self, 
         job_title: str,
@@ -150,6 +172,7 @@ class SourcingAgent:
     # STEP 3: TOPIC → ACTIVE X USERS
     # ========================================
     
+    @traced("step3_discover_x_users", kind="step")
     async def step3_discover_x_users(
         self,
         topics: List[str],
@@ -169,8 +192,12 @@ class SourcingAgent:
             search_queries=search_queries
         )
         
+        stop_event = threading.Event()
         try:
-            users = discover_users_from_topics(topics, search_queries, max_per_query=10)
+            # In a worker thread so the event loop (and cancellation) is never blocked
+            users = await asyncio.to_thread(
+                discover_users_from_topics, topics, search_queries, 10, stop_event
+            )
             
             AgentLogger.log_search(
                 f"Successfully discovered {len(users)} X users posting about relevant topics",
@@ -178,9 +205,29 @@ class SourcingAgent:
                 users_found=len(users),
                 topics_searched=len(topics)
             )
+            event_hub.count(job_id, x_users_found=len(users))
+            
+            # Persist signals so later runs can refresh incrementally
+            try:
+                stored = await asyncio.to_thread(persist_signals, users, job_id)
+                AgentLogger.log_search(
+                    f"Stored {stored['signals_inserted']} new X signals for {stored['users_tracked']} users",
+                    job_id=job_id,
+                    **stored
+                )
+            except Exception as store_error:
+                AgentLogger.log_error(
+                    f"Failed to persist X signals for job {job_id}",
+                    error=store_error,
+                    job_id=job_id
+                )
             
             return users
             
+        except asyncio.CancelledError:
+            # The search thread stops before its next X request
+            stop_event.set()
+            raise
         except Exception as e:
             AgentLogger.log_error(
                 f"Failed to discover X users for topics: {topics}",
@@ -193,14 +240,20 @@ class SourcingAgent:
     # STEP 4: X USERS → ROLE VERIFICATION
     # ========================================
     
+    @traced("step4_verify_developer_role", kind="step")
     async def step4_verify_developer_role(
         self,
         x_users: List[Dict],
         job_title: str,
-        job_id: Optional[int] = None
+        job_id: Optional[int] = None,
+        pipeline_id: Optional[str] = None,
+        checkpoints: Optional[Dict[int, Dict]] = None
     ) -> List[Dict]:
         """
         AI classification: Is this user a developer matching the role?
+        
+        A local pre-filter settles clear cases first; its decisions are logged.
+        With a pipeline_id, progress is checkpointed every CHECKPOINT_EVERY users.
         """
         AgentLogger.log_scoring(
             f"Starting role verification for {len(x_users)} X users against {job_title} role",
@@ -210,8 +263,14 @@ class SourcingAgent:
         )
         
         try:
-            verified_developers = await verify_developers_batch(x_users, job_title)
+            prefilter_stats = PrefilterStats()
+            verified_developers = await self._run_checkpointed_items(
+                pipeline_id, 4, x_users, checkpoints or {},
+                lambda chunk: verify_developers_batch(chunk, job_title, prefilter_stats)
+            )
             filtered_count = len(x_users) - len(verified_developers)
+            self._log_prefilter(prefilter_stats, job_id)
+            event_hub.count(job_id, verified_developers=len(verified_developers))
             
             AgentLogger.log_scoring(
                 f"Role verification complete: {len(verified_developers)} developers verified, {filtered_count} filtered out",
@@ -231,6 +290,18 @@ class SourcingAgent:
             )
             raise
     
+    def _log_prefilter(self, stats: PrefilterStats, job_id: Optional[int]):
+        summary = stats.summary()
+        if not summary["users"]:
+            return
+        print(f"🧹 Pre-filter: {summary['dropped']} dropped, {summary['passed_locally']} passed locally, {summary['sent_to_llm']} sent to Grok")
+        AgentLogger.log_scoring(
+            f"Role pre-filter dropped {summary['dropped']}/{summary['users']} users ({summary['drop_rate']:.0%}), "
+            f"passed {summary['passed_locally']} locally, sent {summary['sent_to_llm']} to Grok",
+            job_id=job_id,
+            **summary
+        )
+    
     # ========================================
     # STEP 5: EXPERIENCE VALIDATION (MOCKED)
     # ========================================
@@ -246,36 +317,30 @@ class SourcingAgent:
         Returns:
             LinkedIn profile dict or None
         """
-        # Normalize handle
-        if not x_handle.startswith("@"):
-            x_handle = f"@{x_handle}"
-        
         # Strategy 1: Try exact X handle match
-        for profile in self.mock_profiles:
-            if profile["x_handle"] == x_handle:
-                return profile
+        profile = self.profile_index.by_handle(x_handle)
+        if profile:
+            return profile
         
-        # Strategy 2: Try name-based fuzzy match
+        # Strategy 2: Try name-based fuzzy match (best trigram similarity above threshold)
         if name:
-            name_lower = name.lower()
-            for profile in self.mock_profiles:
-                profile_name_lower = profile["name"].lower()
-                # Check if names are similar (same first or last name)
-                name_parts = set(name_lower.split())
-                profile_parts = set(profile_name_lower.split())
-                
-                # If they share at least one name part, consider it a match
-                if name_parts & profile_parts:
-                    print(f"      📎 Fuzzy matched '{name}' to LinkedIn: {profile['name']}")
-                    return profile
+            match = self.profile_index.match_name(name)
+            if match:
+                profile, confidence = match
+                print(f"      📎 Fuzzy matched '{name}' to LinkedIn: {profile['name']} ({confidence:.0%})")
+                return profile
         
         return None
     
+    @traced("step5_enrich_with_linkedin", kind="step")
     def enrich_with_linkedin(self, verified_developers: List[Dict], job_id: Optional[int] = None) -> List[Dict]:
         """
         Enrich verified developers with LinkedIn data (mocked)
         Uses X handle and real name for matching
         
+        Blocking (the profile index is built on first use and profile bodies
+        are read from disk): call it from async code with asyncio.to_thread.
+        
         Args:
             verified_developers: List of developers from Step 4
             
@@ -288,30 +353,8 @@ class SourcingAgent:
             developers_to_enrich=len(verified_developers)
         )
         
-        enriched = []
-        linkedin_found = 0
-        
-        for dev in verified_developers:
-            username = dev['username']
-            x_handle = f"@{username}"
-            real_name = dev.get('name', '')  # Get real name from X profile
-            
-            # Try to find LinkedIn profile (with name-based fuzzy matching)
-            linkedin_profile = self.step5_get_linkedin_profile(x_handle, real_name)
-            
-            if linkedin_profile:
-                dev['linkedin_data'] = linkedin_profile
-                dev['has_linkedin'] = True
-                linkedin_found += 1
-                print(f"  ✅ @{username} ({real_name}): Found LinkedIn ({linkedin_profile['headline']})")
-            else:
-                # Create synthetic LinkedIn based on classification and X data
-                role_type = dev.get('classification', {}).get('role_type', 'unknown')
-                dev['linkedin_data'] = self._generate_synthetic_linkedin(dev, role_type)
-                dev['has_linkedin'] = False
-                print(f"  ⚠️ @{username} ({real_name}): No LinkedIn found, using synthetic profile")
-            
-            enriched.append(dev)
+        enriched = [self.enrich_developer(dev) for dev in verified_developers]
+        linkedin_found = sum(1 for dev in enriched if dev['has_linkedin'])
         
         AgentLogger.log_sourcing(
             f"LinkedIn enrichment complete: {linkedin_found} real profiles found, {len(enriched) - linkedin_found} synthetic profiles created",
@@ -323,6 +366,28 @@ class SourcingAgent:
         
         return enriched
     
+    def enrich_developer(self, dev: Dict) -> Dict:
+        """Attach LinkedIn data (real or synthetic) to one verified developer"""
+        username = dev['username']
+        x_handle = f"@{username}"
+        real_name = dev.get('name', '')  # Get real name from X profile
+        
+        # Try to find LinkedIn profile (with name-based fuzzy matching)
+        linkedin_profile = self.step5_get_linkedin_profile(x_handle, real_name)
+        
+        if linkedin_profile:
+            dev['linkedin_data'] = linkedin_profile
+            dev['has_linkedin'] = True
+            print(f"  ✅ @{username} ({real_name}): Found LinkedIn ({linkedin_profile['headline']})")
+        else:
+            # Create synthetic LinkedIn based on classification and X data
+            role_type = dev.get('classification', {}).get('role_type', 'unknown')
+            dev['linkedin_data'] = self._generate_synthetic_linkedin(dev, role_type)
+            dev['has_linkedin'] = False
+            print(f"  ⚠️ @{username} ({real_name}): No LinkedIn found, using synthetic profile")
+        
+        return dev
+    
     def _generate_synthetic_linkedin(self, dev: Dict, role_type: str) -> Dict:
         """Generate a synthetic LinkedIn profile based on X data"""
         role_titles = {
@@ -356,16 +421,28 @@ class SourcingAgent:
     # STEP 6: AI COMPATIBILITY SCORING
     # ========================================
     
+    @traced("step6_compute_compatibility", kind="step")
     async def step6_compute_compatibility(
         self,
         job_title: str,
         job_description: str,
         enriched_candidates: List[Dict],
-        job_id: Optional[int] = None
+        job_id: Optional[int] = None,
+        on_scored: Optional[Callable[[Dict], None]] = None,
+        budget: Optional[ScoringBudget] = None,
+        pipeline_id: Optional[str] = None,
+        checkpoints: Optional[Dict[int, Dict]] = None
     ) -> List[Dict]:
         """
         AI-powered candidate-job fit scoring for all candidates
         
+        Args:
+            on_scored: Called with each candidate as soon as it is scored
+            budget: Stop scoring once exhausted (pass candidates ranked by
+                rank_by_prescore so the budget goes to the most promising)
+            pipeline_id: Checkpoint progress every CHECKPOINT_EVERY candidates
+            checkpoints: Loaded checkpoints of a resumed run
+        
         Returns:
             List of candidates with compatibility scores added
         """
@@ -376,10 +453,40 @@ class SourcingAgent:
             job_title=job_title
         )
         
+        scored_candidates = await self._run_checkpointed_items(
+            pipeline_id, 6, enriched_candidates, checkpoints or {},
+            lambda chunk: self._score_candidates(job_title, job_description, chunk, job_id, on_scored, budget)
+        )
+        scores = [c['compatibility']['compatibility_score'] for c in scored_candidates]
+        
+        avg_score = sum(scores) / len(scores) if scores else 0
+        AgentLogger.log_scoring(
+            f"Compatibility scoring complete: {len(scored_candidates)} candidates scored, average score: {avg_score:.1f}/100",
+            job_id=job_id,
+            candidates_scored=len(scored_candidates),
+            average_score=avg_score,
+            score_range=f"{min(scores):.1f}-{max(scores):.1f}" if scores else "N/A"
+        )
+        
+        return scored_candidates
+    
+    async def _score_candidates(
+        self,
+        job_title: str,
+        job_description: str,
+        candidates: List[Dict],
+        job_id: Optional[int],
+        on_scored: Optional[Callable[[Dict], None]],
+        budget: Optional[ScoringBudget]
+    ) -> List[Dict]:
+        """Score one chunk of Step 6, skipping everyone once the budget is spent"""
         scored_candidates = []
-        scores = []
         
-        for candidate in enriched_candidates:
+        for candidate in candidates:
+            if budget is not None and budget.exhausted:
+                budget.skipped += 1
+                continue
+            
             username = candidate.get('username', 'unknown')
             print(f"📊 Scoring @{username}...")
             
@@ -392,7 +499,11 @@ class SourcingAgent:
                 
                 candidate['compatibility'] = score_data
                 scored_candidates.append(candidate)
-                scores.append(score_data['compatibility_score'])
+                if budget is not None:
+                    budget.record(candidate)
+                if on_scored:
+                    on_scored(candidate)
+                self._publish_scored(candidate, job_id)
                 
                 AgentLogger.log_scoring(
                     f"Scored candidate @{username}: {score_data['compatibility_score']}/100",
@@ -413,46 +524,79 @@ class SourcingAgent:
                 )
                 print(f"  ❌ Error scoring @{username}: {e}")
         
-        avg_score = sum(scores) / len(scores) if scores else 0
+        return scored_candidates
+    
+    def _publish_scored(self, candidate: Dict, job_id: Optional[int], recommendation: Optional[str] = None):
+        """Push a scored candidate and the running count to live dashboards"""
+        event_hub.publish("candidate", {
+            "username": candidate.get('username'),
+            "name": candidate.get('name'),
+            "score": candidate.get('compatibility', {}).get('compatibility_score'),
+            "prescore": candidate.get('prescore', {}).get('prescore'),
+            "recommendation": recommendation
+        }, job_id=job_id)
+        event_hub.count(job_id, candidates_scored=1)
+    
+    async def _job_scoring_targets(self, job_id: Optional[int], job_description: str) -> tuple[Dict, int]:
+        """The job's parsed requirements and headcount, parsing the description if needed"""
+        job = None
+        if job_id is not None:
+            def load_job():
+                with Session(engine) as session:
+                    return session.get(Job, job_id)
+            job = await asyncio.to_thread(load_job)
+        
+        requirements = job.requirements if job and job.requirements else None
+        if not requirements:
+            try:
+                requirements = await parse_job_description(job_description)
+            except Exception as e:
+                print(f"⚠️ Could not parse job requirements, pre-scoring without skills: {e}")
+                requirements = {}
+        return requirements, (job.headcount if job else 1)
+    
+    async def _scoring_budget(
+        self,
+        job_id: Optional[int],
+        job_description: str,
+        candidates: List[Dict],
+        thresholds: Optional[tuple[int, int, int]] = None
+    ) -> tuple[List[Dict], ScoringBudget]:
+        """Rank candidates by pre-score and size the Step 6 budget for the job's headcount and interview threshold"""
+        requirements, headcount = await self._job_scoring_targets(job_id, job_description)
+        if thresholds is None:
+            thresholds = await asyncio.to_thread(self.resolve_thresholds, job_id)
+        return rank_by_prescore(candidates, requirements), ScoringBudget(thresholds[2], headcount)
+    
+    def _log_budget(self, budget: ScoringBudget, job_id: Optional[int]):
+        summary = budget.summary()
+        print(f"💸 Scoring budget: {summary['scoring_calls']} calls, {summary['skipped_by_budget']} skipped"
+              + (f" ({summary['stop_reason']})" if summary['stop_reason'] else ""))
         AgentLogger.log_scoring(
-            f"Compatibility scoring complete: {len(scored_candidates)} candidates scored, average score: {avg_score:.1f}/100",
+            f"Budgeted scoring for job {job_id}: {summary['scoring_calls']} Grok calls, "
+            f"{summary['interview_worthy']}/{summary['interview_target']} interview-worthy, "
+            f"{summary['skipped_by_budget']} lower-ranked candidates skipped",
             job_id=job_id,
-            candidates_scored=len(scored_candidates),
-            average_score=avg_score,
-            score_range=f"{min(scores):.1f}-{max(scores):.1f}" if scores else "N/A"
+            **summary
         )
-        
-        return scored_candidates
     
     # ========================================
     # STEP 7: RANKING & PIPELINE INSERTION
     # ========================================
     
-    async def step7_apply_thresholds(
+    def resolve_thresholds(
         self,
-        candidates: List[Dict],
         job_id: int,
         threshold_reject: int = None,
         threshold_takehome: int = None,
         threshold_interview: int = None,
         use_adaptive_learning: bool = True
-    ) -> Dict:
+    ) -> tuple[int, int, int]:
         """
-        Apply score thresholds to route candidates
-        
-        Thresholds (can be learned adaptively):
-        - < 40: Reject (default)
-        - 40-59: Take-home assignment (default)
-        - 60-74: Interview (default)
-        - 75+: Fast-track interview (default)
+        Fill in routing thresholds from adaptive learning, falling back to defaults
         
         Returns:
-            {
-                "reject": [...],
-                "takehome": [...],
-                "interview": [...],
-                "fasttrack": [...]
-            }
+            (threshold_reject, threshold_takehome, threshold_interview)
         """
         # Get learned thresholds if adaptive learning is enabled
         if use_adaptive_learning and ADAPTIVE_LEARNING_ENABLED:
@@ -485,6 +629,54 @@ class SourcingAgent:
             threshold_takehome = threshold_takehome or 60
             threshold_interview = threshold_interview or 75
         
+        return threshold_reject, threshold_takehome, threshold_interview
+    
+    def route_candidate(self, candidate: Dict, thresholds: tuple[int, int, int]) -> str:
+        """Set and return a scored candidate's recommendation"""
+        threshold_reject, threshold_takehome, threshold_interview = thresholds
+        score = candidate.get("compatibility", {}).get("compatibility_score", 0)
+        
+        if score >= threshold_interview:
+            recommendation = 'fasttrack' if score >= 90 else 'interview'
+        elif score >= threshold_reject:
+            recommendation = 'takehome'
+        else:
+            recommendation = 'reject'
+        
+        candidate['recommendation'] = recommendation
+        return recommendation
+    
+    @traced("step7_apply_thresholds", kind="step")
+    async def step7_apply_thresholds(
+        self,
+        candidates: List[Dict],
+        job_id: int,
+        threshold_reject: int = None,
+        threshold_takehome: int = None,
+        threshold_interview: int = None,
+        use_adaptive_learning: bool = True
+    ) -> Dict:
+        """
+        Apply score thresholds to route candidates
+        
+        Thresholds (can be learned adaptively):
+        - < 40: Reject (default)
+        - 40-59: Take-home assignment (default)
+        - 60-74: Interview (default)
+        - 75+: Fast-track interview (default)
+        
+        Returns:
+            {
+                "reject": [...],
+                "takehome": [...],
+                "interview": [...],
+                "fasttrack": [...]
+            }
+        """
+        threshold_reject, threshold_takehome, threshold_interview = await asyncio.to_thread(
+            self.resolve_thresholds, job_id, threshold_reject, threshold_takehome, threshold_interview, use_adaptive_learning
+        )
+        
         AgentLogger.log_sourcing(
             f"Starting candidate routing with thresholds: reject<{threshold_reject}, takehome<{threshold_takehome}, interview<{threshold_interview}",
             job_id=job_id,
@@ -508,25 +700,9 @@ class SourcingAgent:
             "fasttrack": []
         }
         
+        thresholds = (threshold_reject, threshold_takehome, threshold_interview)
         for candidate in candidates:
-            score = candidate.get("compatibility", {}).get("compatibility_score", 0)
-            
-            if score >= threshold_interview:
-                if score >= 90:
-                    routed["fasttrack"].append(candidate)
-                    candidate['recommendation'] = 'fasttrack'
-                else:
-                    routed["interview"].append(candidate)
-                    candidate['recommendation'] = 'interview'
-            elif score >= threshold_takehome:
-                routed["takehome"].append(candidate)
-                candidate['recommendation'] = 'takehome'
-            elif score >= threshold_reject:
-                routed["takehome"].append(candidate)
-                candidate['recommendation'] = 'takehome'
-            else:
-                routed["reject"].append(candidate)
-                candidate['recommendation'] = 'reject'
+            routed[self.route_candidate(candidate, thresholds)].append(candidate)
         
         # Print summary
         print(f"   🎯 Routing Results:")
@@ -560,6 +736,7 @@ class SourcingAgent:
     # DATABASE OPERATIONS
     # ========================================
     
+    @traced("db.save_candidates", kind="work")
     async def save_candidates_to_database(self, scored_candidates: List[Dict], job_id: int) -> Dict:
         """
         Save discovered candidates to the database
@@ -571,119 +748,15 @@ class SourcingAgent:
         Returns:
             Dictionary with save results
         """
-        AgentLogger.log_sourcing(
-            f"Saving {len(scored_candidates)} candidates to database for job {job_id}",
-            job_id=job_id,
-            candidates_to_save=len(scored_candidates)
-        )
-        
-        saved_count = 0
-        updated_count = 0
+        if not scored_candidates:
+            # Nothing new (e.g. an incremental run where every user was reused)
+            return {"saved_count": 0, "updated_count": 0, "total_processed": 0}
         
         try:
-            with Session(engine) as session:
-                for candidate_data in scored_candidates:
-                    # Extract candidate info
-                    name = candidate_data.get('name', candidate_data.get('username', 'Unknown'))
-                    x_handle = candidate_data.get('username')
-                    x_bio = candidate_data.get('bio', '')
-                    linkedin_data = candidate_data.get('linkedin_data', {})
-                    
-                    # Check if candidate already exists
-                    existing_candidate = session.query(Candidate).filter(
-                        Candidate.x_handle == f"@{x_handle}"
-                    ).first()
-                    
-                    if existing_candidate:
-                        # Update existing candidate
-                        existing_candidate.x_bio = x_bio
-                        existing_candidate.linkedin_data = linkedin_data
-                        candidate_id = existing_candidate.id
-                        updated_count += 1
-                        
-                        AgentLogger.log_sourcing(
-                            f"Updated existing candidate: {name} (@{x_handle})",
-                            job_id=job_id,
-                            candidate_id=candidate_id
-                        )
-                    else:
-                        # Create new candidate
-                        new_candidate = Candidate(
-                            name=name,
-                            x_handle=f"@{x_handle}",
-                            x_bio=x_bio,
-                            linkedin_data=linkedin_data
-                        )
-                        session.add(new_candidate)
-                        session.flush()  # Get the ID
-                        candidate_id = new_candidate.id
-                        saved_count += 1
-                        
-                        AgentLogger.log_sourcing(
-                            f"Saved new candidate: {name} (@{x_handle})",
-                            job_id=job_id,
-                            candidate_id=candidate_id
-                        )
-                    
-                    # Create or update job-candidate relationship
-                    compatibility = candidate_data.get('compatibility', {})
-                    score = compatibility.get('compatibility_score', 0)
-                    reasoning = compatibility.get('reasoning', '')
-                    recommendation = candidate_data.get('recommendation', 'sourced')
-                    
-                    # Map recommendation to stage
-                    stage_mapping = {
-                        'fasttrack': 'interview',
-                        'interview': 'interview', 
-                        'takehome': 'takehome_assigned',
-                        'reject': 'rejected',
-                        'sourced': 'sourced'
-                    }
-                    stage = stage_mapping.get(recommendation, 'sourced')
-                    
-                    # Check if job-candidate relationship exists
-                    existing_job_candidate = session.query(JobCandidate).filter(
-                        JobCandidate.job_id == job_id,
-                        JobCandidate.candidate_id == candidate_id
-                    ).first()
-                    
-                    if existing_job_candidate:
-                        # Update existing relationship
-                        existing_job_candidate.compatibility_score = score
-                        existing_job_candidate.ai_reasoning = reasoning
-                        existing_job_candidate.stage = stage
-                    else:
-                        # Create new relationship
-                        job_candidate = JobCandidate(
-                            job_id=job_id,
-                            candidate_id=candidate_id,
-                            compatibility_score=score,
-                            ai_reasoning=reasoning,
-                            stage=stage
-                        )
-                        session.add(job_candidate)
-                
-                session.commit()
-                
-                # Trigger interview auto-dispatch for takehome candidates
-                if stage == 'takehome_assigned':
-                    try:
-                        from app.services.pipeline_integration import pipeline_integration
-                        await pipeline_integration.handle_stage_change(
-                            candidate_id=candidate_id,
-                            job_id=job_id,
-                            old_stage='sourced',
-                            new_stage=stage
-                        )
-                    except Exception as integration_error:
-                        # Don't fail the whole pipeline if integration fails
-                        AgentLogger.log_error(
-                            f"Pipeline integration failed for candidate {candidate_id}",
-                            error=integration_error,
-                            candidate_id=candidate_id,
-                            job_id=job_id
-                        )
-                
+            result = await asyncio.to_thread(upsert_job_candidates, scored_candidates, job_id)
+            
+            # Attach signals stored in Step 3 to their candidates
+            await asyncio.to_thread(link_signals_to_candidates, result["handles"])
         except Exception as e:
             AgentLogger.log_error(
                 f"Failed to save candidates to database for job {job_id}",
@@ -692,17 +765,40 @@ class SourcingAgent:
             )
             raise
         
+        # One summary row, written after the save transaction has committed
         AgentLogger.log_sourcing(
-            f"Successfully saved candidates: {saved_count} new, {updated_count} updated",
+            f"Successfully saved candidates: {result['saved_count']} new, {result['updated_count']} updated",
             job_id=job_id,
-            new_candidates=saved_count,
-            updated_candidates=updated_count,
+            new_candidates=result['saved_count'],
+            updated_candidates=result['updated_count'],
             total_processed=len(scored_candidates)
         )
+        event_hub.count(job_id, candidates_new=result['saved_count'], candidates_updated=result['updated_count'])
+        
+        # Trigger interview auto-dispatch for every candidate newly moved to takehome
+        for change in result["stage_changes"]:
+            if change["new_stage"] != 'takehome_assigned':
+                continue
+            try:
+                from app.services.pipeline_integration import pipeline_integration
+                await pipeline_integration.handle_stage_change(
+                    candidate_id=change["candidate_id"],
+                    job_id=job_id,
+                    old_stage=change["old_stage"],
+                    new_stage=change["new_stage"]
+                )
+            except Exception as integration_error:
+                # Don't fail the whole pipeline if integration fails
+                AgentLogger.log_error(
+                    f"Pipeline integration failed for candidate {change['candidate_id']}",
+                    error=integration_error,
+                    candidate_id=change["candidate_id"],
+                    job_id=job_id
+                )
         
         return {
-            "saved_count": saved_count,
-            "updated_count": updated_count,
+            "saved_count": result["saved_count"],
+            "updated_count": result["updated_count"],
             "total_processed": len(scored_candidates)
         }
     
@@ -710,6 +806,132 @@ class SourcingAgent:
     # FULL PIPELINE
     # ========================================
     
+    @traced("save_and_queue_outreach", kind="step")
+    async def _save_and_queue_outreach(
+        self,
+        routed_candidates: Dict,
+        job_id: int,
+        job_title: str,
+        job_link: Optional[str],
+        send_outreach: bool,
+        dry_run: bool,
+        unscored: Optional[List[Dict]] = None
+    ) -> tuple[Dict, Optional[Dict]]:
+        """
+        Save routed candidates and optionally queue outreach (Step 8)
+        
+        Unscored candidates (skipped by the scoring budget) are saved as
+        sourced and get no outreach.
+        
+        Returns:
+            (save_results, outreach_results)
+        """
+        reach_out_count = len(routed_candidates['fasttrack']) + len(routed_candidates['interview']) + len(routed_candidates['takehome'])
+        
+        # Save candidates to database
+        print("💾 Saving candidates to database...")
+        all_candidates = routed_candidates['fasttrack'] + routed_candidates['interview'] + routed_candidates['takehome'] + routed_candidates['reject']
+        all_candidates += unscored or []
+        save_results = await self.save_candidates_to_database(all_candidates, job_id)
+        print(f"✅ Saved {save_results['saved_count']} new candidates, updated {save_results['updated_count']} existing")
+        
+        # Step 8 (Optional): Send outreach via tweet mentions
+        outreach_results = None
+        if send_outreach and reach_out_count > 0:
+            print(f"\n🐦 Step 8: Sending tweet mentions (ask candidates to DM)...")
+            
+            if not job_link:
+                job_link = f"https://jobs.grokreach.com/{job_id}"  # Default link
+            
+            # Get all candidates to reach out to
+            all_outreach = routed_candidates['fasttrack'] + routed_candidates['interview'] + routed_candidates['takehome']
+            
+            # Use tweet mentions instead of DMs, queued for the outbox worker
+            outreach_results = enqueue_mentions(
+                candidates=all_outreach,
+                job_title=job_title,
+                job_link=job_link,
+                job_id=job_id,
+                dry_run=dry_run
+            )
+            
+            if dry_run:
+                print(f"   [DRY RUN] Queued {outreach_results['queued']} mentions")
+            else:
+                print(f"   ✅ Queued {outreach_results['queued']} mentions ({outreach_results['skipped']} already contacted)")
+                print(f"\n   💡 Candidates can DM you once the outbox worker sends them!")
+                print(f"   📡 Make sure your webhook is running to capture responses")
+        
+        return save_results, outreach_results
+    
+    # ========================================
+    # CHECKPOINTS
+    # ========================================
+    
+    def _restore_step(self, checkpoints: Dict[int, Dict], step: int):
+        """Output of a completed step from a resumed run, or None"""
+        entry = checkpoints.get(step)
+        if entry and entry['complete']:
+            print(f"⏭️ Step {step}: Restored {STEP_NAMES[step]} from checkpoint")
+            return entry['data']
+        return None
+    
+    async def _checkpoint(self, pipeline_id: Optional[str], step: int, data, complete: bool = True, append: bool = False):
+        if not pipeline_id:
+            return
+        try:
+            if append:
+                await asyncio.to_thread(append_checkpoint, pipeline_id, step, data)
+            else:
+                await asyncio.to_thread(save_checkpoint, pipeline_id, step, data, complete)
+        except Exception as e:
+            # A missing checkpoint only costs a re-run of this step on resume
+            AgentLogger.log_error(
+                f"Failed to checkpoint step {step} of {pipeline_id}",
+                error=e,
+                pipeline_id=pipeline_id
+            )
+    
+    async def _run_checkpointed_items(
+        self,
+        pipeline_id: Optional[str],
+        step: int,
+        items: List[Dict],
+        checkpoints: Dict[int, Dict],
+        run_chunk
+    ) -> List[Dict]:
+        """
+        Run a per-user step in chunks, checkpointing progress after each chunk
+        
+        Each chunk stores only its own users and results, so a checkpoint
+        costs the same at the end of a long step as at the start. A resumed
+        run skips the users a partial checkpoint already covers. Without a
+        pipeline_id the whole list is processed in one call.
+        """
+        if not pipeline_id:
+            return await run_chunk(items)
+        
+        partial = checkpoints.get(step)
+        progress = partial['data'] if partial and not partial['complete'] else {"processed": [], "results": []}
+        processed = set(progress['processed'])
+        results = list(progress['results'])
+        
+        remaining = [item for item in items if item['username'] not in processed]
+        if processed:
+            print(f"⏭️ Step {step}: {len(processed)} users restored from checkpoint, {len(remaining)} remaining")
+        
+        for start in range(0, len(remaining), CHECKPOINT_EVERY):
+            chunk = remaining[start:start + CHECKPOINT_EVERY]
+            chunk_results = await run_chunk(chunk)
+            results.extend(chunk_results)
+            await self._checkpoint(
+                pipeline_id, step,
+                {"processed": [item['username'] for item in chunk], "results": chunk_results},
+                append=True
+            )
+        
+        return results
+    
     async def run_full_pipeline(
         self,
         job_id: int,
@@ -717,11 +939,24 @@ class SourcingAgent:
         job_description: str,
         job_link: str = None,
         send_outreach: bool = False,
-        dry_run: bool = True
+        dry_run: bool = True,
+        pipeline_id: Optional[str] = None,
+        incremental: bool = False
     ) -> Dict:
         """
         Execute all 7 steps of the sourcing pipeline
         
+        With a pipeline_id, the output of Steps 1-6 is checkpointed, and a run
+        started again with the same pipeline_id resumes after the last
+        completed step.
+        
+        With incremental=True, X users already linked to the job skip Steps 4-7
+        and keep their existing score unless their signals changed materially.
+        
+        If the task running the pipeline is cancelled, candidates scored
+        before the stop are routed and saved (without outreach) before the
+        cancellation propagates.
+        
         Returns:
             {
                 "job_id": int,
@@ -729,91 +964,439 @@ class SourcingAgent:
                 "top_candidates": [...]
             }
         """
+        progress = {"scoring": False, "scored": []}
+        try:
+            return await self._run_full_pipeline_steps(
+                job_id, job_title, job_description, job_link, send_outreach, dry_run, pipeline_id, progress, incremental
+            )
+        except asyncio.CancelledError:
+            if progress["scoring"]:
+                await self._checkpoint(pipeline_id, 6, {
+                    "processed": sorted(c['username'] for c in progress["scored"]),
+                    "results": progress["scored"]
+                }, complete=False)
+            await self._save_partial_results(progress["scored"], job_id, pipeline_id)
+            raise
+    
+    async def _save_partial_results(self, scored_candidates: List[Dict], job_id: int, pipeline_id: Optional[str]):
+        """Route and save the candidates a cancelled run had already scored (no outreach)"""
+        AgentLogger.log_sourcing(
+            f"Sourcing pipeline cancelled for job {job_id}, saving {len(scored_candidates)} candidates scored before the stop",
+            job_id=job_id,
+            pipeline_id=pipeline_id,
+            partial_candidates=len(scored_candidates)
+        )
+        if not scored_candidates:
+            return
+        
+        routed_candidates = await self.step7_apply_thresholds(scored_candidates, job_id)
+        all_candidates = routed_candidates['fasttrack'] + routed_candidates['interview'] + routed_candidates['takehome'] + routed_candidates['reject']
+        await self.save_candidates_to_database(all_candidates, job_id)
+    
+    async def _run_full_pipeline_steps(
+        self,
+        job_id: int,
+        job_title: str,
+        job_description: str,
+        job_link: Optional[str],
+        send_outreach: bool,
+        dry_run: bool,
+        pipeline_id: Optional[str],
+        progress: Dict,
+        incremental: bool = False
+    ) -> Dict:
+        """Steps 1-8 of run_full_pipeline; Step 6 results are mirrored into progress["scored"]"""
         print(f"🚀 Starting sourcing pipeline for Job {job_id}: {job_title}")
+        checkpoints = await asyncio.to_thread(load_checkpoints, pipeline_id) if pipeline_id else {}
         
         # Step 1: Generate job embedding
-        print("📊 Step 1: Generating job embedding...")
-        embedding, embedding_id = await self.step1_generate_job_embedding(
-            job_id, job_title, job_description
-        )
-        print(f"✅ Embedding generated: {embedding_id}")
+        restored = self._restore_step(checkpoints, 1)
+        if restored:
+            embedding_id = restored['embedding_id']
+        else:
+            print("📊 Step 1: Generating job embedding...")
+            embedding, embedding_id = await self.step1_generate_job_embedding(
+                job_id, job_title, job_description
+            )
+            await self._checkpoint(pipeline_id, 1, {"embedding_id": embedding_id})
+            print(f"✅ Embedding generated: {embedding_id}")
         
         # Step 2: Discover topics
-        print("🔍 Step 2: Discovering topics with Grok AI...")
-        topic_data = await self.step2_discover_topics(job_title, job_description)
+        topic_data = self._restore_step(checkpoints, 2)
+        if topic_data is None:
+            print("🔍 Step 2: Discovering topics with Grok AI...")
+            topic_data = await self.step2_discover_topics(job_title, job_description)
+            await self._checkpoint(pipeline_id, 2, topic_data)
         print(f"✅ Topics: {topic_data['topics']}")
         print(f"✅ Search Queries: {topic_data['search_queries']}")
         
         # Step 3: Discover X users
-        print("🐦 Step 3: Searching X for active users...")
-        x_users = await self.step3_discover_x_users(
-            topic_data['topics'], 
-            topic_data['search_queries'],
-            job_id
-        )
+        x_users = self._restore_step(checkpoints, 3)
+        if x_users is None:
+            print("🐦 Step 3: Searching X for active users...")
+            x_users = await self.step3_discover_x_users(
+                topic_data['topics'], 
+                topic_data['search_queries'],
+                job_id
+            )
+            await self._checkpoint(pipeline_id, 3, x_users)
         print(f"✅ Found {len(x_users)} unique users on X")
         
+        # Incremental mode: only new or materially changed users go on
+        x_users_found = len(x_users)
+        index = None
+        if incremental:
+            index = await asyncio.to_thread(load_incremental_index, job_id)
+            x_users, _ = index.split(x_users)
+            self._log_incremental(index, job_id)
+        
         # Step 4: Verify developer roles
-        print("🤖 Step 4: Verifying developer roles with Grok AI...")
-        verified_developers = await self.step4_verify_developer_role(x_users, job_title, job_id)
+        verified_developers = self._restore_step(checkpoints, 4)
+        if verified_developers is None:
+            print("🤖 Step 4: Verifying developer roles with Grok AI...")
+            verified_developers = await self.step4_verify_developer_role(
+                x_users, job_title, job_id, pipeline_id=pipeline_id, checkpoints=checkpoints
+            )
+            await self._checkpoint(pipeline_id, 4, verified_developers)
         print(f"✅ Verified {len(verified_developers)} developers")
         
         # Step 5: Enrich with LinkedIn data (mocked)
-        print("💼 Step 5: Enriching with LinkedIn data...")
-        enriched_candidates = self.enrich_with_linkedin(verified_developers, job_id)
+        enriched_candidates = self._restore_step(checkpoints, 5)
+        if enriched_candidates is None:
+            print("💼 Step 5: Enriching with LinkedIn data...")
+            enriched_candidates = await asyncio.to_thread(self.enrich_with_linkedin, verified_developers, job_id)
+            await self._checkpoint(pipeline_id, 5, enriched_candidates)
         print(f"✅ Enriched {len(enriched_candidates)} candidates")
         
+        # Resolved once, so the scoring budget and routing use the same thresholds
+        thresholds = await asyncio.to_thread(self.resolve_thresholds, job_id)
+        
         # Step 6: Compute compatibility scores
-        print("🎯 Step 6: Computing compatibility scores with Grok AI...")
-        scored_candidates = await self.step6_compute_compatibility(
-            job_title, job_description, enriched_candidates, job_id
-        )
+        scored_candidates = self._restore_step(checkpoints, 6)
+        if scored_candidates is None:
+            print("🎯 Step 6: Computing compatibility scores with Grok AI...")
+            partial = checkpoints.get(6)
+            if partial and not partial['complete']:
+                progress["scored"].extend(partial['data']['results'])
+            
+            # Spend the Grok budget on the most promising candidates first
+            ranked, budget = await self._scoring_budget(job_id, job_description, enriched_candidates, thresholds)
+            for candidate in progress["scored"]:
+                budget.record(candidate)
+            
+            progress["scoring"] = True
+            scored_candidates = await self.step6_compute_compatibility(
+                job_title, job_description, ranked, job_id,
+                on_scored=progress["scored"].append, budget=budget,
+                pipeline_id=pipeline_id, checkpoints=checkpoints
+            )
+            await self._checkpoint(pipeline_id, 6, scored_candidates)
+            self._log_budget(budget, job_id)
+            progress["scoring"] = False
+        progress["scored"] = scored_candidates
         print(f"✅ Scored {len(scored_candidates)} candidates")
         
+        # Candidates past the scoring budget are kept as sourced
+        scored_usernames = {c.get('username') for c in scored_candidates}
+        unscored = [c for c in enriched_candidates if c.get('username') not in scored_usernames]
+        
         # Step 7: Apply thresholds and route candidates
         print("🎯 Step 7: Applying score thresholds...")
         routed_candidates = await self.step7_apply_thresholds(
-            scored_candidates, job_id
+            scored_candidates, job_id, *thresholds
         )
         
         reach_out_count = len(routed_candidates['fasttrack']) + len(routed_candidates['interview']) + len(routed_candidates['takehome'])
         print(f"✅ {reach_out_count} candidates ready for outreach")
         
-        # Save candidates to database
-        print("💾 Saving candidates to database...")
-        all_candidates = routed_candidates['fasttrack'] + routed_candidates['interview'] + routed_candidates['takehome'] + routed_candidates['reject']
-        save_results = await self.save_candidates_to_database(all_candidates, job_id)
-        print(f"✅ Saved {save_results['saved_count']} new candidates, updated {save_results['updated_count']} existing")
+        save_results, outreach_results = await self._save_and_queue_outreach(
+            routed_candidates, job_id, job_title, job_link, send_outreach, dry_run, unscored
+        )
         
-        # Step 8 (Optional): Send outreach via tweet mentions
-        outreach_results = None
-        if send_outreach and reach_out_count > 0:
-            print(f"\n🐦 Step 8: Sending tweet mentions (ask candidates to DM)...")
+        return {
+            "job_id": job_id,
+            "pipeline_id": pipeline_id,
+            "embedding_id": embedding_id,
+            "topics": topic_data,
+            "x_users_found": x_users_found,
+            "verified_developers": len(verified_developers),
+            "scored_candidates": len(scored_candidates),
+            "routed_candidates": routed_candidates,
+            "reach_out_count": reach_out_count,
+            "outreach_results": outreach_results,
+            "incremental": self._incremental_result(index),
+            "status": "✅ FULL PIPELINE COMPLETE (Steps 1-7)" + (" + Outreach" if send_outreach else "")
+        }
+    
+    def _log_incremental(self, index: IncrementalIndex, job_id: int):
+        summary = index.summary()
+        print(f"♻️ Incremental: {summary['new_users']} new, {summary['changed_users']} changed, {summary['reused_users']} reused")
+        AgentLogger.log_sourcing(
+            f"Incremental re-sourcing for job {job_id}: {summary['new_users']} new and {summary['changed_users']} changed users processed, "
+            f"{summary['reused_users']} unchanged users reused with existing scores",
+            job_id=job_id,
+            **summary
+        )
+    
+    def _incremental_result(self, index: Optional[IncrementalIndex]) -> Optional[Dict]:
+        if index is None:
+            return None
+        return {**index.summary(), "reused_candidates": index.reused}
+
+    
+    # ========================================
+    # STREAMING PIPELINE
+    # ========================================
+    
+    async def _run_stage(self, name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue], handle, workers: int = 1):
+        """
+        Apply `handle` to every item of `inbox` with `workers` concurrent workers
+        
+        Results other than None are put on `outbox`. The end-of-stream marker is
+        forwarded once every worker has finished. The stage is timed as step `name`.
+        """
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _END_OF_STREAM:
+                    await inbox.put(_END_OF_STREAM)  # Let sibling workers see it too
+                    return
+                result = await handle(item)
+                if result is not None and outbox is not None:
+                    await outbox.put(result)
+        
+        with span(name, kind="step"):
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            await outbox.put(_END_OF_STREAM)
+    
+    async def run_streaming_pipeline(
+        self,
+        job_id: int,
+        job_title: str,
+        job_description: str,
+        job_link: str = None,
+        send_outreach: bool = False,
+        dry_run: bool = True,
+        max_users: int = STREAM_MAX_USERS,
+        concurrency: int = STREAM_CONCURRENCY,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        pipeline_id: Optional[str] = None,
+        incremental: bool = False
+    ) -> Dict:
+        """
+        Execute the sourcing pipeline with Steps 3-7 overlapped
+        
+        Steps 1-2 run as usual. Steps 3-7 run as concurrent stages joined by
+        bounded queues (search → role verification → LinkedIn enrichment →
+        scoring/routing), so each user moves on as soon as the previous stage
+        is done with it. The first candidates are scored while X search is
+        still paging, and a full queue pauses the stage feeding it.
+        
+        Args:
+            max_users: X user budget for Step 3
+            concurrency: Workers for the Grok-bound stages (Steps 4 and 6)
+            queue_size: Capacity of each queue between stages
+            pipeline_id: Checkpoint Steps 1-2 up front and Steps 3 and 6 once the
+                stages finish; a failed streaming run resumes in batch mode
+            incremental: Users already linked to the job skip verification and
+                scoring unless their signals changed materially
+        
+        Returns:
+            Same shape as run_full_pipeline, plus "mode" and "first_candidate_seconds"
+        """
+        print(f"🚀 Starting streaming sourcing pipeline for Job {job_id}: {job_title}")
+        started = time.monotonic()
+        checkpoints = await asyncio.to_thread(load_checkpoints, pipeline_id) if pipeline_id else {}
+        
+        # Step 1: Generate job embedding
+        restored = self._restore_step(checkpoints, 1)
+        if restored:
+            embedding_id = restored['embedding_id']
+        else:
+            print("📊 Step 1: Generating job embedding...")
+            embedding, embedding_id = await self.step1_generate_job_embedding(
+                job_id, job_title, job_description
+            )
+            await self._checkpoint(pipeline_id, 1, {"embedding_id": embedding_id})
+            print(f"✅ Embedding generated: {embedding_id}")
+        
+        # Step 2: Discover topics
+        topic_data = self._restore_step(checkpoints, 2)
+        if topic_data is None:
+            print("🔍 Step 2: Discovering topics with Grok AI...")
+            topic_data = await self.step2_discover_topics(job_title, job_description)
+            await self._checkpoint(pipeline_id, 2, topic_data)
+        print(f"✅ Topics: {topic_data['topics']}")
+        print(f"✅ Search Queries: {topic_data['search_queries']}")
+        
+        thresholds = await asyncio.to_thread(self.resolve_thresholds, job_id)
+        
+        # Candidates arrive in search order, so the budget caps calls and stops
+        # at the headcount target but cannot rank ahead of time
+        requirements, headcount = await self._job_scoring_targets(job_id, job_description)
+        budget = ScoringBudget(thresholds[2], headcount)
+        
+        AgentLogger.log_sourcing(
+            f"Starting streaming Steps 3-7 for job {job_id} (max {max_users} users, {concurrency} workers per stage)",
+            job_id=job_id,
+            max_users=max_users,
+            concurrency=concurrency,
+            queue_size=queue_size
+        )
+        
+        to_verify: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        to_enrich: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        to_score: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        x_users: List[Dict] = []
+        verified_developers: List[Dict] = []
+        scored_candidates: List[Dict] = []
+        unscored: List[Dict] = []
+        routed_candidates = {"reject": [], "takehome": [], "interview": [], "fasttrack": []}
+        first_candidate_seconds = None
+        
+        @traced("step3_discover_x_users", kind="step")
+        async def search_stage():
+            print("🐦 Step 3: Streaming X search for active users...")
+            async for user in stream_users_from_topics(
+                topic_data['topics'], topic_data['search_queries'], max_users=max_users
+            ):
+                x_users.append(user)
+                event_hub.count(job_id, x_users_found=1)
+                await to_verify.put(user)
+            await to_verify.put(_END_OF_STREAM)
+            print(f"✅ Found {len(x_users)} unique users on X")
             
-            if not job_link:
-                job_link = f"https://jobs.grokreach.com/{job_id}"  # Default link
+            # Persist signals so later runs can refresh incrementally
+            try:
+                stored = await asyncio.to_thread(persist_signals, x_users, job_id)
+                AgentLogger.log_search(
+                    f"Stored {stored['signals_inserted']} new X signals for {stored['users_tracked']} users",
+                    job_id=job_id,
+                    **stored
+                )
+            except Exception as store_error:
+                AgentLogger.log_error(
+                    f"Failed to persist X signals for job {job_id}",
+                    error=store_error,
+                    job_id=job_id
+                )
+        
+        prefilter_stats = PrefilterStats()
+        index = await asyncio.to_thread(load_incremental_index, job_id) if incremental else None
+        
+        async def verify(user: Dict) -> Optional[Dict]:
+            if index is not None and index.classify(user) == "unchanged":
+                return None
+            developer = await verify_developer(user, job_title, prefilter_stats)
+            if developer:
+                verified_developers.append(developer)
+                event_hub.count(job_id, verified_developers=1)
+            return developer
+        
+        async def enrich(developer: Dict) -> Dict:
+            return await asyncio.to_thread(self.enrich_developer, developer)
+        
+        async def score(candidate: Dict) -> None:
+            nonlocal first_candidate_seconds
+            candidate['prescore'] = prescore_candidate(candidate, requirements)
+            if budget.exhausted:
+                budget.skipped += 1
+                unscored.append(candidate)
+                return None
             
-            # Get all candidates to reach out to
-            all_outreach = routed_candidates['fasttrack'] + routed_candidates['interview'] + routed_candidates['takehome']
+            username = candidate.get('username', 'unknown')
+            print(f"📊 Scoring @{username}...")
             
-            # Use tweet mentions instead of DMs
-            outreach_results = send_mentions_batch(
-                candidates=all_outreach,
-                job_title=job_title,
-                job_link=job_link,
-                dry_run=dry_run
-            )
+            try:
+                candidate['compatibility'] = await compute_compatibility_score(
+                    job_title=job_title,
+                    job_description=job_description,
+                    candidate=candidate
+                )
+            except Exception as e:
+                AgentLogger.log_error(
+                    f"Failed to score candidate @{username}",
+                    error=e,
+                    job_id=job_id,
+                    candidate_username=username
+                )
+                print(f"  ❌ Error scoring @{username}: {e}")
+                return None
             
-            if dry_run:
-                print(f"   [DRY RUN] Would tweet {outreach_results['sent']} mentions")
-            else:
-                print(f"   ✅ Tweeted {outreach_results['sent']} mentions")
-                print(f"   ❌ Failed {outreach_results['failed']} mentions")
-                print(f"\n   💡 Candidates can now DM you if interested!")
-                print(f"   📡 Make sure your webhook is running to capture responses")
+            budget.record(candidate)
+            recommendation = self.route_candidate(candidate, thresholds)
+            routed_candidates[recommendation].append(candidate)
+            scored_candidates.append(candidate)
+            self._publish_scored(candidate, job_id, recommendation)
+            
+            if first_candidate_seconds is None:
+                first_candidate_seconds = round(time.monotonic() - started, 2)
+                print(f"⏱️ First candidate scored after {first_candidate_seconds}s")
+            print(f"  ✅ Score: {candidate['compatibility']['compatibility_score']}/100 → {recommendation}")
+        
+        stages = [
+            asyncio.create_task(search_stage()),
+            asyncio.create_task(self._run_stage("step4_verify_developer_role", to_verify, to_enrich, verify, concurrency)),
+            asyncio.create_task(self._run_stage("step5_enrich_with_linkedin", to_enrich, to_score, enrich)),
+            asyncio.create_task(self._run_stage("step6_compute_compatibility", to_score, None, score, concurrency))
+        ]
+        
+        # A failing stage would leave its neighbours blocked on a queue, so cancel them all
+        try:
+            done, pending = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            await self._save_partial_results(list(scored_candidates), job_id, pipeline_id)
+            raise
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception():
+                AgentLogger.log_error(
+                    f"Streaming sourcing pipeline failed for job {job_id}",
+                    error=task.exception(),
+                    job_id=job_id
+                )
+                raise task.exception()
+        
+        await self._checkpoint(pipeline_id, 3, x_users)
+        await self._checkpoint(pipeline_id, 6, scored_candidates)
+        self._log_prefilter(prefilter_stats, job_id)
+        self._log_budget(budget, job_id)
+        if index is not None:
+            self._log_incremental(index, job_id)
+        
+        reach_out_count = len(routed_candidates['fasttrack']) + len(routed_candidates['interview']) + len(routed_candidates['takehome'])
+        AgentLogger.log_sourcing(
+            f"Streaming Steps 3-7 complete: {len(x_users)} users, {len(verified_developers)} verified, {len(scored_candidates)} scored",
+            job_id=job_id,
+            x_users_found=len(x_users),
+            developers_verified=len(verified_developers),
+            candidates_scored=len(scored_candidates),
+            first_candidate_seconds=first_candidate_seconds,
+            routing_results={
+                "fasttrack": len(routed_candidates['fasttrack']),
+                "interview": len(routed_candidates['interview']),
+                "takehome": len(routed_candidates['takehome']),
+                "reject": len(routed_candidates['reject']),
+                "total_outreach": reach_out_count
+            }
+        )
+        print(f"✅ {reach_out_count} candidates ready for outreach")
+        
+        save_results, outreach_results = await self._save_and_queue_outreach(
+            routed_candidates, job_id, job_title, job_link, send_outreach, dry_run, unscored
+        )
         
         return {
             "job_id": job_id,
+            "pipeline_id": pipeline_id,
+            "mode": "streaming",
             "embedding_id": embedding_id,
             "topics": topic_data,
             "x_users_found": len(x_users),
@@ -822,6 +1405,171 @@ class SourcingAgent:
             "routed_candidates": routed_candidates,
             "reach_out_count": reach_out_count,
             "outreach_results": outreach_results,
-            "status": "✅ FULL PIPELINE COMPLETE (Steps 1-7)" + (" + Outreach" if send_outreach else "")
+            "first_candidate_seconds": first_candidate_seconds,
+            "incremental": self._incremental_result(index),
+            "status": "✅ STREAMING PIPELINE COMPLETE (Steps 1-7)" + (" + Outreach" if send_outreach else "")
+        }
+    
+    # ========================================
+    # MULTI-JOB BATCH PIPELINE
+    # ========================================
+    
+    def _relevant_jobs(self, candidate: Dict, job_terms: Dict[int, List[FrozenSet[str]]]) -> List[int]:
+        """Jobs with a topic or query that one of the candidate's posts matches (all jobs if none do)"""
+        post_tokens = [term_tokens(signal.get('text', '')) for signal in candidate.get('signals', [])]
+        matched = [
+            job_id for job_id, terms in job_terms.items()
+            if any(term <= tokens for term in terms for tokens in post_tokens)
+        ]
+        return matched or list(job_terms)
+    
+    async def run_multi_job_pipeline(
+        self,
+        jobs: List[Dict],
+        job_link: str = None,
+        send_outreach: bool = False,
+        dry_run: bool = True,
+        pipeline_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Source candidates for several jobs, sharing X search and role verification
+        
+        1. Steps 1-2 run per job (embedding and topics are job-specific)
+        2. Topics and queries are unioned across jobs, and Steps 3-5 run once
+           per unique X user
+        3. Steps 6-7 fan out per job, over only the users whose posts match
+           one of that job's topics or queries
+        
+        If the task running the pipeline is cancelled, each job's candidates
+        scored before the stop are routed and saved (without outreach) before
+        the cancellation propagates.
+        
+        Args:
+            jobs: [{"id": int, "title": str, "description": str}, ...]
+            job_link: Outreach link for every job (defaults to each job's own link)
+            pipeline_id: Run the pipeline belongs to (for logs)
+        
+        Returns:
+            {
+                "jobs": {job_id: per-job summary},
+                "shared": {"x_users_found", "verified_developers", "scoring_calls", ...}
+            }
+        """
+        job_ids = [job['id'] for job in jobs]
+        print(f"🚀 Starting multi-job sourcing pipeline for {len(jobs)} jobs: {job_ids}")
+        AgentLogger.log_sourcing(
+            f"Starting multi-job sourcing pipeline for {len(jobs)} jobs",
+            job_ids=job_ids
+        )
+        
+        # Steps 1-2 per job
+        async def prepare(job: Dict) -> Dict:
+            embedding, embedding_id = await self.step1_generate_job_embedding(
+                job['id'], job['title'], job['description']
+            )
+            topic_data = await self.step2_discover_topics(job['title'], job['description'])
+            return {"embedding_id": embedding_id, "topics": topic_data}
+        
+        print("📊 Steps 1-2: Generating embeddings and topics per job...")
+        prepared = dict(zip(job_ids, await asyncio.gather(*(prepare(job) for job in jobs))))
+        
+        # Union of every job's terms; the query planner drops duplicates and covered terms
+        all_topics = [t for job_id in job_ids for t in prepared[job_id]['topics']['topics']]
+        all_queries = [q for job_id in job_ids for q in prepared[job_id]['topics']['search_queries']]
+        job_terms = {
+            job_id: [
+                tokens for tokens in (
+                    term_tokens(term) for term in
+                    prepared[job_id]['topics']['topics'] + prepared[job_id]['topics']['search_queries']
+                ) if tokens
+            ]
+            for job_id in job_ids
+        }
+        
+        # Steps 3-5 once per unique user
+        print(f"🐦 Step 3: Searching X once for {len(all_topics)} topics and {len(all_queries)} queries across jobs...")
+        x_users = await self.step3_discover_x_users(all_topics, all_queries)
+        print(f"✅ Found {len(x_users)} unique users on X")
+        
+        print("🤖 Step 4: Verifying developer roles once per user...")
+        titles = " / ".join(dict.fromkeys(job['title'] for job in jobs))
+        verified_developers = await self.step4_verify_developer_role(x_users, titles)
+        print(f"✅ Verified {len(verified_developers)} developers")
+        
+        print("💼 Step 5: Enriching with LinkedIn data...")
+        enriched_candidates = await asyncio.to_thread(self.enrich_with_linkedin, verified_developers)
+        
+        # Steps 6-7 per job, on copies so per-job scores don't collide
+        relevant = {c['username']: self._relevant_jobs(c, job_terms) for c in enriched_candidates}
+        per_job_candidates = {
+            job_id: [copy.deepcopy(c) for c in enriched_candidates if job_id in relevant[c['username']]]
+            for job_id in job_ids
+        }
+        scoring_calls = sum(len(candidates) for candidates in per_job_candidates.values())
+        
+        print(f"🎯 Step 6: Scoring up to {scoring_calls} job-candidate pairs (vs {len(enriched_candidates) * len(jobs)} without relevance fan-out)...")
+        
+        # Mirrors each job's scored candidates so a cancelled run can save them
+        scored_so_far: Dict[int, List[Dict]] = {job_id: [] for job_id in job_ids}
+        
+        async def score_job(job: Dict) -> tuple[List[Dict], List[Dict], tuple[int, int, int]]:
+            thresholds = await asyncio.to_thread(self.resolve_thresholds, job['id'])
+            ranked, budget = await self._scoring_budget(job['id'], job['description'], per_job_candidates[job['id']], thresholds)
+            scored = await self.step6_compute_compatibility(
+                job['title'], job['description'], ranked, job['id'],
+                on_scored=scored_so_far[job['id']].append, budget=budget
+            )
+            self._log_budget(budget, job['id'])
+            scored_usernames = {c.get('username') for c in scored}
+            return scored, [c for c in ranked if c.get('username') not in scored_usernames], thresholds
+        
+        saved = set()
+        try:
+            scored_per_job = await asyncio.gather(*(score_job(job) for job in jobs))
+            scoring_calls = sum(len(scored) for scored, _, _ in scored_per_job)
+            
+            results = {}
+            for job, (scored_candidates, unscored, thresholds) in zip(jobs, scored_per_job):
+                job_id = job['id']
+                print(f"🎯 Step 7: Routing {len(scored_candidates)} candidates for job {job_id}...")
+                routed_candidates = await self.step7_apply_thresholds(scored_candidates, job_id, *thresholds)
+                save_results, outreach_results = await self._save_and_queue_outreach(
+                    routed_candidates, job_id, job['title'], job_link, send_outreach, dry_run, unscored
+                )
+                saved.add(job_id)
+                results[job_id] = {
+                    "job_id": job_id,
+                    "embedding_id": prepared[job_id]['embedding_id'],
+                    "topics": prepared[job_id]['topics'],
+                    "candidates_considered": len(per_job_candidates[job_id]),
+                    "scored_candidates": len(scored_candidates),
+                    "routed_candidates": routed_candidates,
+                    "reach_out_count": len(routed_candidates['fasttrack']) + len(routed_candidates['interview']) + len(routed_candidates['takehome']),
+                    "save_results": save_results,
+                    "outreach_results": outreach_results
+                }
+        except asyncio.CancelledError:
+            for job_id in job_ids:
+                if job_id not in saved:
+                    await self._save_partial_results(scored_so_far[job_id], job_id, pipeline_id)
+            raise
+        
+        shared = {
+            "jobs": len(jobs),
+            "x_users_found": len(x_users),
+            "verified_developers": len(verified_developers),
+            "role_verifications": len(x_users),
+            "scoring_calls": scoring_calls,
+            "scoring_calls_without_fan_out": len(enriched_candidates) * len(jobs)
+        }
+        AgentLogger.log_sourcing(
+            f"Multi-job sourcing complete for {len(jobs)} jobs: {len(x_users)} users searched and verified once, {scoring_calls} scoring calls",
+            job_ids=job_ids,
+            **shared
+        )
+        
+        return {
+            "jobs": results,
+            "shared": shared,
+            "status": f"✅ MULTI-JOB PIPELINE COMPLETE ({len(jobs)} jobs)" + (" + Outreach" if send_outreach else "")
         }
-
@@ -8,14 +8,14 @@ import os
 from openai import OpenAI
 import httpx
 from app.models.schemas import Candidate, Team, TeamMatch, Job
-from app.db.database import engine
+from app.db.database import async_session
 from app.utils.logger import AgentLogger
 from app.services.team_manager_notification import (
     send_candidate_profile_to_manager,
     passes_threshold,
     MATCH_THRESHOLD
 )
-from sqlmodel import Session, select
+from sqlmodel import select
 from datetime import datetime
 
 # OpenAI client for embeddings
@@ -191,14 +191,14 @@ class TeamMatchService:
         Returns:
             List of TeamMatch records with scores and reasoning
         """
-        with Session(engine) as session:
+        async with async_session() as session:
             # Get candidate data
-            candidate = session.get(Candidate, candidate_id)
+            candidate = await session.get(Candidate, candidate_id)
             if not candidate:
                 raise ValueError(f"Candidate {candidate_id} not found")
             
             # Get active teams
-            teams = session.exec(select(Team).where(Team.is_active == True)).all()
+            teams = (await session.exec(select(Team).where(Team.is_active == True))).all()
             if not teams:
                 raise ValueError("No active teams available")
             
@@ -255,7 +255,7 @@ class TeamMatchService:
                 passes_match_threshold = passes_threshold(final_score)
                 
                 # Get team for notification
-                team = session.get(Team, match.get("team_id"))
+                team = await session.get(Team, match.get("team_id"))
                 manager_email = None
                 
                 # Send notification to team manager if passes threshold
@@ -329,11 +329,11 @@ class TeamMatchService:
                 session.add(team_match)
                 team_matches.append(team_match)
             
-            session.commit()
+            await session.commit()
             
             # Refresh to get IDs
             for tm in team_matches:
-                session.refresh(tm)
+                await session.refresh(tm)
             
             # Count matches above threshold
             above_threshold = sum(1 for tm in team_matches if tm.passes_threshold)
@@ -357,8 +357,8 @@ class TeamMatchService:
         reviewer_notes: Optional[str] = None
     ):
         """Approve a team match"""
-        with Session(engine) as session:
-            match = session.get(TeamMatch, match_id)
+        async with async_session() as session:
+            match = await session.get(TeamMatch, match_id)
             if not match:
                 raise ValueError("Match not found")
             
@@ -372,8 +372,8 @@ class TeamMatchService:
             match.updated_at = datetime.utcnow()
             
             session.add(match)
-            session.commit()
-            session.refresh(match)
+            await session.commit()
+            await session.refresh(match)
             
             AgentLogger.log_sourcing(
                 f"Team match approved by {reviewer_name}",
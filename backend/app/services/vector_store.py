@@ -2,6 +2,7 @@ from pinecone import Pinecone, ServerlessSpec
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
+from app.utils.timing import span
 
 load_dotenv()
 
@@ -48,17 +49,18 @@ def store_job_embedding(job_id: int, embedding: List[float], metadata: Dict) ->
     embedding_id = f"job_{job_id}"
     
     # Pinecone upsert format
-    index.upsert(
-        vectors=[{
-            "id": embedding_id,
-            "values": embedding,
-            "metadata": {
-                "type": "job",
-                "job_id": job_id,
-                **metadata
-            }
-        }]
-    )
+    with span("pinecone.upsert"):
+        index.upsert(
+            vectors=[{
+                "id": embedding_id,
+                "values": embedding,
+                "metadata": {
+                    "type": "job",
+                    "job_id": job_id,
+                    **metadata
+                }
+            }]
+        )
     return embedding_id
 
 def search_similar_jobs(embedding: List[float], top_k: int = 5) -> List[Dict]:
@@ -66,12 +68,13 @@ def search_similar_jobs(embedding: List[float], top_k: int = 5) -> List[Dict]:
     Find similar jobs based on embedding
     """
     index = get_index()
-    results = index.query(
-        vector=embedding,
-        top_k=top_k,
-        filter={"type": "job"},
-        include_metadata=True
-    )
+    with span("pinecone.query"):
+        results = index.query(
+            vector=embedding,
+            top_k=top_k,
+            filter={"type": "job"},
+            include_metadata=True
+        )
     return results
 
 def store_candidate_embedding(candidate_id: int, embedding: List[float], metadata: Dict) -> str:
@@ -81,16 +84,17 @@ def store_candidate_embedding(candidate_id: int, embedding: List[float], metadat
     index = get_index()
     embedding_id = f"candidate_{candidate_id}"
     
-    index.upsert(
-        vectors=[{
-            "id": embedding_id,
-            "values": embedding,
-            "metadata": {
-                "type": "candidate",
-                "candidate_id": candidate_id,
-                **metadata
-            }
-        }]
-    )
+    with span("pinecone.upsert"):
+        index.upsert(
+            vectors=[{
+                "id": embedding_id,
+                "values": embedding,
+                "metadata": {
+                    "type": "candidate",
+                    "candidate_id": candidate_id,
+                    **metadata
+                }
+            }]
+        )
     return embedding_id
 
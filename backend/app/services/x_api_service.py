@@ -3,137 +3,290 @@ X (Twitter) API v2 Service for Step 3: Topic → Active X Users
 
 Uses X API v2 Premium tier to search for users posting about specific topics
 """
-import os
-import tweepy
-from typing import List, Dict, Optional
+import asyncio
+import threading
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
+from app.services.x_client_registry import get_x_client
+from app.services.x_query_planner import plan_queries, attribute_tweet
+from app.utils.timing import span
 
 load_dotenv()
 
-def get_x_client():
-    """Initialize X API v2 client with Bearer Token"""
-    bearer_token = os.getenv("X_BEARER_TOKEN")
-    if not bearer_token:
-        raise ValueError("X_BEARER_TOKEN not found in environment variables")
-    
-    return tweepy.Client(
-        bearer_token=bearer_token,
-        consumer_key=os.getenv("X_CONSUMER_KEY"),
-        consumer_secret=os.getenv("X_CONSUMER_SECRET"),
-        access_token=os.getenv("X_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCESS_TOKEN_SECRET"),
-        wait_on_rate_limit=True
-    )
+def _format_search_response(response) -> List[Dict]:
+    """Flatten a search response into tweet dicts joined with their author"""
+    if not response.data:
+        return []
+    
+    # Build user lookup
+    users = {user.id: user for user in (response.includes.get('users', []) or [])}
+    
+    # Format results
+    results = []
+    for tweet in response.data:
+        user = users.get(tweet.author_id)
+        if not user:
+            continue
+            
+        results.append({
+            'tweet_id': tweet.id,
+            'tweet_text': tweet.text,
+            'created_at': str(tweet.created_at),
+            'user_id': user.id,
+            'username': user.username,
+            'name': user.name,
+            'bio': user.description or "",
+            'followers': user.public_metrics.get('followers_count', 0),
+            'following': user.public_metrics.get('following_count', 0),
+            'verified': user.verified or False,
+            'engagement': {
+                'retweets': tweet.public_metrics.get('retweet_count', 0),
+                'likes': tweet.public_metrics.get('like_count', 0),
+                'replies': tweet.public_metrics.get('reply_count', 0)
+            }
+        })
+    
+    return results
+
+def search_recent_tweets_page(
+    query: str,
+    max_results: int = 100,
+    next_token: Optional[str] = None,
+    since_id: Optional[str] = None,
+    start_time: Optional[datetime] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch one page of recent search results
+    
+    Unlike search_recent_tweets, API errors are raised to the caller.
+    
+    Args:
+        query: Search query (X API query syntax)
+        max_results: Page size (10-100)
+        next_token: Pagination token from the previous page
+        since_id: Only return tweets newer than this tweet ID
+        start_time: Only return tweets posted at or after this UTC time
+        
+    Returns:
+        (tweets, next_token) - next_token is None on the last page
+    """
+    client = get_x_client(require_bearer_token=True)
+    
+    params = {
+        'query': query,
+        'max_results': max(10, min(max_results, 100)),
+        'tweet_fields': ['created_at', 'public_metrics', 'author_id'],
+        'user_fields': ['username', 'name', 'description', 'public_metrics', 'verified'],
+        'expansions': ['author_id']
+    }
+    if next_token:
+        params['next_token'] = next_token
+    if since_id:
+        params['since_id'] = since_id
+    if start_time:
+        params['start_time'] = start_time
+    
+    with span("x.search_recent_tweets"):
+        response = client.search_recent_tweets(**params)
+    return _format_search_response(response), (response.meta or {}).get('next_token')
 
 def search_recent_tweets(query: str, max_results: int = 10) -> List[Dict]:
     """
     Search recent tweets for a specific query
     
+    Follows next_token pagination when more than one page (100 tweets) is
+    asked for. An API error ends the search with the tweets fetched so far.
+    
     Args:
         query: Search query (X API query syntax)
-        max_results: Number of tweets to return (10-100 for Premium)
+        max_results: Number of tweets to return
         
     Returns:
         List of tweet data with user info
     """
-    try:
-        client = get_x_client()
+    tweets = []
+    next_token = None
+    while len(tweets) < max_results:
+        try:
+            page, next_token = search_recent_tweets_page(
+                query, max_results=max_results - len(tweets), next_token=next_token
+            )
+        except Exception as e:
+            print(f"⚠️ X API error: {e}")
+            break
+        tweets.extend(page)
+        if not next_token:
+            break
+    return tweets[:max_results]
+
+def user_from_tweet(tweet: Dict) -> Dict:
+    """Build the Step 3 user record from a formatted tweet"""
+    return {
+        'username': tweet['username'],
+        'user_id': str(tweet['user_id']),
+        'name': tweet['name'],
+        'bio': tweet['bio'],
+        'followers': tweet['followers'],
+        'following': tweet['following'],
+        'verified': tweet['verified'],
+        'signals': []  # Behavioral signals
+    }
+
+def signal_from_tweet(tweet: Dict, topic: str) -> Dict:
+    """Build a post signal from a formatted tweet"""
+    return {
+        'type': 'post',
+        'tweet_id': str(tweet['tweet_id']),
+        'text': tweet['tweet_text'],
+        'engagement': tweet['engagement'],
+        'created_at': tweet['created_at'],
+        'topic': topic
+    }
+
+def _add_tweet(all_users: Dict[str, Dict], tweet: Dict, terms: List[str]) -> bool:
+    """Record a tweet's author and signal, attributing it to the term it matched. Returns True for new users."""
+    topic = (attribute_tweet(tweet['tweet_text'], terms) or terms or [''])[0]
+    username = tweet['username']
+    is_new = username not in all_users
+    if is_new:
+        all_users[username] = user_from_tweet(tweet)
+    all_users[username]['signals'].append(signal_from_tweet(tweet, topic))
+    return is_new
+
+async def _stream_planned_queries(
+    planned: List[Dict],
+    max_users: int,
+    page_size: int
+) -> AsyncIterator[Dict]:
+    seen: Dict[str, Dict] = {}
+    
+    for plan in planned:
+        if len(seen) >= max_users:
+            break
         
-        # Search recent tweets
-        response = client.search_recent_tweets(
-            query=query,
-            max_results=max_results,
-            tweet_fields=['created_at', 'public_metrics', 'author_id'],
-            user_fields=['username', 'name', 'description', 'public_metrics', 'verified'],
-            expansions=['author_id']
+        query = plan['query']
+        print(f"🔍 Streaming X search for: {query}")
+        pending = asyncio.create_task(
+            asyncio.to_thread(search_recent_tweets_page, query, page_size)
         )
         
-        if not response.data:
-            return []
-        
-        # Build user lookup
-        users = {user.id: user for user in (response.includes.get('users', []) or [])}
-        
-        # Format results
-        results = []
-        for tweet in response.data:
-            user = users.get(tweet.author_id)
-            if not user:
-                continue
+        try:
+            while pending:
+                try:
+                    tweets, next_token = await pending
+                except Exception as e:
+                    print(f"  ⚠️ X API error: {e}")
+                    break
                 
-            results.append({
-                'tweet_id': tweet.id,
-                'tweet_text': tweet.text,
-                'created_at': str(tweet.created_at),
-                'user_id': user.id,
-                'username': user.username,
-                'name': user.name,
-                'bio': user.description or "",
-                'followers': user.public_metrics.get('followers_count', 0),
-                'following': user.public_metrics.get('following_count', 0),
-                'verified': user.verified or False,
-                'engagement': {
-                    'retweets': tweet.public_metrics.get('retweet_count', 0),
-                    'likes': tweet.public_metrics.get('like_count', 0),
-                    'replies': tweet.public_metrics.get('reply_count', 0)
-                }
-            })
-        
-        return results
+                # Prefetch the next page while this one is consumed, unless
+                # this page's new users already fill the budget
+                new_users = {t['username'] for t in tweets} - seen.keys()
+                pending = None
+                if next_token and len(seen) + len(new_users) < max_users:
+                    pending = asyncio.create_task(
+                        asyncio.to_thread(search_recent_tweets_page, query, page_size, next_token)
+                    )
+                
+                for tweet in tweets:
+                    if tweet['username'] not in seen and len(seen) >= max_users:
+                        continue
+                    if _add_tweet(seen, tweet, plan['terms']):
+                        yield seen[tweet['username']]
+        finally:
+            if pending and not pending.done():
+                pending.cancel()
+
+async def stream_users_from_queries(
+    queries: List[str],
+    max_users: int = 100,
+    page_size: int = 100
+) -> AsyncIterator[Dict]:
+    """
+    Stream unique X users for a list of queries, following next_token pagination
+    
+    Pages are fetched in a worker thread, and the next page is requested before
+    the users of the current page are yielded, so consumers can verify early
+    users while later pages are still loading.
+    
+    Each user is yielded once. Signals from later tweets by an already-yielded
+    user are appended to the same dict in place.
+    
+    Args:
+        queries: Search queries, searched in order
+        max_users: Total user budget across all queries
+        page_size: Tweets per page (10-100)
         
-    except Exception as e:
-        print(f"⚠️ X API error: {e}")
-        return []
+    Yields:
+        User dicts in the same shape as discover_users_from_topics
+    """
+    planned = [{'query': query, 'terms': [query]} for query in queries]
+    async for user in _stream_planned_queries(planned, max_users, page_size):
+        yield user
 
-def discover_users_from_topics(topics: List[str], queries: List[str], max_per_query: int = 10) -> List[Dict]:
+async def stream_users_from_topics(
+    topics: List[str],
+    queries: List[str],
+    max_users: int = 100,
+    page_size: int = 100
+) -> AsyncIterator[Dict]:
+    """
+    Stream unique X users for Step 2 output, merging queries and topics with OR
+    
+    Same streaming semantics as stream_users_from_queries, but terms are
+    packed by the query planner and each signal's topic is the original term
+    the tweet matched.
+    """
+    planned = plan_queries(queries + topics)
+    async for user in _stream_planned_queries(planned, max_users, page_size):
+        yield user
+
+def discover_users_from_topics(
+    topics: List[str],
+    queries: List[str],
+    max_per_query: int = 10,
+    stop_event: Optional[threading.Event] = None
+) -> List[Dict]:
     """
     Search X for users posting about specific topics
     
+    Queries and topics are merged into as few OR-combined requests as the
+    query-length limit allows (see x_query_planner). A merged request is
+    paged until it has max_per_query tweets for each of its terms.
+    
     Args:
         topics: List of topic strings
         queries: List of search queries
-        max_per_query: Max results per query
+        max_per_query: Max results per original query/topic
+        stop_event: Checked between requests; once set, the users found so far are returned
         
     Returns:
         List of unique users with their signals
     """
     all_users = {}
+    already_run = set()
     
-    # Try specific queries first
-    for query in queries[:3]:  # Limit to 3 queries to avoid rate limits
-        print(f"🔍 Searching X for: {query}")
-        tweets = search_recent_tweets(query, max_results=max_per_query)
+    # Specific queries first, then topics, packed into merged requests
+    for plan in plan_queries(queries + topics, already_run):
+        if stop_event and stop_event.is_set():
+            return list(all_users.values())
+        print(f"🔍 Searching X for: {plan['query']}")
+        tweets = search_recent_tweets(
+            plan['query'],
+            max_results=max_per_query * len(plan['terms'])
+        )
         
         if tweets:
-            print(f"  ✅ Found {len(tweets)} tweets")
+            print(f"  ✅ Found {len(tweets)} tweets for {len(plan['terms'])} terms")
         else:
             print(f"  ⚠️ No results, trying broader query...")
         
         # Deduplicate users
         for tweet in tweets:
-            username = tweet['username']
-            if username not in all_users:
-                all_users[username] = {
-                    'username': username,
-                    'name': tweet['name'],
-                    'bio': tweet['bio'],
-                    'followers': tweet['followers'],
-                    'following': tweet['following'],
-                    'verified': tweet['verified'],
-                    'signals': []  # Behavioral signals
-                }
-            
-            # Add signal
-            all_users[username]['signals'].append({
-                'type': 'post',
-                'text': tweet['tweet_text'],
-                'engagement': tweet['engagement'],
-                'created_at': tweet['created_at'],
-                'topic': query
-            })
+            _add_tweet(all_users, tweet, plan['terms'])
     
     # If we found very few users, try broader fallback queries
-    if len(all_users) < 5:
+    if len(all_users) < 5 and not (stop_event and stop_event.is_set()):
         print(f"⚠️ Only found {len(all_users)} users, trying broader fallback queries...")
         
         # Extract key terms from topics
@@ -143,36 +296,66 @@ def discover_users_from_topics(topics: List[str], queries: List[str], max_per_qu
             words = topic.lower().split()[:2]
             fallback_queries.append(' '.join(words))
         
-        for query in fallback_queries:
-            print(f"🔍 Fallback search: {query}")
-            tweets = search_recent_tweets(query, max_results=max_per_query)
+        # Terms already covered by the first pass are dropped
+        for plan in plan_queries(fallback_queries, already_run):
+            if stop_event and stop_event.is_set():
+                break
+            print(f"🔍 Fallback search: {plan['query']}")
+            tweets = search_recent_tweets(
+                plan['query'],
+                max_results=max_per_query * len(plan['terms'])
+            )
             
             if tweets:
                 print(f"  ✅ Found {len(tweets)} tweets")
             
             for tweet in tweets:
-                username = tweet['username']
-                if username not in all_users:
-                    all_users[username] = {
-                        'username': username,
-                        'name': tweet['name'],
-                        'bio': tweet['bio'],
-                        'followers': tweet['followers'],
-                        'following': tweet['following'],
-                        'verified': tweet['verified'],
-                        'signals': []
-                    }
-                
-                all_users[username]['signals'].append({
-                    'type': 'post',
-                    'text': tweet['tweet_text'],
-                    'engagement': tweet['engagement'],
-                    'created_at': tweet['created_at'],
-                    'topic': query
-                })
+                _add_tweet(all_users, tweet, plan['terms'])
     
     return list(all_users.values())
 
+def _format_user(u) -> Dict:
+    """Flatten a user lookup result"""
+    return {
+        'user_id': u.id,
+        'username': u.username,
+        'name': u.name,
+        'bio': u.description or "",
+        'followers': u.public_metrics.get('followers_count', 0),
+        'following': u.public_metrics.get('following_count', 0),
+        'verified': u.verified or False,
+        'account_created': str(u.created_at)
+    }
+
+def get_users_by_usernames(usernames: List[str], wait_on_rate_limit: bool = True) -> Dict[str, Dict]:
+    """
+    Get user profiles for many usernames with the multi-user lookup endpoint
+    
+    Looks up to 100 usernames per request. API errors are raised to the caller.
+    
+    Args:
+        usernames: X usernames (with or without @)
+        wait_on_rate_limit: If False, raise tweepy.TooManyRequests on a 429
+            instead of sleeping until the window resets
+        
+    Returns:
+        {lowercase_username: profile dict} - unknown users are omitted
+    """
+    client = get_x_client(require_bearer_token=True, wait_on_rate_limit=wait_on_rate_limit)
+    names = list(dict.fromkeys(u.lstrip('@') for u in usernames if u))
+    profiles = {}
+    
+    for start in range(0, len(names), 100):
+        with span("x.get_users"):
+            response = client.get_users(
+                usernames=names[start:start + 100],
+                user_fields=['description', 'public_metrics', 'verified', 'created_at']
+            )
+        for u in response.data or []:
+            profiles[u.username.lower()] = _format_user(u)
+    
+    return profiles
+
 def get_user_by_username(username: str) -> Optional[Dict]:
     """
     Get detailed user profile by username
@@ -184,29 +367,8 @@ def get_user_by_username(username: str) -> Optional[Dict]:
         User profile dict
     """
     try:
-        client = get_x_client()
-        
-        user = client.get_user(
-            username=username,
-            user_fields=['description', 'public_metrics', 'verified', 'created_at']
-        )
-        
-        if not user.data:
-            return None
-        
-        u = user.data
-        return {
-            'user_id': u.id,
-            'username': u.username,
-            'name': u.name,
-            'bio': u.description or "",
-            'followers': u.public_metrics.get('followers_count', 0),
-            'following': u.public_metrics.get('following_count', 0),
-            'verified': u.verified or False,
-            'account_created': str(u.created_at)
-        }
+        return get_users_by_usernames([username]).get(username.lstrip('@').lower())
         
     except Exception as e:
         print(f"⚠️ Error fetching user {username}: {e}")
         return None
-
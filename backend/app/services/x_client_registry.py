@@ -0,0 +1,164 @@
+"""
+X Client Registry - Shared, long-lived X API v2 clients
+
+Every X call site gets its tweepy.Client from here. Clients are cached per
+credential set and share one pooled HTTP session, whose response hook feeds
+the x-rate-limit-* headers of every call into a process-wide tracker.
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import requests
+import tweepy
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connection pool size of the shared HTTP session
+HTTP_POOL_SIZE = int(os.getenv("X_HTTP_POOL_SIZE", "20"))
+
+# Override the X API host, e.g. http://localhost:8090 for app/simulators/fake_x_api.py
+X_API_BASE_URL = os.getenv("X_API_BASE_URL")
+X_API_DEFAULT_HOST = "https://api.twitter.com"
+
+_NUMERIC_SEGMENT = re.compile(r"/\d{3,}(?=/|$)")  # IDs, not the "/2" version prefix
+
+
+class RateLimitTracker:
+    """Thread-safe view of the latest x-rate-limit-* headers per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Dict] = {}
+
+    @staticmethod
+    def endpoint_key(method: str, url: str) -> str:
+        """"GET /2/users/123/tweets" -> "GET /2/users/:id/tweets" """
+        path = requests.utils.urlparse(url).path
+        return f"{method.upper()} {_NUMERIC_SEGMENT.sub('/:id', path)}"
+
+    def record(self, method: str, url: str, status_code: int, headers) -> None:
+        if "x-rate-limit-remaining" not in headers:
+            return
+        key = self.endpoint_key(method, url)
+        with self._lock:
+            entry = self._limits.setdefault(key, {"requests": 0, "throttled": 0})
+            entry["limit"] = int(headers.get("x-rate-limit-limit", 0))
+            entry["remaining"] = int(headers["x-rate-limit-remaining"])
+            entry["reset"] = int(headers.get("x-rate-limit-reset", 0))
+            entry["requests"] += 1
+            if status_code == 429:
+                entry["throttled"] += 1
+
+    def remaining(self, method: str, url: str) -> Optional[int]:
+        """Remaining calls in the current window, or None if unknown/expired"""
+        with self._lock:
+            entry = self._limits.get(self.endpoint_key(method, url))
+            if not entry or entry.get("reset", 0) < time.time():
+                return None
+            return entry["remaining"]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._limits.items()}
+
+
+rate_limits = RateLimitTracker()
+
+
+class _BaseURLSession(requests.Session):
+    """Session that sends requests for the default X host to X_API_BASE_URL instead"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(X_API_DEFAULT_HOST):
+            url = self.base_url + url[len(X_API_DEFAULT_HOST):]
+        return super().request(method, url, *args, **kwargs)
+
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_clients: Dict[Tuple, tweepy.Client] = {}
+
+
+def _record_rate_limit(response, *args, **kwargs):
+    rate_limits.record(response.request.method, response.url, response.status_code, response.headers)
+
+
+def get_http_session() -> requests.Session:
+    """The pooled HTTP session shared by all X clients"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = _BaseURLSession(X_API_BASE_URL) if X_API_BASE_URL else requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.hooks["response"].append(_record_rate_limit)
+            _session = session
+        return _session
+
+
+def _credentials_from_env() -> Dict[str, Optional[str]]:
+    return {
+        "bearer_token": os.getenv("X_BEARER_TOKEN"),
+        "consumer_key": os.getenv("X_CONSUMER_KEY"),
+        "consumer_secret": os.getenv("X_CONSUMER_SECRET"),
+        "access_token": os.getenv("X_ACCESS_TOKEN"),
+        "access_token_secret": os.getenv("X_ACCESS_TOKEN_SECRET"),
+    }
+
+
+def get_x_client(
+    require_bearer_token: bool = False,
+    wait_on_rate_limit: bool = True,
+    **credentials
+) -> tweepy.Client:
+    """
+    Get the shared X API v2 client for a credential set
+
+    Args:
+        require_bearer_token: Raise if no Bearer Token is configured (app-auth reads)
+        wait_on_rate_limit: Sleep through a 429 until the window resets; with False
+            the call raises tweepy.TooManyRequests instead
+        **credentials: Override bearer_token / consumer_key / consumer_secret /
+            access_token / access_token_secret (defaults come from the environment)
+
+    Returns:
+        A long-lived tweepy.Client using the pooled session
+    """
+    creds = {**_credentials_from_env(), **credentials}
+    if require_bearer_token and not creds["bearer_token"]:
+        raise ValueError("X_BEARER_TOKEN not found in environment variables")
+
+    key = (tuple(sorted(creds.items())), wait_on_rate_limit)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_http_session()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = tweepy.Client(**creds, wait_on_rate_limit=wait_on_rate_limit)
+            client.session = session
+            _clients[key] = client
+        return client
+
+
+def rate_limit_reset(error: tweepy.TooManyRequests) -> Optional[datetime]:
+    """When the window of a 429 response resets (from x-rate-limit-reset), if X said"""
+    reset = error.response.headers.get("x-rate-limit-reset") if error.response is not None else None
+    return datetime.utcfromtimestamp(int(reset)) if reset else None
+
+
+def get_rate_limit_status() -> Dict[str, Dict]:
+    """Latest rate-limit state for every X endpoint this process has called"""
+    return rate_limits.snapshot()
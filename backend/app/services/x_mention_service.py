@@ -3,24 +3,13 @@ X (Twitter) Mention Service
 
 Sends public tweet mentions to candidates instead of DMs
 """
-import os
+from typing import Dict, List, Optional
 import tweepy
-from typing import Dict, List
 from dotenv import load_dotenv
+from app.services.x_client_registry import get_x_client, rate_limit_reset
 
 load_dotenv()
 
-def get_x_client():
-    """Initialize X API v2 client"""
-    return tweepy.Client(
-        bearer_token=os.getenv("X_BEARER_TOKEN"),
-        consumer_key=os.getenv("X_CONSUMER_KEY"),
-        consumer_secret=os.getenv("X_CONSUMER_SECRET"),
-        access_token=os.getenv("X_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCESS_TOKEN_SECRET"),
-        wait_on_rate_limit=True
-    )
-
 def generate_mention_message(
     username: str,
     candidate_name: str,
@@ -62,7 +51,8 @@ def generate_mention_message(
 def send_mention_to_candidate(
     username: str,
     message: str,
-    dry_run: bool = True
+    dry_run: bool = True,
+    wait_on_rate_limit: bool = True
 ) -> Dict:
     """
     Send a public tweet mentioning a candidate
@@ -71,12 +61,15 @@ def send_mention_to_candidate(
         username: X username (without @)
         message: Tweet content
         dry_run: If True, don't actually send
+        wait_on_rate_limit: If False, return a rate-limited result on a 429
+            instead of sleeping until the window resets
         
     Returns:
         {
             "success": bool,
             "tweet_id": str or None,
-            "error": str or None
+            "error": str or None,
+            "retry_at": datetime or None (only when rate limited)
         }
     """
     
@@ -90,7 +83,7 @@ def send_mention_to_candidate(
         }
     
     try:
-        client = get_x_client()
+        client = get_x_client(wait_on_rate_limit=wait_on_rate_limit)
         
         # Send tweet
         response = client.create_tweet(text=message)
@@ -101,6 +94,15 @@ def send_mention_to_candidate(
             "error": None
         }
         
+    except tweepy.TooManyRequests as e:
+        return {
+            "success": False,
+            "tweet_id": None,
+            "error": f"Rate limited: {e}",
+            "rate_limited": True,
+            "retry_at": rate_limit_reset(e)
+        }
+        
     except Exception as e:
         return {
             "success": False,
@@ -112,63 +114,30 @@ def send_mentions_batch(
     candidates: List[Dict],
     job_title: str,
     job_link: str,
+    job_id: Optional[int] = None,
     dry_run: bool = True
 ) -> Dict:
     """
-    Send tweet mentions to a batch of candidates
+    Queue tweet mentions for a batch of candidates
+
+    The mentions are posted by the outreach outbox worker at the X
+    write-rate limit; per-candidate outcomes are recorded on the outbox rows.
     
     Args:
         candidates: List of candidate dicts with routing info
         job_title: Job title
         job_link: Link to job posting
+        job_id: Job the outreach belongs to (for deduplication and status)
         dry_run: If True, don't actually send
         
     Returns:
         {
-            "sent": int,
-            "failed": int,
-            "results": [...]
+            "queued": int,
+            "skipped": int,
+            "message_ids": [...]
         }
     """
+    # Imported here: the outbox imports this module for message generation and delivery
+    from app.services.outreach_outbox import enqueue_mentions
     
-    results = []
-    sent = 0
-    failed = 0
-    
-    for candidate in candidates:
-        # Skip rejected candidates
-        if candidate.get('recommendation') == 'reject':
-            continue
-        
-        username = candidate['username']
-        name = candidate.get('name', username)
-        recommendation = candidate.get('recommendation', 'interview')
-        
-        # Generate message
-        message = generate_mention_message(
-            username=username,
-            candidate_name=name.split()[0] if name else username,  # Use first name
-            job_title=job_title,
-            job_link=job_link,
-            recommendation=recommendation
-        )
-        
-        # Send tweet
-        result = send_mention_to_candidate(username, message, dry_run=dry_run)
-        result['username'] = username
-        result['recommendation'] = recommendation
-        result['message'] = message
-        
-        if result['success']:
-            sent += 1
-        else:
-            failed += 1
-        
-        results.append(result)
-    
-    return {
-        "sent": sent,
-        "failed": failed,
-        "results": results
-    }
-
+    return enqueue_mentions(candidates, job_title, job_link, job_id=job_id, dry_run=dry_run)
@@ -3,24 +3,14 @@ X (Twitter) Outreach Service
 
 Sends DMs to candidates about job opportunities
 """
-import os
+from typing import Dict, List, Optional
 import tweepy
-from typing import Dict, List
 from dotenv import load_dotenv
+from app.services.x_client_registry import get_x_client, rate_limit_reset
+from app.services.x_user_resolver import resolve_user_ids
 
 load_dotenv()
 
-def get_x_client():
-    """Initialize X API v2 client for DMs"""
-    return tweepy.Client(
-        bearer_token=os.getenv("X_BEARER_TOKEN"),
-        consumer_key=os.getenv("X_CONSUMER_KEY"),
-        consumer_secret=os.getenv("X_CONSUMER_SECRET"),
-        access_token=os.getenv("X_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCESS_TOKEN_SECRET"),
-        wait_on_rate_limit=True
-    )
-
 def generate_outreach_message(
     candidate_name: str,
     job_title: str,
@@ -80,7 +70,9 @@ Let me know if you're interested!"""
 def send_dm_to_candidate(
     username: str,
     message: str,
-    dry_run: bool = True
+    dry_run: bool = True,
+    user_id: Optional[str] = None,
+    wait_on_rate_limit: bool = True
 ) -> Dict:
     """
     Send a DM to a candidate on X
@@ -89,12 +81,16 @@ def send_dm_to_candidate(
         username: X username (without @)
         message: Message content
         dry_run: If True, don't actually send (for testing)
+        user_id: Pre-resolved X user ID (resolved via the cache if omitted)
+        wait_on_rate_limit: If False, return a rate-limited result on a 429
+            instead of sleeping until the window resets
         
     Returns:
         {
             "success": bool,
             "message_id": str or None,
-            "error": str or None
+            "error": str or None,
+            "retry_at": datetime or None (only when rate limited)
         }
     """
     
@@ -109,19 +105,18 @@ def send_dm_to_candidate(
         }
     
     try:
-        client = get_x_client()
+        client = get_x_client(wait_on_rate_limit=wait_on_rate_limit)
         
-        # Get user ID from username
-        user = client.get_user(username=username)
-        if not user.data:
+        # Get user ID from username (cached after the first lookup)
+        if not user_id:
+            user_id = resolve_user_ids([username]).get(username.lower())
+        if not user_id:
             return {
                 "success": False,
                 "message_id": None,
                 "error": f"User @{username} not found"
             }
         
-        user_id = user.data.id
-        
         # Send DM
         # Note: This requires DM permissions in your X API app
         response = client.create_direct_message(
@@ -135,6 +130,15 @@ def send_dm_to_candidate(
             "error": None
         }
         
+    except tweepy.TooManyRequests as e:
+        return {
+            "success": False,
+            "message_id": None,
+            "error": f"Rate limited: {e}",
+            "rate_limited": True,
+            "retry_at": rate_limit_reset(e)
+        }
+        
     except Exception as e:
         return {
             "success": False,
@@ -146,63 +150,30 @@ def send_outreach_batch(
     candidates: List[Dict],
     job_title: str,
     job_link: str,
+    job_id: Optional[int] = None,
     dry_run: bool = True
 ) -> Dict:
     """
-    Send outreach messages to a batch of candidates
+    Queue outreach DMs for a batch of candidates
+
+    The messages are delivered by the outreach outbox worker at the X
+    write-rate limit; per-candidate outcomes are recorded on the outbox rows.
     
     Args:
         candidates: List of candidate dicts with routing info
         job_title: Job title
         job_link: Link to job posting
+        job_id: Job the outreach belongs to (for deduplication and status)
         dry_run: If True, don't actually send
         
     Returns:
         {
-            "sent": int,
-            "failed": int,
-            "results": [...]
+            "queued": int,
+            "skipped": int,
+            "message_ids": [...]
         }
     """
+    # Imported here: the outbox imports this module for message generation and delivery
+    from app.services.outreach_outbox import enqueue_dms
     
-    results = []
-    sent = 0
-    failed = 0
-    
-    for candidate in candidates:
-        # Skip rejected candidates
-        if candidate.get('recommendation') == 'reject':
-            continue
-        
-        username = candidate['username']
-        name = candidate.get('name', username)
-        recommendation = candidate.get('recommendation', 'interview')
-        score = candidate.get('compatibility', {}).get('compatibility_score', 0)
-        
-        # Generate message
-        message = generate_outreach_message(
-            candidate_name=name,
-            job_title=job_title,
-            job_link=job_link,
-            recommendation=recommendation,
-            compatibility_score=score
-        )
-        
-        # Send DM
-        result = send_dm_to_candidate(username, message, dry_run=dry_run)
-        result['username'] = username
-        result['recommendation'] = recommendation
-        
-        if result['success']:
-            sent += 1
-        else:
-            failed += 1
-        
-        results.append(result)
-    
-    return {
-        "sent": sent,
-        "failed": failed,
-        "results": results
-    }
-
+    return enqueue_dms(candidates, job_title, job_link, job_id=job_id, dry_run=dry_run)
@@ -0,0 +1,114 @@
+"""
+X Search Query Planner
+
+Step 2 produces several topics and search queries, and each one used to
+cost its own rate-limited search request. The planner:
+1. Merges terms into as few OR-combined queries as fit the query-length limit
+2. Appends standard noise filters (-is:retweet lang:en)
+3. Attributes returned tweets back to the original terms locally
+4. Drops terms already covered by a query that has been run
+"""
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# X recent search query length limit (512 on Basic/Pro, 1024 on Enterprise)
+MAX_QUERY_LENGTH = int(os.getenv("X_QUERY_MAX_LENGTH", "512"))
+
+# Appended to every planned query
+NOISE_FILTERS = os.getenv("X_QUERY_FILTERS", "-is:retweet lang:en")
+
+# Characters with operator meaning in X queries are stripped from terms
+_OPERATOR_CHARS = re.compile(r'["()\[\]{}:]')
+_TOKEN = re.compile(r"[#@]?[\w+.-]+")
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase, strip operator characters and collapse whitespace"""
+    return " ".join(_OPERATOR_CHARS.sub(" ", term).lower().split())
+
+
+def term_tokens(term: str) -> FrozenSet[str]:
+    """Token set X matches a plain term against (all tokens must appear)"""
+    return frozenset(t.lstrip("#@").strip(".-") for t in _TOKEN.findall(normalize_term(term)) if t.strip(".-#@"))
+
+
+def _clause(term: str) -> str:
+    return f"({term})" if " " in term else term
+
+
+def _build_query(terms: List[str], filters: str) -> str:
+    query = " OR ".join(_clause(t) for t in terms)
+    if len(terms) > 1:
+        query = f"({query})"
+    return f"{query} {filters}".strip()
+
+
+def _is_covered(tokens: FrozenSet[str], by: Iterable[FrozenSet[str]]) -> bool:
+    """A term is covered if a broader term (subset of its tokens) already matches it"""
+    return any(other <= tokens for other in by)
+
+
+def plan_queries(
+    terms: List[str],
+    already_run: Optional[Set[FrozenSet[str]]] = None,
+    max_length: int = MAX_QUERY_LENGTH,
+    filters: str = NOISE_FILTERS
+) -> List[Dict]:
+    """
+    Pack search terms into as few OR-combined X queries as fit the length limit
+
+    Args:
+        terms: Topics and search queries, highest priority first
+        already_run: Token sets of terms already searched; covered terms are dropped
+            and the planned terms are added to it
+        max_length: Maximum query length in characters
+        filters: Noise filters appended to every query
+
+    Returns:
+        [{"query": "(a OR (b c)) -is:retweet lang:en", "terms": ["a", "b c"]}, ...]
+    """
+    already_run = already_run if already_run is not None else set()
+
+    # Dedupe and drop terms that an executed or broader term already covers
+    candidates = []
+    for term in terms:
+        normalized = normalize_term(term)
+        tokens = term_tokens(normalized)
+        if not tokens or _is_covered(tokens, already_run):
+            continue
+        if any(tokens == t for _, t in candidates):
+            continue
+        candidates.append((normalized, tokens))
+
+    kept = [
+        (term, tokens) for term, tokens in candidates
+        if not _is_covered(tokens, (t for other, t in candidates if t < tokens))
+    ]
+
+    planned: List[Dict] = []
+    current: List[str] = []
+    for term, tokens in kept:
+        if current and len(_build_query(current + [term], filters)) > max_length:
+            planned.append({"query": _build_query(current, filters), "terms": current})
+            current = []
+        current.append(term)
+        already_run.add(tokens)
+    if current:
+        planned.append({"query": _build_query(current, filters), "terms": current})
+
+    return planned
+
+
+def attribute_tweet(text: str, terms: List[str]) -> List[str]:
+    """
+    Map a tweet returned by a merged query back to the terms it matches
+
+    Falls back to the term with the largest token overlap when no term
+    matches fully (X also matches on URLs and expanded entities).
+    """
+    tokens = term_tokens(text)
+    matched = [term for term in terms if term_tokens(term) <= tokens]
+    if matched or not terms:
+        return matched
+    return [max(terms, key=lambda term: len(term_tokens(term) & tokens))]
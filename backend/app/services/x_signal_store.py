@@ -0,0 +1,382 @@
+"""
+X Signal Store - Persisted behavioral signals with incremental refresh
+
+Signals discovered in Step 3 are bulk-inserted into XSignal, and every
+author is tracked in XUser with the newest tweet ID we hold (since_id).
+Refreshing a known user only asks X for tweets newer than that ID, so the
+monthly read quota is spent on new posts instead of re-fetching old ones.
+"""
+import os
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Iterable, Tuple
+from sqlalchemy import BigInteger, case, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from app.db.database import engine
+from app.models.schemas import XSignal, XUser, Candidate
+from app.services.x_api_service import search_recent_tweets_page, signal_from_tweet
+from app.services.x_query_planner import MAX_QUERY_LENGTH
+from app.utils.logger import AgentLogger
+
+# Freshness TTL: a known user is re-crawled at most once per TTL
+SIGNAL_TTL_HOURS = float(os.getenv("X_SIGNAL_TTL_HOURS", "24"))
+
+# Page cap per refresh query, keeps a single refresh bounded
+MAX_REFRESH_PAGES = 5
+
+# Rows per multi-row INSERT
+SIGNAL_INSERT_BATCH_SIZE = 500
+
+# Recent search only covers the last 7 days and rejects an older since_id;
+# the margin keeps a query built now valid when X receives it
+RECENT_SEARCH_WINDOW = timedelta(days=7)
+RECENT_SEARCH_MARGIN = timedelta(minutes=5)
+
+# Tweet IDs are snowflakes: milliseconds since this epoch, shifted left 22 bits
+SNOWFLAKE_EPOCH_MS = 1288834974657
+
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _normalize_username(username: str) -> str:
+    return username.lstrip("@").lower()
+
+
+def _newer_tweet_id(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    """Return the larger of two tweet IDs (snowflake IDs grow over time)"""
+    if not a:
+        return b
+    if not b:
+        return a
+    return a if int(a) >= int(b) else b
+
+
+def _tweet_id_time(tweet_id: str) -> datetime:
+    """When a tweet was posted, read from its snowflake ID"""
+    return datetime.utcfromtimestamp(((int(tweet_id) >> 22) + SNOWFLAKE_EPOCH_MS) / 1000)
+
+
+def _chunks(rows: List, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _newer_since_id(stored, incoming):
+    """SQL form of _newer_tweet_id, so concurrent upserts never move since_id back"""
+    return case(
+        (stored.is_(None), incoming),
+        (incoming.is_(None), stored),
+        (cast(incoming, BigInteger) > cast(stored, BigInteger), incoming),
+        else_=stored
+    )
+
+
+def persist_signals(
+    users: List[Dict],
+    job_id: Optional[int] = None,
+    ttl_hours: Optional[float] = None,
+    advance_crawl: bool = True
+) -> Dict:
+    """
+    Bulk-insert the signals of Step 3 users and advance their crawl state
+
+    Signals already stored (same tweet_id) are skipped and known users are
+    upserted by username, so re-running a search, or two pipelines storing
+    the same users at once, never duplicates rows.
+
+    Args:
+        users: User dicts from discover_users_from_topics / stream_users_from_queries
+        job_id: Sourcing job that found the signals
+        ttl_hours: Freshness TTL for next_crawl_at (defaults to X_SIGNAL_TTL_HOURS)
+        advance_crawl: Move since_id and next_crawl_at forward; pass False when
+            the users' tweets were only partly fetched, so they stay due
+
+    Returns:
+        {"signals_inserted": int, "users_tracked": int}
+    """
+    if not users:
+        return {"signals_inserted": 0, "users_tracked": 0}
+
+    insert = _DIALECT_INSERTS[engine.dialect.name]
+    ttl = timedelta(hours=ttl_hours if ttl_hours is not None else SIGNAL_TTL_HOURS)
+    now = datetime.utcnow()
+
+    by_username = {_normalize_username(u['username']): u for u in users}
+    handles = [f"@{u['username']}" for u in users]
+
+    with Session(engine) as session:
+        candidate_ids = dict(session.exec(
+            select(Candidate.x_handle, Candidate.id).where(Candidate.x_handle.in_(handles))
+        ).all())
+
+        signal_rows = []
+        user_rows = []
+        batch_tweets = set()
+        for username, user in by_username.items():
+            handle = f"@{user['username']}"
+            newest = None
+
+            for signal in user.get('signals', []):
+                tweet_id = signal.get('tweet_id')
+                newest = _newer_tweet_id(newest, tweet_id)
+                if tweet_id and tweet_id in batch_tweets:
+                    continue
+                if tweet_id:
+                    batch_tweets.add(tweet_id)
+
+                signal_rows.append({
+                    "candidate_id": candidate_ids.get(handle),
+                    "x_handle": handle,
+                    "post_text": signal.get('text'),
+                    "engagement_type": signal.get('type', 'post'),
+                    "topic": signal.get('topic', ''),
+                    "timestamp": now,
+                    "tweet_id": tweet_id,
+                    "x_user_id": user.get('user_id'),
+                    "job_id": job_id,
+                    "engagement": signal.get('engagement'),
+                    "posted_at": signal.get('created_at')
+                })
+
+            row = {"username": username, "user_id": user.get('user_id'), "created_at": now, "updated_at": now}
+            if advance_crawl:
+                row.update(since_id=newest, last_crawled_at=now, next_crawl_at=now + ttl)
+            user_rows.append(row)
+
+        # Signals stored by this or a concurrent run (same tweet_id) are skipped
+        inserted = 0
+        for chunk in _chunks(signal_rows, SIGNAL_INSERT_BATCH_SIZE):
+            result = session.execute(
+                insert(XSignal).values(chunk).on_conflict_do_nothing(
+                    index_elements=["tweet_id"],
+                    index_where=XSignal.tweet_id.is_not(None)
+                )
+            )
+            inserted += result.rowcount
+
+        for chunk in _chunks(user_rows, SIGNAL_INSERT_BATCH_SIZE):
+            statement = insert(XUser).values(chunk)
+            updates = {
+                "user_id": func.coalesce(statement.excluded.user_id, XUser.user_id),
+                "updated_at": statement.excluded.updated_at
+            }
+            if advance_crawl:
+                updates.update(
+                    since_id=_newer_since_id(XUser.since_id, statement.excluded.since_id),
+                    last_crawled_at=statement.excluded.last_crawled_at,
+                    next_crawl_at=statement.excluded.next_crawl_at
+                )
+            session.execute(statement.on_conflict_do_update(index_elements=["username"], set_=updates))
+
+        session.commit()
+
+    return {"signals_inserted": inserted, "users_tracked": len(by_username)}
+
+
+def link_signals_to_candidates(handle_to_candidate_id: Dict[str, int]) -> int:
+    """
+    Attach orphan signals to candidates once they have been saved
+
+    Args:
+        handle_to_candidate_id: {"@username": candidate_id}
+
+    Returns:
+        Number of signals linked
+    """
+    if not handle_to_candidate_id:
+        return 0
+
+    linked = 0
+    with Session(engine) as session:
+        signals = session.exec(
+            select(XSignal).where(
+                XSignal.x_handle.in_(list(handle_to_candidate_id)),
+                XSignal.candidate_id.is_(None)
+            )
+        ).all()
+        for signal in signals:
+            signal.candidate_id = handle_to_candidate_id[signal.x_handle]
+            linked += 1
+        session.commit()
+    return linked
+
+
+def get_users_due_for_refresh(limit: int = 500, now: Optional[datetime] = None) -> List[XUser]:
+    """Known users whose freshness TTL has expired, stalest first"""
+    now = now or datetime.utcnow()
+    with Session(engine) as session:
+        return list(session.exec(
+            select(XUser)
+            .where(XUser.since_id.is_not(None), XUser.next_crawl_at <= now)
+            .order_by(XUser.next_crawl_at)
+            .limit(limit)
+        ).all())
+
+
+def _build_from_queries(usernames: Iterable[str], max_length: int = MAX_QUERY_LENGTH) -> List[List[str]]:
+    """Pack usernames into groups whose "(from:a OR from:b) -is:retweet" query fits the limit"""
+    suffix = " -is:retweet"
+    groups: List[List[str]] = []
+    current: List[str] = []
+    for username in usernames:
+        candidate = current + [username]
+        query = "(" + " OR ".join(f"from:{u}" for u in candidate) + ")" + suffix
+        if current and len(query) > max_length:
+            groups.append(current)
+            current = [username]
+        else:
+            current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _plan_refresh_queries(
+    since_ids: Dict[str, str],
+    now: datetime,
+    max_length: int = MAX_QUERY_LENGTH
+) -> List[Tuple[List[str], Optional[str], Optional[datetime]]]:
+    """
+    Group users into refresh queries: [(usernames, since_id, start_time)]
+
+    Users whose since_id is still inside the recent search window are packed
+    in since_id order, so each query's oldest since_id is close to the rest of
+    its group. Users whose since_id has aged out (quiet accounts) are queried
+    together from the start of the window instead; X would reject their ID.
+    """
+    window_start = now - RECENT_SEARCH_WINDOW + RECENT_SEARCH_MARGIN
+    ordered = sorted(since_ids, key=lambda u: int(since_ids[u]))
+    aged_out = [u for u in ordered if _tweet_id_time(since_ids[u]) < window_start]
+    recent = [u for u in ordered if _tweet_id_time(since_ids[u]) >= window_start]
+
+    plans = [(group, None, window_start) for group in _build_from_queries(aged_out, max_length)]
+    plans += [(group, since_ids[group[0]], None) for group in _build_from_queries(recent, max_length)]
+    return plans
+
+
+def refresh_known_users(
+    usernames: Optional[List[str]] = None,
+    force: bool = False,
+    limit: int = 500,
+    ttl_hours: Optional[float] = None
+) -> Dict:
+    """
+    Fetch only tweets newer than each known user's stored since_id
+
+    Users are packed into as few "from:" queries as fit the query-length
+    limit, grouped by since_id age. Each query uses the oldest since_id in its
+    group (or the start of the 7-day search window once that ID has aged out)
+    and newer tweets are filtered per user locally. A group whose pagination
+    stops early (page cap or API error) keeps its since_id and stays due, so
+    the tweets it didn't reach are fetched next time.
+
+    Args:
+        usernames: Users to refresh (defaults to everyone due for refresh)
+        force: Refresh the given users even if their TTL has not expired
+        limit: Maximum users to refresh in one call
+        ttl_hours: Freshness TTL for next_crawl_at
+
+    Returns:
+        {"users_refreshed": int, "users_incomplete": int, "queries": int, "signals_inserted": int}
+    """
+    now = datetime.utcnow()
+
+    if usernames is None:
+        due = get_users_due_for_refresh(limit=limit, now=now)
+    else:
+        with Session(engine) as session:
+            query = select(XUser).where(
+                XUser.username.in_([_normalize_username(u) for u in usernames]),
+                XUser.since_id.is_not(None)
+            )
+            if not force:
+                query = query.where(XUser.next_crawl_at <= now)
+            due = list(session.exec(query.limit(limit)).all())
+
+    if not due:
+        return {"users_refreshed": 0, "users_incomplete": 0, "queries": 0, "signals_inserted": 0}
+
+    since_ids = {xu.username: xu.since_id for xu in due}
+    collected: Dict[str, Dict] = {}
+    incomplete = set()
+    query_count = 0
+
+    for group, group_since_id, start_time in _plan_refresh_queries(since_ids, now):
+        query = "(" + " OR ".join(f"from:{u}" for u in group) + ") -is:retweet"
+        next_token = None
+        finished = False
+
+        for _ in range(MAX_REFRESH_PAGES):
+            try:
+                tweets, next_token = search_recent_tweets_page(
+                    query, max_results=100, next_token=next_token,
+                    since_id=group_since_id, start_time=start_time
+                )
+            except Exception as e:
+                print(f"⚠️ X API error during signal refresh: {e}")
+                break
+            query_count += 1
+
+            for tweet in tweets:
+                username = tweet['username'].lower()
+                # The query used the oldest since_id of the group
+                if username not in since_ids or int(tweet['tweet_id']) <= int(since_ids[username]):
+                    continue
+                user = collected.setdefault(username, {
+                    'username': tweet['username'],
+                    'user_id': str(tweet['user_id']),
+                    'signals': []
+                })
+                user['signals'].append(signal_from_tweet(tweet, "refresh"))
+
+            if not next_token:
+                finished = True
+                break
+
+        if not finished:
+            incomplete.update(group)
+
+    # Users without new tweets still count as crawled
+    for xu in due:
+        collected.setdefault(xu.username, {'username': xu.username, 'user_id': xu.user_id, 'signals': []})
+
+    complete = [user for username, user in collected.items() if username not in incomplete]
+    partial = [user for username, user in collected.items() if username in incomplete]
+    inserted = persist_signals(complete, ttl_hours=ttl_hours)['signals_inserted']
+    # Keep what the truncated groups fetched; tweet_id dedupe skips it on the retry
+    inserted += persist_signals(partial, advance_crawl=False)['signals_inserted']
+    refreshed = len(due) - len(incomplete)
+
+    AgentLogger.log_search(
+        f"Refreshed {refreshed} known X users with {query_count} search requests: {inserted} new signals"
+        + (f" ({len(incomplete)} left due after an incomplete fetch)" if incomplete else ""),
+        users_refreshed=refreshed,
+        users_incomplete=len(incomplete),
+        queries=query_count,
+        signals_inserted=inserted
+    )
+
+    return {
+        "users_refreshed": refreshed,
+        "users_incomplete": len(incomplete),
+        "queries": query_count,
+        "signals_inserted": inserted
+    }
+
+
+async def run_recrawl_scheduler(interval_seconds: float, batch_size: int = 500):
+    """
+    Periodically refresh users whose freshness TTL has expired
+
+    Runs until cancelled. Each tick refreshes at most batch_size users.
+    """
+    print(f"🔁 X signal recrawl scheduler started (every {interval_seconds:.0f}s)")
+    while True:
+        try:
+            result = await asyncio.to_thread(refresh_known_users, None, False, batch_size)
+            if result['users_refreshed']:
+                print(f"🔁 Recrawled {result['users_refreshed']} X users, {result['signals_inserted']} new signals")
+        except Exception as e:
+            AgentLogger.log_error("X signal recrawl failed", error=e)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,90 @@
+"""
+X User Resolver - Batched username → user ID resolution
+
+DMs and other write endpoints need numeric user IDs. Mappings are cached
+persistently in XUser (also filled by Step 3 searches), and cache misses
+are resolved with the multi-user lookup endpoint, 100 usernames per call.
+"""
+from datetime import datetime
+from typing import Dict, List
+import tweepy
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+from app.db.database import engine
+from app.models.schemas import XUser
+from app.services.x_api_service import get_users_by_usernames
+
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _normalize_username(username: str) -> str:
+    return username.lstrip("@").lower()
+
+
+def get_cached_user_ids(usernames: List[str]) -> Dict[str, str]:
+    """Return the cached {lowercase_username: user_id} mappings"""
+    names = list({_normalize_username(u) for u in usernames if u})
+    if not names:
+        return {}
+
+    with Session(engine) as session:
+        rows = session.exec(
+            select(XUser.username, XUser.user_id).where(
+                XUser.username.in_(names),
+                XUser.user_id.is_not(None)
+            )
+        ).all()
+    return {username: user_id for username, user_id in rows}
+
+
+def cache_user_ids(mappings: Dict[str, str]) -> None:
+    """Persist {username: user_id} mappings into XUser"""
+    if not mappings:
+        return
+
+    now = datetime.utcnow()
+    mappings = {_normalize_username(u): str(uid) for u, uid in mappings.items()}
+
+    rows = [
+        {"username": username, "user_id": user_id, "created_at": now, "updated_at": now}
+        for username, user_id in mappings.items()
+    ]
+    insert = _DIALECT_INSERTS[engine.dialect.name]
+    with Session(engine) as session:
+        statement = insert(XUser).values(rows)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["username"],
+            set_={"user_id": statement.excluded.user_id, "updated_at": statement.excluded.updated_at}
+        ))
+        session.commit()
+
+
+def resolve_user_ids(usernames: List[str], wait_on_rate_limit: bool = True) -> Dict[str, str]:
+    """
+    Resolve usernames to X user IDs, hitting the API only for cache misses
+
+    Args:
+        usernames: X usernames (with or without @)
+        wait_on_rate_limit: If False, a rate-limited lookup raises
+            tweepy.TooManyRequests instead of sleeping until the window resets
+
+    Returns:
+        {lowercase_username: user_id} - users that could not be found are omitted
+    """
+    resolved = get_cached_user_ids(usernames)
+    missing = [u for u in {_normalize_username(u) for u in usernames if u} if u not in resolved]
+
+    if missing:
+        try:
+            profiles = get_users_by_usernames(missing, wait_on_rate_limit=wait_on_rate_limit)
+        except tweepy.TooManyRequests:
+            raise
+        except Exception as e:
+            print(f"⚠️ X user lookup failed for {len(missing)} users: {e}")
+            profiles = {}
+
+        fetched = {username: str(profile['user_id']) for username, profile in profiles.items()}
+        cache_user_ids(fetched)
+        resolved.update(fetched)
+
+    return resolved
@@ -0,0 +1,419 @@
+"""
+Fake X API v2 Server for offline load tests
+
+Serves a synthetic, deterministic corpus of users and tweets with the
+same response shapes, pagination and x-rate-limit-* semantics as X API v2:
+- GET  /2/tweets/search/recent            (expansions=author_id, next_token, since_id)
+- GET  /2/users/by                        (multi-user lookup, up to 100 usernames)
+- GET  /2/users/by/username/{username}
+- POST /2/tweets                          (tweet create)
+- POST /2/dm_conversations/with/{id}/messages  (DM create)
+
+Nothing is materialized: users and tweets are derived from their index on
+demand, so the corpus can hold millions of users in constant memory.
+
+Run:
+    python -m app.simulators.fake_x_api --users 1000000 --port 8090
+
+Then point the backend at it:
+    X_API_BASE_URL=http://localhost:8090
+"""
+import argparse
+import base64
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# ========================================
+# SYNTHETIC CORPUS
+# ========================================
+
+SUBJECTS = [
+    "llm inference", "machine learning", "python programming", "backend engineering",
+    "distributed training", "pytorch", "transformer models", "cuda kernels",
+    "kubernetes", "react", "rust", "golang", "postgres", "api design",
+    "frontend performance", "data pipelines", "mlops", "gpu clusters",
+    "distributed systems", "typescript"
+]
+ACTIVITIES = [
+    "optimization", "performance tuning", "tips", "setup", "debugging",
+    "at scale", "best practices", "benchmarks"
+]
+TOPICS = [f"{subject} {activity}" for subject in SUBJECTS for activity in ACTIVITIES]
+
+OPENERS = ["Spent the day on", "Hot take on", "Finally shipped", "Thread on", "Notes from", "Learning about"]
+CLOSERS = ["🚀", "— thoughts?", "#buildinpublic", "link in bio", "PRs welcome", ""]
+
+FIRST_NAMES = ["Sarah", "Alex", "Maya", "Carlos", "Aisha", "Wei", "Priya", "Liam", "Noah", "Emma", "Kenji", "Sofia"]
+LAST_NAMES = ["Chen", "Rivera", "Patel", "Rodriguez", "Kim", "Nguyen", "Smith", "Garcia", "Okafor", "Müller"]
+HANDLE_WORDS = ["dev", "ml", "code", "infra", "data", "rust", "py", "ops", "gpu", "web"]
+
+DEVELOPER_BIOS = [
+    "ML engineer building LLM inference systems. PyTorch, CUDA.",
+    "Backend engineer. Python, Go, Postgres. Opinions are my own.",
+    "Frontend dev, React + TypeScript. Building design systems.",
+    "SRE / infra. Kubernetes, Terraform, on-call survivor.",
+    "Systems programmer. Rust, distributed systems, performance.",
+    "Full stack engineer shipping side projects on GitHub."
+]
+NOISE_BIOS = [
+    "Daily tech news and headlines. Follow for updates!",
+    "Growth marketing | SaaS | DM for collabs",
+    "Automated feed of trending AI articles",
+    ""
+]
+
+TOKEN = re.compile(r"[\w+.-]+")
+
+
+def _mix(n: int) -> int:
+    """Cheap deterministic integer hash"""
+    n = (n ^ 61) ^ (n >> 16)
+    n = (n * 9) & 0xFFFFFFFF
+    n = n ^ (n >> 4)
+    n = (n * 0x27D4EB2D) & 0xFFFFFFFF
+    return n ^ (n >> 15)
+
+
+def _tokens(text: str) -> FrozenSet[str]:
+    return frozenset(TOKEN.findall(text.lower()))
+
+
+TOPIC_TOKENS = [_tokens(topic) for topic in TOPICS]
+TWEET_ID_BASE = 1_700_000_000_000_000_000
+
+
+class Corpus:
+    """
+    Deterministic corpus of `users` users with `tweets_per_user` tweets each
+
+    Tweets are laid out in blocks of one tweet per user: tweet j is in block
+    j // users, authored by user j % users, about topic
+    (block + user) % len(TOPICS). Higher j means newer, so search walks j
+    downwards.
+    """
+
+    def __init__(self, users: int, tweets_per_user: int, window_days: float = 7.0):
+        self.users = users
+        self.tweets_per_user = tweets_per_user
+        self.total = users * tweets_per_user
+        self.end_time = datetime.utcnow()
+        self.spacing = timedelta(days=window_days) / max(self.total, 1)
+        self.created_tweets = 0
+
+    # ---- users ----
+
+    def username(self, i: int) -> str:
+        h = _mix(i)
+        return f"{HANDLE_WORDS[h % len(HANDLE_WORDS)]}_{HANDLE_WORDS[(h >> 8) % len(HANDLE_WORDS)]}_{i}"
+
+    def user_index(self, username: str) -> Optional[int]:
+        suffix = username.rsplit("_", 1)[-1]
+        if not suffix.isdigit():
+            return None
+        i = int(suffix)
+        if i >= self.users or self.username(i).lower() != username.lower():
+            return None
+        return i
+
+    def user(self, i: int) -> Dict:
+        h = _mix(i + 7919)
+        is_noise = h % 5 == 0
+        bios = NOISE_BIOS if is_noise else DEVELOPER_BIOS
+        followers = (h >> 4) % 50_000 if not is_noise else 100_000 + (h >> 4) % 900_000
+        return {
+            "id": str(i + 1),
+            "username": self.username(i),
+            "name": f"{FIRST_NAMES[h % len(FIRST_NAMES)]} {LAST_NAMES[(h >> 5) % len(LAST_NAMES)]}",
+            "description": bios[(h >> 3) % len(bios)],
+            "verified": h % 97 == 0,
+            "created_at": "2015-01-01T00:00:00.000Z",
+            "public_metrics": {
+                "followers_count": followers,
+                "following_count": (h >> 12) % 2_000 if not is_noise else 5,
+                "tweet_count": self.tweets_per_user,
+                "listed_count": (h >> 20) % 50
+            }
+        }
+
+    # ---- tweets ----
+
+    def topic_of(self, j: int) -> int:
+        return (j // self.users + j % self.users) % len(TOPICS)
+
+    def tweet(self, j: int) -> Dict:
+        h = _mix(j)
+        created_at = self.end_time - self.spacing * (self.total - 1 - j)
+        return {
+            "id": str(TWEET_ID_BASE + j),
+            "text": f"{OPENERS[h % len(OPENERS)]} {TOPICS[self.topic_of(j)]} {CLOSERS[(h >> 3) % len(CLOSERS)]}".strip(),
+            "author_id": str(j % self.users + 1),
+            "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "public_metrics": {
+                "retweet_count": (h >> 6) % 20,
+                "reply_count": (h >> 11) % 10,
+                "like_count": (h >> 15) % 200,
+                "quote_count": 0
+            }
+        }
+
+    def search(
+        self,
+        topics: Optional[set],
+        authors: Optional[List[int]],
+        start: int,
+        limit: int,
+        since_j: int
+    ) -> Tuple[List[int], Optional[int]]:
+        """
+        Walk tweets from index `start` downwards
+
+        Returns matching tweet indexes and the index to resume from (None when exhausted).
+        """
+        results: List[int] = []
+        if topics is not None and not topics:
+            return results, None
+
+        j = start
+        if authors is None:
+            # Every run of len(TOPICS) consecutive tweets covers every topic,
+            # so a match is never more than len(TOPICS) steps away
+            while j > since_j and j >= 0:
+                if topics is None or self.topic_of(j) in topics:
+                    results.append(j)
+                    if len(results) == limit:
+                        return results, j - 1
+                j -= 1
+            return results, None
+
+        authors_desc = sorted(set(authors), reverse=True)
+        while j > since_j and j >= 0:
+            block_start = (j // self.users) * self.users
+            for u in authors_desc:
+                candidate = block_start + u
+                if candidate > j:
+                    continue
+                if candidate <= since_j:
+                    break
+                if topics is None or self.topic_of(candidate) in topics:
+                    results.append(candidate)
+                    if len(results) == limit:
+                        return results, candidate - 1
+            j = block_start - 1
+
+        return results, None
+
+
+# ========================================
+# QUERY PARSING
+# ========================================
+
+FROM_OPERATOR = re.compile(r"from:(\w+)", re.IGNORECASE)
+OTHER_OPERATOR = re.compile(r"-?\w+:\S+")
+
+
+def parse_query(query: str, corpus: Corpus) -> Tuple[Optional[set], Optional[List[int]]]:
+    """Resolve a query into (matching topic indexes, author indexes). None means unrestricted."""
+    authors = None
+    from_names = FROM_OPERATOR.findall(query)
+    if from_names:
+        authors = [i for i in (corpus.user_index(name) for name in from_names) if i is not None]
+
+    remainder = OTHER_OPERATOR.sub(" ", FROM_OPERATOR.sub(" ", query))
+    remainder = remainder.replace("(", " ").replace(")", " ")
+    terms = [_tokens(term) for term in re.split(r"\bOR\b", remainder)]
+    terms = [term for term in terms if term]
+
+    topics = None
+    if terms:
+        topics = {p for p, topic_tokens in enumerate(TOPIC_TOKENS) if any(term <= topic_tokens for term in terms)}
+    return topics, authors
+
+
+# ========================================
+# RATE LIMITS
+# ========================================
+
+DEFAULT_LIMITS = {
+    "search": 450,
+    "users_lookup": 300,
+    "tweet_create": 200,
+    "dm_create": 200
+}
+
+
+class RateLimiter:
+    """Fixed 15-minute windows per (endpoint, credential), like X API v2"""
+
+    def __init__(self, limits: Dict[str, int], window_seconds: int = 900):
+        self.limits = limits
+        self.window_seconds = window_seconds
+        self._windows: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def check(self, endpoint: str, credential: str) -> Tuple[bool, Dict[str, str]]:
+        now = int(time.time())
+        limit = self.limits[endpoint]
+        reset, used = self._windows.get((endpoint, credential), (now + self.window_seconds, 0))
+        if reset <= now:
+            reset, used = now + self.window_seconds, 0
+
+        allowed = used < limit
+        if allowed:
+            used += 1
+        self._windows[(endpoint, credential)] = (reset, used)
+
+        return allowed, {
+            "x-rate-limit-limit": str(limit),
+            "x-rate-limit-remaining": str(max(limit - used, 0)),
+            "x-rate-limit-reset": str(reset)
+        }
+
+
+# ========================================
+# APP
+# ========================================
+
+def create_app(
+    users: int = 100_000,
+    tweets_per_user: int = 20,
+    limits: Optional[Dict[str, int]] = None,
+    window_seconds: int = 900
+) -> FastAPI:
+    corpus = Corpus(users, tweets_per_user)
+    limiter = RateLimiter({**DEFAULT_LIMITS, **(limits or {})}, window_seconds)
+    app = FastAPI(title="Fake X API v2")
+    app.state.corpus = corpus
+    app.state.limiter = limiter
+
+    def limited(endpoint: str, request: Request, body: Dict, status_code: int = 200) -> JSONResponse:
+        credential = request.headers.get("authorization", "anonymous")
+        # OAuth 1.0a headers carry a fresh nonce per call, key on the token instead
+        token = re.search(r'oauth_token="([^"]+)"', credential)
+        allowed, headers = limiter.check(endpoint, token.group(1) if token else credential)
+        if not allowed:
+            return JSONResponse(
+                {"title": "Too Many Requests", "detail": "Too Many Requests", "type": "about:blank", "status": 429},
+                status_code=429,
+                headers=headers
+            )
+        return JSONResponse(body, status_code=status_code, headers=headers)
+
+    @app.get("/2/tweets/search/recent")
+    async def search_recent(
+        request: Request,
+        query: str,
+        max_results: int = 10,
+        next_token: Optional[str] = None,
+        since_id: Optional[str] = None,
+        expansions: Optional[str] = None
+    ):
+        if not 10 <= max_results <= 100:
+            return JSONResponse({"title": "Invalid Request", "detail": "max_results must be 10-100"}, status_code=400)
+        if len(query) > 512:
+            return JSONResponse({"title": "Invalid Request", "detail": "query exceeds 512 characters"}, status_code=400)
+
+        topics, authors = parse_query(query, corpus)
+        start = int(base64.urlsafe_b64decode(next_token).decode()) if next_token else corpus.total - 1
+        since_j = int(since_id) - TWEET_ID_BASE if since_id else -1
+
+        indexes, resume = corpus.search(topics, authors, start, max_results, since_j)
+        tweets = [corpus.tweet(j) for j in indexes]
+
+        body: Dict = {"meta": {"result_count": len(tweets)}}
+        if tweets:
+            body["data"] = tweets
+            body["meta"]["newest_id"] = tweets[0]["id"]
+            body["meta"]["oldest_id"] = tweets[-1]["id"]
+            if expansions and "author_id" in expansions:
+                author_ids = dict.fromkeys(j % corpus.users for j in indexes)
+                body["includes"] = {"users": [corpus.user(i) for i in author_ids]}
+        if resume is not None and resume > since_j:
+            body["meta"]["next_token"] = base64.urlsafe_b64encode(str(resume).encode()).decode()
+
+        return limited("search", request, body)
+
+    @app.get("/2/users/by")
+    async def users_by(request: Request, usernames: str):
+        names = [name for name in usernames.split(",") if name][:100]
+        data, errors = [], []
+        for name in names:
+            i = corpus.user_index(name)
+            if i is None:
+                errors.append({"value": name, "detail": f"Could not find user with usernames: [{name}].",
+                               "title": "Not Found Error", "resource_type": "user", "parameter": "usernames"})
+            else:
+                data.append(corpus.user(i))
+
+        body: Dict = {}
+        if data:
+            body["data"] = data
+        if errors:
+            body["errors"] = errors
+        return limited("users_lookup", request, body)
+
+    @app.get("/2/users/by/username/{username}")
+    async def user_by_username(request: Request, username: str):
+        i = corpus.user_index(username)
+        if i is None:
+            body = {"errors": [{"value": username, "detail": f"Could not find user with username: [{username}].",
+                                "title": "Not Found Error", "resource_type": "user", "parameter": "username"}]}
+        else:
+            body = {"data": corpus.user(i)}
+        return limited("users_lookup", request, body)
+
+    @app.post("/2/tweets")
+    async def create_tweet(request: Request):
+        payload = await request.json()
+        corpus.created_tweets += 1
+        tweet_id = str(TWEET_ID_BASE + corpus.total + corpus.created_tweets)
+        return limited("tweet_create", request, {"data": {"id": tweet_id, "text": payload.get("text", "")}}, 201)
+
+    @app.post("/2/dm_conversations/with/{participant_id}/messages")
+    async def create_dm(request: Request, participant_id: str):
+        if not participant_id.isdigit() or not 0 < int(participant_id) <= corpus.users:
+            return JSONResponse({"title": "Invalid Request", "detail": "participant not found"}, status_code=400)
+        corpus.created_tweets += 1
+        return limited("dm_create", request, {
+            "data": {
+                "dm_conversation_id": f"{participant_id}-1",
+                "dm_event_id": str(TWEET_ID_BASE + corpus.total + corpus.created_tweets)
+            }
+        }, 201)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "online", "users": corpus.users, "tweets": corpus.total, "topics": len(TOPICS)}
+
+    return app
+
+
+def main():
+    """Start the fake X API server"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake X API v2 server for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tweets-per-user", type=int, default=20)
+    parser.add_argument("--search-limit", type=int, default=DEFAULT_LIMITS["search"], help="Search requests per window")
+    parser.add_argument("--write-limit", type=int, default=DEFAULT_LIMITS["tweet_create"], help="Tweet/DM creates per window")
+    parser.add_argument("--window-seconds", type=int, default=900)
+    args = parser.parse_args()
+
+    app = create_app(
+        users=args.users,
+        tweets_per_user=args.tweets_per_user,
+        limits={"search": args.search_limit, "tweet_create": args.write_limit, "dm_create": args.write_limit},
+        window_seconds=args.window_seconds
+    )
+    print(f"🚀 Starting fake X API on {args.host}:{args.port} ({args.users:,} users, {args.users * args.tweets_per_user:,} tweets)")
+    print(f"💡 Point the backend at it with X_API_BASE_URL=http://{args.host}:{args.port}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
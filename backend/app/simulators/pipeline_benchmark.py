@@ -0,0 +1,531 @@
+"""
+Sourcing Pipeline Benchmark - Synthetic-load throughput of SourcingAgent
+
+Drives the real pipeline code (pre-filter, LinkedIn enrichment, pre-scoring,
+routing, checkpoints, database saves, logging) with stand-in backends whose
+latency is configurable:
+- X search returns synthetic users from the fake X API corpus, one page
+  (100 posts) per X latency
+- Grok role verification and scoring answer deterministically after the
+  Grok latency, through the same post_with_retries call sites
+- Embedding, vector store and topic discovery sleep and return fixed data
+
+Each (scale, configuration) run gets a fresh SQLite database (every table
+recreated in a scratch file, removed afterwards) and reports:
+- per-step duration, items and items/second (from the run's timing waterfall)
+- end-to-end latency percentiles: pipeline start → each candidate scored
+- external call latency percentiles per call name
+- peak Python memory (tracemalloc) and process max RSS
+- database write statements, rows and commits, by table
+
+Run from backend/:
+    python -m app.simulators.pipeline_benchmark --scales 100,1000,10000 \\
+        --configs batch,streaming:4,streaming:16 --grok-latency-ms 200 \\
+        --output benchmark.json [--baseline previous.json]
+
+Scoring is unbudgeted by default (--scoring-budget 0) so Step 6 sees every
+candidate; pass the production values to benchmark budgeted runs.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+# ========================================
+# STAND-IN BACKENDS
+# ========================================
+
+POSTS_PER_X_PAGE = 100
+
+
+def span(name: str):
+    # Imported on use: app.utils pulls in the database, whose URL main() sets first
+    from app.utils.timing import span as timing_span
+    return timing_span(name)
+
+
+class StandInBackends:
+    """Synthetic X, Grok and embedding backends with configurable latency"""
+
+    def __init__(
+        self,
+        users: int,
+        signals_per_user: int = 3,
+        x_latency: float = 0.2,
+        grok_latency: float = 0.5,
+        embedding_latency: float = 0.2,
+        jitter: float = 0.2,
+        developer_rate: float = 0.8
+    ):
+        from app.simulators.fake_x_api import Corpus
+        self.corpus = Corpus(users, signals_per_user)
+        self.users = users
+        self.signals_per_user = signals_per_user
+        self.x_latency = x_latency
+        self.grok_latency = grok_latency
+        self.embedding_latency = embedding_latency
+        self.jitter = jitter
+        self.developer_rate = developer_rate
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    def _delay(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter) if seconds else 0.0
+
+    # ---- X ----
+
+    def user(self, i: int) -> Dict:
+        """Step 3 user record (same shape as x_api_service.user_from_tweet + signals)"""
+        profile = self.corpus.user(i)
+        signals = []
+        for k in range(self.signals_per_user):
+            tweet = self.corpus.tweet(i + k * self.users)
+            metrics = tweet["public_metrics"]
+            signals.append({
+                "type": "post",
+                "tweet_id": tweet["id"],
+                "text": tweet["text"],
+                "engagement": {
+                    "retweets": metrics["retweet_count"],
+                    "likes": metrics["like_count"],
+                    "replies": metrics["reply_count"]
+                },
+                "created_at": tweet["created_at"],
+                "topic": ""
+            })
+        return {
+            "username": profile["username"],
+            "user_id": profile["id"],
+            "name": profile["name"],
+            "bio": profile["description"],
+            "followers": profile["public_metrics"]["followers_count"],
+            "following": profile["public_metrics"]["following_count"],
+            "verified": profile["verified"],
+            "signals": signals
+        }
+
+    @property
+    def users_per_page(self) -> int:
+        return max(POSTS_PER_X_PAGE // self.signals_per_user, 1)
+
+    def discover_users(self, topics, search_queries, max_results=10, stop_event=None) -> List[Dict]:
+        users = []
+        for start in range(0, self.users, self.users_per_page):
+            if stop_event is not None and stop_event.is_set():
+                break
+            self.calls["x.search_recent_tweets"] += 1
+            with span("x.search_recent_tweets"):
+                time.sleep(self._delay(self.x_latency))
+            users.extend(self.user(i) for i in range(start, min(start + self.users_per_page, self.users)))
+        return users
+
+    async def stream_users(self, topics, search_queries, max_users: int = 100, **kwargs):
+        limit = min(max_users, self.users)
+        for start in range(0, limit, self.users_per_page):
+            self.calls["x.search_recent_tweets"] += 1
+            with span("x.search_recent_tweets"):
+                await asyncio.sleep(self._delay(self.x_latency))
+            for i in range(start, min(start + self.users_per_page, limit)):
+                yield self.user(i)
+
+    # ---- Grok ----
+
+    async def grok_post(self, client, url: str, span_name: str = "http.post", **kwargs):
+        import httpx
+
+        prompt = kwargs["json"]["messages"][-1]["content"]
+        digest = zlib.crc32(prompt.encode())
+        if span_name == "grok.verify_role":
+            content = {
+                "is_developer": (digest % 100) < self.developer_rate * 100,
+                "role_type": "backend",
+                "confidence": 60 + digest % 35,
+                "reasoning": "Synthetic classification",
+                "signals": []
+            }
+        else:
+            content = {
+                "compatibility_score": 20 + digest % 76,
+                "skill_match": 50 + digest % 50,
+                "experience_match": 50 + (digest >> 8) % 50,
+                "domain_alignment": 50 + (digest >> 16) % 50,
+                "strengths": ["Synthetic strength"],
+                "weaknesses": [],
+                "reasoning": "Synthetic score"
+            }
+
+        with span(span_name):
+            self.calls[span_name] += 1
+            await asyncio.sleep(self._delay(self.grok_latency))
+            return httpx.Response(
+                200,
+                json={"choices": [{"message": {"content": json.dumps(content)}}]},
+                request=httpx.Request("POST", url)
+            )
+
+    async def discover_topics(self, job_title: str, job_description: str, *args, **kwargs) -> Dict:
+        self.calls["grok.topics"] += 1
+        with span("grok.topics"):
+            await asyncio.sleep(self._delay(self.grok_latency))
+        return {"topics": ["python", "rust", "kubernetes"], "search_queries": ["python backend", "rust async"]}
+
+    async def parse_job_description(self, job_description: str) -> Dict:
+        return {"required_skills": ["Python", "PostgreSQL", "Kubernetes"], "experience_years": 3}
+
+    # ---- embeddings ----
+
+    def generate_embedding(self, text: str, *args, **kwargs) -> List[float]:
+        self.calls["openai.embedding"] += 1
+        with span("openai.embedding"):
+            time.sleep(self._delay(self.embedding_latency))
+        return [0.0] * 1536
+
+    def store_job_embedding(self, job_id: int, embedding: List[float], metadata: Dict) -> str:
+        self.calls["pinecone.upsert"] += 1
+        with span("pinecone.upsert"):
+            time.sleep(self._delay(self.embedding_latency))
+        return f"job_{job_id}"
+
+    def install(self):
+        """Point the pipeline's backend call sites at these stand-ins"""
+        from app.services import sourcing_agent, grok_role_service, grok_scoring_service
+
+        sourcing_agent.generate_embedding = self.generate_embedding
+        sourcing_agent.store_job_embedding = self.store_job_embedding
+        sourcing_agent.discover_topics_from_job = self.discover_topics
+        sourcing_agent.parse_job_description = self.parse_job_description
+        sourcing_agent.discover_users_from_topics = self.discover_users
+        sourcing_agent.stream_users_from_topics = self.stream_users
+        grok_role_service.post_with_retries = self.grok_post
+        grok_scoring_service.post_with_retries = self.grok_post
+
+
+# ========================================
+# MEASUREMENT
+# ========================================
+
+_WRITE = re.compile(r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)', re.IGNORECASE)
+
+
+class DatabaseWriteCounter:
+    """Counts write statements, rows and commits on an engine"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.engine = engine
+        self.reset()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def reset(self):
+        self.statements = 0
+        self.rows = 0
+        self.commits = 0
+        self.by_table: Dict[str, int] = defaultdict(int)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        match = _WRITE.match(statement)
+        if not match:
+            return
+        self.statements += 1
+        self.rows += len(parameters) if executemany else 1
+        self.by_table[match.group(1).lower()] += 1
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def summary(self) -> Dict:
+        return {
+            "statements": self.statements,
+            "rows": self.rows,
+            "commits": self.commits,
+            "statements_by_table": dict(sorted(self.by_table.items()))
+        }
+
+
+def percentiles(values: List[float]) -> Dict:
+    """Nearest-rank p50/p90/p99 and max (seconds)"""
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))], 4)
+
+    return {"count": len(ordered), "p50": rank(0.50), "p90": rank(0.90), "p99": rank(0.99), "max": round(ordered[-1], 4)}
+
+
+# Items each step handles, from the pipeline result
+STEP_ITEMS = {
+    "step3_discover_x_users": "x_users_found",
+    "step4_verify_developer_role": "x_users_found",
+    "step5_enrich_with_linkedin": "verified_developers",
+    "step6_compute_compatibility": "scored_candidates",
+    "save_and_queue_outreach": "scored_candidates",
+    "db.save_candidates": "scored_candidates"
+}
+
+
+def _step_throughput(waterfall: Dict, result: Dict) -> List[Dict]:
+    rows = []
+    for step in waterfall["steps"]:
+        items = result.get(STEP_ITEMS.get(step["name"], ""), None)
+        rows.append({
+            "name": step["name"],
+            "duration": step["duration"],
+            "items": items,
+            "items_per_second": round(items / step["duration"], 2) if items and step["duration"] else None,
+            "calls": step["calls"],
+            "concurrency": step["concurrency"]
+        })
+    return rows
+
+
+# ========================================
+# RUNNER
+# ========================================
+
+def parse_config(config: str) -> Dict:
+    """"batch" or "streaming:<concurrency>" """
+    mode, _, concurrency = config.partition(":")
+    if mode not in ("batch", "streaming"):
+        raise ValueError(f"Unknown configuration {config!r} (use batch or streaming:<n>)")
+    return {"name": config, "mode": mode, "concurrency": int(concurrency) if concurrency else None}
+
+
+async def run_once(scale: int, config: Dict, settings: Dict, trace_memory: bool = True, verbose: bool = False) -> Dict:
+    """Run one pipeline against a fresh database and measure it"""
+    from sqlmodel import Session, SQLModel
+    from app.db.database import engine, read_engine, init_db
+    from app.models.schemas import Job
+    from app.services.sourcing_agent import SourcingAgent
+    from app.services.event_hub import pipeline_events
+    from app.utils.logger import AgentLogger
+    from app.utils.timing import trace_run
+
+    backends = StandInBackends(
+        scale,
+        signals_per_user=settings["signals_per_user"],
+        x_latency=settings["x_latency_ms"] / 1000,
+        grok_latency=settings["grok_latency_ms"] / 1000,
+        embedding_latency=settings["embedding_latency_ms"] / 1000,
+        jitter=settings["jitter"]
+    )
+    backends.install()
+
+    # Fresh database: recreate every table of the scratch database
+    engine.dispose()
+    read_engine.dispose()
+    SQLModel.metadata.drop_all(engine)
+    init_db()
+    with Session(engine) as session:
+        job = Job(
+            title="Senior Backend Engineer",
+            description="Python, PostgreSQL and Kubernetes. Build reliable APIs at scale.",
+            requirements={"required_skills": ["Python", "PostgreSQL", "Kubernetes"], "experience_years": 3}
+        )
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+
+    writes = DatabaseWriteCounter(engine)
+    agent = SourcingAgent()
+    started = time.perf_counter()
+    scored_at: List[float] = []
+    publish_scored = agent._publish_scored
+
+    def record_scored(candidate, job_id, recommendation=None):
+        scored_at.append(time.perf_counter() - started)
+        publish_scored(candidate, job_id, recommendation)
+
+    agent._publish_scored = record_scored
+    pipeline_id = f"benchmark_{scale}_{config['name'].replace(':', '_')}_{int(time.time())}"
+
+    if trace_memory:
+        tracemalloc.start()
+    output = io.StringIO()
+    try:
+        with trace_run(pipeline_id) as trace, pipeline_events(pipeline_id, [job.id]), \
+                contextlib.redirect_stdout(sys.stdout if verbose else output):
+            started = time.perf_counter()
+            if config["mode"] == "streaming":
+                result = await agent.run_streaming_pipeline(
+                    job_id=job.id, job_title=job.title, job_description=job.description,
+                    max_users=scale, concurrency=config["concurrency"] or 4, pipeline_id=pipeline_id
+                )
+            else:
+                result = await agent.run_full_pipeline(
+                    job_id=job.id, job_title=job.title, job_description=job.description, pipeline_id=pipeline_id
+                )
+    finally:
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        # Log rows queued from the event loop belong to this run's database
+        AgentLogger.flush()
+        engine.dispose()
+
+    waterfall = trace.waterfall()
+    call_durations: Dict[str, List[float]] = defaultdict(list)
+    for s in waterfall["spans"]:
+        if s["kind"] == "call":
+            call_durations[s["name"]].append(s["duration"])
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {
+        "scale": scale,
+        "config": config["name"],
+        "mode": config["mode"],
+        "concurrency": config["concurrency"],
+        "wall_seconds": waterfall["wall_seconds"],
+        "external_call_seconds": waterfall["total_seconds"],
+        "call_concurrency": waterfall["concurrency"],
+        "counts": {
+            "x_users_found": result.get("x_users_found", 0),
+            "verified_developers": result.get("verified_developers", 0),
+            "scored_candidates": result.get("scored_candidates", 0),
+            "reach_out_count": result.get("reach_out_count", 0)
+        },
+        "candidates_per_second": round(result.get("scored_candidates", 0) / waterfall["wall_seconds"], 2)
+        if waterfall["wall_seconds"] else None,
+        "steps": _step_throughput(waterfall, result),
+        "candidate_latency": percentiles(scored_at),
+        "call_latency": {name: percentiles(durations) for name, durations in sorted(call_durations.items())},
+        "backend_calls": dict(backends.calls),
+        "memory": {
+            "tracemalloc_peak_mb": round(peak / (1024 * 1024), 2) if peak is not None else None,
+            "max_rss_mb": round(max_rss, 1)
+        },
+        "db_writes": writes.summary()
+    }
+
+
+def compare(results: List[Dict], baseline: Dict) -> List[Dict]:
+    """Wall time and candidates/second of each run against the same (scale, config) in a baseline file"""
+    previous = {(r["scale"], r["config"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in results:
+        b = previous.get((r["scale"], r["config"]))
+        if b is None:
+            continue
+        rows.append({
+            "scale": r["scale"],
+            "config": r["config"],
+            "wall_seconds": {"current": r["wall_seconds"], "baseline": b["wall_seconds"],
+                             "ratio": round(r["wall_seconds"] / b["wall_seconds"], 2) if b["wall_seconds"] else None},
+            "candidates_per_second": {"current": r["candidates_per_second"], "baseline": b["candidates_per_second"]},
+            "db_write_statements": {"current": r["db_writes"]["statements"], "baseline": b["db_writes"]["statements"]}
+        })
+    return rows
+
+
+async def run_benchmark(scales: List[int], configs: List[str], settings: Dict, trace_memory: bool = True, verbose: bool = False) -> Dict:
+    """Run every (scale, configuration) pair and collect the results"""
+    results = []
+    for scale in scales:
+        for config in map(parse_config, configs):
+            print(f"▶️ {scale} users, {config['name']}...")
+            result = await run_once(scale, config, settings, trace_memory, verbose)
+            latency = result["candidate_latency"]
+            print(f"   {result['wall_seconds']}s wall, {result['counts']['scored_candidates']} scored "
+                  f"({result['candidates_per_second']}/s), candidate p50 {latency['p50']}s p99 {latency['p99']}s, "
+                  f"{result['db_writes']['statements']} DB writes, peak {result['memory']['tracemalloc_peak_mb']} MB")
+            results.append(result)
+
+    return {
+        "benchmark": "sourcing_pipeline",
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {**settings, "tracemalloc": trace_memory},
+        "results": results
+    }
+
+
+# ========================================
+# CLI
+# ========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sourcing pipeline with synthetic X users")
+    parser.add_argument("--scales", default="100,1000,10000", help="Comma-separated user counts")
+    parser.add_argument("--configs", default="batch,streaming:4,streaming:16",
+                        help="Comma-separated configurations: batch, streaming:<concurrency>")
+    parser.add_argument("--x-latency-ms", type=float, default=200, help="Latency per X search page")
+    parser.add_argument("--grok-latency-ms", type=float, default=500, help="Latency per Grok call")
+    parser.add_argument("--embedding-latency-ms", type=float, default=200, help="Latency per embedding/vector store call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Uniform latency jitter (0.2 = ±20%%)")
+    parser.add_argument("--signals-per-user", type=int, default=3)
+    parser.add_argument("--scoring-budget", type=int, default=0, help="SCORING_BUDGET for the run (0 = unlimited)")
+    parser.add_argument("--headcount-multiplier", type=int, default=0,
+                        help="SCORING_HEADCOUNT_MULTIPLIER for the run (0 = no early stop)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip memory tracing (it slows Python code)")
+    parser.add_argument("--output", default=None, help="Results file (default pipeline_benchmark_<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output or f"pipeline_benchmark_{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json")
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    # Read by the pipeline modules at import
+    os.environ["SCORING_BUDGET"] = str(args.scoring_budget)
+    os.environ["SCORING_HEADCOUNT_MULTIPLIER"] = str(args.headcount_multiplier)
+    os.environ["XAI_API_KEY"] = os.environ.get("XAI_API_KEY") or "benchmark"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+    os.environ.setdefault("X_BEARER_TOKEN", "benchmark")
+    # A scratch database, never DATABASE_URL's; runs recreate its tables
+    scratch = tempfile.mkdtemp(prefix="pipeline_benchmark_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'pipeline_benchmark.db')}"
+    os.environ["DATABASE_READ_URL"] = ""
+
+    settings = {
+        "x_latency_ms": args.x_latency_ms,
+        "grok_latency_ms": args.grok_latency_ms,
+        "embedding_latency_ms": args.embedding_latency_ms,
+        "jitter": args.jitter,
+        "signals_per_user": args.signals_per_user,
+        "scoring_budget": args.scoring_budget,
+        "headcount_multiplier": args.headcount_multiplier
+    }
+    try:
+        report = asyncio.run(run_benchmark(
+            [int(s) for s in args.scales.split(",")],
+            [c.strip() for c in args.configs.split(",")],
+            settings,
+            trace_memory=not args.no_tracemalloc,
+            verbose=args.verbose
+        ))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if baseline:
+        with open(baseline) as f:
+            report["comparison"] = compare(report["results"], json.load(f))
+        for row in report["comparison"]:
+            print(f"📈 {row['scale']} {row['config']}: wall {row['wall_seconds']['baseline']}s → "
+                  f"{row['wall_seconds']['current']}s (x{row['wall_seconds']['ratio']})")
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
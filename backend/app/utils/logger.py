@@ -1,8 +1,39 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlmodel import Session
 from app.models.schemas import AgentLog
 from app.db.database import engine
+from app.services.event_hub import event_hub, log_event
+
+# Writes logged from the event loop, one at a time so rows keep their order
+_log_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-log")
+
+
+def _write_log(logtype: str, message: str, job_id: Optional[int], candidate_id: Optional[int],
+               context: Optional[Dict], timestamp: datetime):
+    try:
+        with Session(engine) as session:
+            log_entry = AgentLog(
+                logtype=logtype,
+                log=message,
+                job_id=job_id,
+                candidate_id=candidate_id,
+                context=context,
+                timestamp=timestamp
+            )
+            session.add(log_entry)
+            session.flush()  # Assigns the ID without a refresh after commit
+            entry = log_event(log_entry)
+            session.commit()
+        # Push to live dashboards
+        event_hub.publish_log(entry)
+    except Exception as e:
+        # Don't let logging failures break the main application
+        print(f"Failed to log agent action: {e}")
+
 
 class AgentLogger:
     """Utility class for logging agent actions to the database"""
@@ -24,22 +55,24 @@ class AgentLogger:
             job_id: Optional job ID for context
             candidate_id: Optional candidate ID for context
             **kwargs: Additional context data
+
+        On the event loop the row is written by a background thread, so
+        logging never blocks other requests; elsewhere it is written before
+        returning.
         """
+        args = (logtype, message, job_id, candidate_id, kwargs if kwargs else None, datetime.utcnow())
         try:
-            with Session(engine) as session:
-                log_entry = AgentLog(
-                    logtype=logtype,
-                    log=message,
-                    job_id=job_id,
-                    candidate_id=candidate_id,
-                    context=kwargs if kwargs else None,
-                    timestamp=datetime.utcnow()
-                )
-                session.add(log_entry)
-                session.commit()
-        except Exception as e:
-            # Don't let logging failures break the main application
-            print(f"Failed to log agent action: {e}")
+            asyncio.get_running_loop()
+        except RuntimeError:
+            _write_log(*args)
+            return
+        # Copy the context so the live event keeps its pipeline tags
+        _log_writer.submit(contextvars.copy_context().run, _write_log, *args)
+    
+    @staticmethod
+    def flush():
+        """Wait for log rows queued from the event loop to be written"""
+        _log_writer.submit(lambda: None).result()
     
     @staticmethod
     def log_sourcing(message: str, job_id: Optional[int] = None, candidate_id: Optional[int] = None, **kwargs):
@@ -0,0 +1,60 @@
+"""
+Retry helpers for per-item calls to external APIs
+
+Transient failures (timeouts, connection errors, 429 and 5xx responses) are
+retried with jittered exponential backoff, so one flaky call costs a few
+seconds for that item instead of dropping it or failing the whole step.
+"""
+import os
+import random
+import asyncio
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+import httpx
+from app.utils.timing import span
+
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1"))
+
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+class TransientError(Exception):
+    """A failure worth retrying"""
+
+
+async def retry_async(
+    fn: Callable[..., Awaitable[T]],
+    *args,
+    attempts: int = RETRY_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY_SECONDS,
+    retry_on: Tuple[Type[BaseException], ...] = (TransientError, httpx.TransportError),
+    **kwargs
+) -> T:
+    """
+    Await fn(*args, **kwargs), retrying `retry_on` errors with exponential backoff
+
+    The last error is raised once all attempts are used.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn(*args, **kwargs)
+        except retry_on as e:
+            if attempt == attempts:
+                raise
+            delay = base_delay * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+            print(f"  🔁 Attempt {attempt}/{attempts} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def post_with_retries(client: httpx.AsyncClient, url: str, span_name: str = "http.post", **kwargs) -> httpx.Response:
+    """POST with retries on timeouts, connection errors and transient status codes (timed as one span)"""
+    async def post() -> httpx.Response:
+        response = await client.post(url, **kwargs)
+        if response.status_code in TRANSIENT_STATUS_CODES:
+            raise TransientError(f"HTTP {response.status_code}")
+        return response
+
+    with span(span_name):
+        return await retry_async(post)
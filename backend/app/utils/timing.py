@@ -0,0 +1,257 @@
+"""
+Span timing for pipeline runs
+
+A run opens a RunTrace with trace_run(); every span() opened while it is
+active (in the same task, in tasks it creates or in asyncio.to_thread calls,
+since they all inherit the context) is recorded with its start offset,
+duration and parent span. Outside a run, span() costs one ContextVar lookup.
+
+    with trace_run(pipeline_id) as trace:
+        with span("step3_discover_x_users", kind="step"):
+            with span("x.search_recent_tweets", query=q):
+                ...
+    waterfall = trace.waterfall()
+"""
+import time
+import asyncio
+import functools
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+_current_trace: ContextVar[Optional["RunTrace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+# Called as listener(step_name, "started" | "completed" | "failed", seconds) around step spans
+_step_listeners: List[Callable[[str, str, Optional[float]], None]] = []
+
+
+class RunTrace:
+    """Spans recorded during one pipeline run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self.spans: List[Dict] = []
+        self._ids = itertools.count(1)
+
+    def _open(self, name: str, kind: str, attrs: Dict) -> Dict:
+        record = {
+            "id": next(self._ids),
+            "parent": _current_span.get(),
+            "name": name,
+            "kind": kind,
+            "start": time.perf_counter() - self.started,
+            "duration": None,
+            "error": None,
+            **({"attrs": attrs} if attrs else {})
+        }
+        self.spans.append(record)  # list.append is atomic, so worker threads can record too
+        return record
+
+    def finish(self):
+        if self.ended is None:
+            self.ended = time.perf_counter()
+
+    def waterfall(self) -> Dict:
+        """
+        Summarize the run
+
+        Returns:
+            {
+                "wall_seconds": run duration,
+                "total_seconds": summed duration of external calls,
+                "concurrency": total_seconds / wall_seconds (average calls in flight),
+                "peak_concurrency": most calls in flight at once,
+                "steps": [{name, start, duration, spans, calls, call_seconds, concurrency}],
+                "calls": {name: {count, total_seconds, max_seconds, errors}},
+                "spans": [...every span, in start order]
+            }
+        """
+        end = (self.ended or time.perf_counter()) - self.started
+        spans = sorted(self.spans, key=lambda s: s["start"])
+        for s in spans:
+            if s["duration"] is None:  # still open (e.g. cancelled mid-call)
+                s["duration"] = end - s["start"]
+
+        calls = [s for s in spans if s["kind"] == "call"]
+        call_seconds = sum(s["duration"] for s in calls)
+
+        by_id = {s["id"]: s for s in spans}
+
+        def step_of(s: Dict) -> Optional[int]:
+            while s is not None:
+                if s["kind"] == "step":
+                    return s["id"]
+                s = by_id.get(s["parent"])
+            return None
+
+        # Spans of one step (checkpoint chunks, per-job scoring) merge into one row
+        steps: Dict[str, Dict] = {}
+        for step in (s for s in spans if s["kind"] == "step"):
+            row = steps.setdefault(step["name"], {
+                "name": step["name"], "start": step["start"], "end": 0.0, "spans": 0, "calls": 0, "call_seconds": 0.0
+            })
+            row["end"] = max(row["end"], step["start"] + step["duration"])
+            row["spans"] += 1
+        for c in calls:
+            step_id = step_of(c)
+            if step_id is not None:
+                row = steps[by_id[step_id]["name"]]
+                row["calls"] += 1
+                row["call_seconds"] += c["duration"]
+        for row in steps.values():
+            duration = row.pop("end") - row["start"]
+            row["start"] = round(row["start"], 4)
+            row["duration"] = round(duration, 4)
+            row["concurrency"] = round(row["call_seconds"] / duration, 2) if duration else 0.0
+            row["call_seconds"] = round(row["call_seconds"], 4)
+
+        call_stats: Dict[str, Dict] = {}
+        for c in calls:
+            stats = call_stats.setdefault(c["name"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "errors": 0})
+            stats["count"] += 1
+            stats["total_seconds"] += c["duration"]
+            stats["max_seconds"] = max(stats["max_seconds"], c["duration"])
+            stats["errors"] += 1 if c["error"] else 0
+        for stats in call_stats.values():
+            stats["total_seconds"] = round(stats["total_seconds"], 4)
+            stats["max_seconds"] = round(stats["max_seconds"], 4)
+
+        # Sweep call start/end events for the most calls in flight at once
+        events = sorted([(c["start"], 1) for c in calls] + [(c["start"] + c["duration"], -1) for c in calls])
+        in_flight = peak = 0
+        for _, delta in events:
+            in_flight += delta
+            peak = max(peak, in_flight)
+
+        return {
+            "wall_seconds": round(end, 4),
+            "total_seconds": round(call_seconds, 4),
+            "concurrency": round(call_seconds / end, 2) if end else 0.0,
+            "peak_concurrency": peak,
+            "steps": list(steps.values()),
+            "calls": call_stats,
+            "spans": [
+                {**s, "start": round(s["start"], 4), "duration": round(s["duration"], 4)}
+                for s in spans
+            ]
+        }
+
+
+def current_trace() -> Optional[RunTrace]:
+    return _current_trace.get()
+
+
+def add_step_listener(listener: Callable[[str, str, Optional[float]], None]):
+    """Notify `listener` when a step span of an active run starts and ends"""
+    if listener not in _step_listeners:
+        _step_listeners.append(listener)
+
+
+def _notify_step(name: str, status: str, seconds: Optional[float] = None):
+    for listener in _step_listeners:
+        try:
+            listener(name, status, seconds)
+        except Exception as e:
+            # Listeners never break the step they observe
+            print(f"Step listener failed: {e}")
+
+
+@contextmanager
+def trace_run(name: str):
+    """Record spans opened inside the block (and inside tasks and threads it starts)"""
+    trace = RunTrace(name)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, kind: str = "call", **attrs):
+    """
+    Time a block as part of the active run (no-op without one)
+
+    Args:
+        name: Span name, e.g. "step4_verify_developer_role" or "grok.verify_role"
+        kind: "step" for pipeline steps, "call" for external calls, "work" for anything else
+        **attrs: Extra detail stored with the span
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    record = trace._open(name, kind, attrs)
+    token = _current_span.set(record["id"])
+    if kind == "step":
+        _notify_step(name, "started")
+    try:
+        yield
+    except BaseException as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration"] = time.perf_counter() - trace.started - record["start"]
+        _current_span.reset(token)
+        if kind == "step":
+            _notify_step(name, "failed" if record["error"] else "completed", record["duration"])
+
+
+def traced(name: str, kind: str = "call"):
+    """Decorator form of span() for sync and async functions"""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def compare_waterfalls(current: Dict, baseline: Dict) -> Dict:
+    """
+    Per-step and per-call deltas of one run's waterfall against another's
+
+    Positive deltas mean the current run was slower.
+    """
+    def delta(a: float, b: float) -> Dict:
+        return {
+            "current": a,
+            "baseline": b,
+            "delta": round(a - b, 4),
+            "ratio": round(a / b, 2) if b else None
+        }
+
+    base_steps = {s["name"]: s for s in baseline.get("steps", [])}
+    base_calls = baseline.get("calls", {})
+    return {
+        "wall_seconds": delta(current["wall_seconds"], baseline["wall_seconds"]),
+        "total_seconds": delta(current["total_seconds"], baseline["total_seconds"]),
+        "concurrency": delta(current["concurrency"], baseline["concurrency"]),
+        "steps": {
+            s["name"]: delta(s["duration"], base_steps[s["name"]]["duration"])
+            for s in current.get("steps", []) if s["name"] in base_steps
+        },
+        "calls": {
+            name: {
+                **delta(stats["total_seconds"], base_calls[name]["total_seconds"]),
+                "count": delta(stats["count"], base_calls[name]["count"])
+            }
+            for name, stats in current.get("calls", {}).items() if name in base_calls
+        }
+    }
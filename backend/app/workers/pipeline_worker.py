@@ -0,0 +1,176 @@
+"""
+Pipeline Worker - Runs queued sourcing pipelines outside the API process
+
+Claims pipelines from the pipeline queue, runs each as a tracked task,
+heartbeats while it runs (reporting the last completed step) and records
+the outcome. A cancellation requested through the API is picked up on the
+next heartbeat. When a worker shuts down, its running pipelines go back to
+the queue and the next claim resumes them from their checkpoints. Start as
+many workers as needed, on one or many machines sharing the database:
+
+    python -m app.workers.pipeline_worker --concurrency 2
+
+The API can also run one in-process (PIPELINE_INLINE_WORKER, on by default).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import uuid
+from typing import Dict, Optional, Set
+from app.services.pipeline_queue import get_pipeline_queue
+from app.services.pipeline_tasks import pipeline_tasks
+from app.services.pipeline_checkpoints import get_run
+from app.services.pipeline_runner import run_queued_pipeline
+from app.services.event_hub import event_hub
+from app.utils.logger import AgentLogger
+
+WORKER_CONCURRENCY = int(os.getenv("PIPELINE_WORKER_CONCURRENCY", "2"))
+POLL_INTERVAL_SECONDS = float(os.getenv("PIPELINE_POLL_INTERVAL_SECONDS", "2"))
+HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("PIPELINE_HEARTBEAT_INTERVAL_SECONDS", "10"))
+
+
+class PipelineWorker:
+    """Claims and runs queued pipelines, up to `concurrency` at a time"""
+
+    def __init__(self, worker_id: Optional[str] = None, concurrency: int = WORKER_CONCURRENCY):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.queue = get_pipeline_queue()
+        self._running: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- lifecycle ----
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self):
+        """Claim pipelines until cancelled"""
+        print(f"🛠️ Pipeline worker {self.worker_id} started (concurrency {self.concurrency})")
+        try:
+            while True:
+                try:
+                    requeued = await asyncio.to_thread(self.queue.requeue_stale)
+                    if requeued:
+                        print(f"🔁 Requeued {requeued} pipelines from unresponsive workers")
+
+                    while len(self._running) < self.concurrency:
+                        pipeline_job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+                        if pipeline_job is None:
+                            break
+                        task = asyncio.create_task(self._execute(pipeline_job))
+                        self._running.add(task)
+                        task.add_done_callback(self._running.discard)
+                except Exception as e:
+                    AgentLogger.log_error("Pipeline worker iteration failed", error=e, worker_id=self.worker_id)
+
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        finally:
+            # Stop our pipelines; they save partial results and are requeued
+            for task in list(self._running):
+                task.cancel()
+            if self._running:
+                await asyncio.gather(*self._running, return_exceptions=True)
+
+    # ---- one pipeline ----
+
+    def _progress(self, pipeline_id: str) -> Optional[Dict]:
+        run = get_run(pipeline_id)
+        if not run:
+            return None
+        return {
+            "last_completed_step": run["last_completed_step"],
+            "last_completed_step_name": run["last_completed_step_name"]
+        }
+
+    async def _execute(self, pipeline_job: Dict):
+        pipeline_id = pipeline_job["pipeline_id"]
+        job_ids = pipeline_job["payload"].get("job_ids", [])
+        print(f"▶️ Worker {self.worker_id} running {pipeline_id} (attempt {pipeline_job['attempts']})")
+
+        event_hub.publish(
+            "pipeline",
+            {"status": "running", "worker_id": self.worker_id, "attempts": pipeline_job["attempts"]},
+            pipeline_id=pipeline_id,
+            job_ids=job_ids
+        )
+        task = pipeline_tasks.start(job_ids, pipeline_id, run_queued_pipeline(pipeline_job))
+        try:
+            while not task.done():
+                await asyncio.wait([task], timeout=HEARTBEAT_INTERVAL_SECONDS)
+                if task.done():
+                    break
+                progress = await asyncio.to_thread(self._progress, pipeline_id)
+                state = await asyncio.to_thread(
+                    self.queue.heartbeat, pipeline_id, self.worker_id, progress
+                )
+                if state == "cancel_requested":
+                    print(f"⏹️ Cancellation requested for {pipeline_id}")
+                    task.cancel()
+                    await asyncio.wait([task])
+                elif state == "lost":
+                    # Requeued as stale; another worker owns it now
+                    print(f"⚠️ {pipeline_id} was requeued while running here, stopping this copy")
+                    task.cancel()
+                    await asyncio.wait([task])
+                    return
+        except asyncio.CancelledError:
+            # Worker shutting down: back to the queue, not a user cancellation
+            task.cancel()
+            await asyncio.wait([task])
+            if task.cancelled():
+                released = await asyncio.to_thread(self.queue.release, pipeline_id, self.worker_id)
+                if released:
+                    event_hub.publish("pipeline", {"status": released}, pipeline_id=pipeline_id, job_ids=job_ids)
+                    print(f"🔁 {pipeline_id} {released} (worker shutting down)")
+                return
+
+        if task.cancelled():
+            status, result, error = "cancelled", None, None
+        elif task.exception():
+            status, result, error = "failed", None, str(task.exception())
+        else:
+            status, result, error = "completed", task.result(), None
+
+        recorded = await asyncio.to_thread(self.queue.finish, pipeline_id, self.worker_id, status, result, error)
+        if not recorded:
+            print(f"⚠️ {pipeline_id} is owned by another worker, not recording {status}")
+            return
+        event_hub.publish(
+            "pipeline",
+            {"status": status, "result": result, "error": error},
+            pipeline_id=pipeline_id,
+            job_ids=job_ids
+        )
+        print(f"{'✅' if status == 'completed' else '⚠️'} {pipeline_id} {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued sourcing pipelines")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY)
+    parser.add_argument("--worker-id", default=None)
+    args = parser.parse_args()
+
+    from app.db.database import init_db
+    init_db()
+
+    worker = PipelineWorker(worker_id=args.worker_id, concurrency=args.concurrency)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Database migrations
+
+Usage (from backend/):
+    python migrate.py            # apply pending migrations
+    python migrate.py status     # applied and pending versions
+    python migrate.py check      # explain the hot endpoint queries; exits 1 on a full table scan
+
+The migrations themselves live in app/db/migrations.py.
+"""
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.db import migrations
+
+
+def run_upgrade():
+    print("=" * 60)
+    print("🔄 DATABASE MIGRATION")
+    print("=" * 60)
+    print()
+
+    applied = migrations.upgrade()
+    if applied:
+        print(f"\n✅ Applied {len(applied)} migration(s)")
+    else:
+        print("✅ Database is up to date")
+    print()
+
+
+def run_status():
+    for entry in migrations.status():
+        applied_at = entry["applied_at"]
+        state = f"applied {applied_at:%Y-%m-%d %H:%M}" if applied_at else "pending"
+        print(f"{'✅' if applied_at else '⏳'} {entry['version']:04d} {entry['name']:32} {state}")
+
+
+def run_check() -> int:
+    print("=" * 60)
+    print("🔍 QUERY PLAN CHECK")
+    print("=" * 60)
+    print()
+
+    results = migrations.check()
+    for name, result in results.items():
+        if result["full_scan"]:
+            print(f"⚠️  {name}: full scan")
+            for line in result["plan"]:
+                print(f"      {line}")
+        else:
+            print(f"✅ {name}: {', '.join(dict.fromkeys(result['indexes']))}")
+
+    scans = sum(1 for result in results.values() if result["full_scan"])
+    print()
+    print(f"{'⚠️ ' if scans else '✅'} {len(results) - scans}/{len(results)} queries use an index")
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command == "upgrade":
+        run_upgrade()
+    elif command == "status":
+        run_status()
+    elif command == "check":
+        sys.exit(run_check())
+    else:
+        print(__doc__)
+        sys.exit(1)
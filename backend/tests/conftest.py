@@ -0,0 +1,11 @@
+"""
+Pytest setup: point the app at a throwaway SQLite database
+
+Set before any test module imports app.db.database, so tests never write
+to the developer's grok_recruiter.db.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.pop("DATABASE_READ_URL", None)
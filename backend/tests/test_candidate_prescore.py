@@ -0,0 +1,54 @@
+"""
+Test candidate pre-scoring and the Step 6 scoring budget (offline, no API calls)
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.candidate_prescore import rank_by_prescore, ScoringBudget
+
+def candidate(username, skills, years, confidence, likes):
+    return {
+        "username": username,
+        "classification": {"confidence": confidence},
+        "linkedin_data": {"skills": skills, "years_of_experience": years},
+        "signals": [{"engagement": {"likes": likes, "retweets": 0, "replies": 0}}]
+    }
+
+def test_candidate_prescore():
+    print("=" * 60)
+    print("TESTING CANDIDATE PRE-SCORE")
+    print("=" * 60)
+
+    requirements = {"required_skills": ["Python", "FastAPI", "PostgreSQL"], "experience_years": 4}
+    candidates = [
+        candidate("junior_js", ["JavaScript", "CSS"], 1, 60, 2),
+        candidate("strong_match", ["Python", "FastAPI", "PostgreSQL", "Docker"], 6, 90, 80),
+        candidate("partial", ["Python", "Django"], 4, 75, 10)
+    ]
+
+    ranked = rank_by_prescore(candidates, requirements)
+    for c in ranked:
+        print(f"   @{c['username']}: {c['prescore']['prescore']} {c['prescore']['matched_skills']}")
+
+    assert [c['username'] for c in ranked] == ["strong_match", "partial", "junior_js"]
+    assert ranked[0]['prescore']['matched_skills'] == ["python", "fastapi", "postgresql"]
+
+    # Stops once headcount x multiplier candidates clear the interview threshold
+    budget = ScoringBudget(interview_threshold=75, headcount=1, limit=10, multiplier=2)
+    for score in [80, 50, 90]:
+        assert not budget.exhausted
+        budget.record({"compatibility": {"compatibility_score": score}})
+    assert budget.exhausted and "found 2" in budget.stop_reason
+
+    # Or once the call budget is spent
+    budget = ScoringBudget(interview_threshold=75, headcount=5, limit=2)
+    budget.record({"compatibility": {"compatibility_score": 10}})
+    budget.record({"compatibility": {"compatibility_score": 20}})
+    assert budget.exhausted and "budget" in budget.stop_reason
+
+    print("\n✅ CANDIDATE PRE-SCORE TEST PASSED")
+
+if __name__ == "__main__":
+    test_candidate_prescore()
@@ -0,0 +1,98 @@
+"""
+Test the LinkedIn profile index: handle lookup, scored name matching and
+streamed profile sources (offline)
+"""
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.linkedin_profiles import (
+    LinkedInProfileIndex, JsonlProfileSource, SqliteProfileSource,
+    name_trigrams, similarity, write_sqlite_store
+)
+
+PROFILES = [
+    {"x_handle": "@mleng_sarah", "name": "Sarah Chen"},
+    {"x_handle": "@backend_alex", "name": "Alex Rivera"},
+    {"x_handle": "@chen_li", "name": "Li Chen"},
+    {"x_handle": "@mleng_sarah", "name": "Sarah Duplicate"},
+    {"x_handle": "@rivera_dev", "name": "Maria  RIVERA"},
+    {"x_handle": "@jon_park", "name": "Jonathan Park"}
+]
+
+def test_linkedin_profile_index():
+    print("=" * 60)
+    print("TESTING LINKEDIN PROFILE INDEX")
+    print("=" * 60)
+
+    index = LinkedInProfileIndex(PROFILES)
+    assert len(index) == len(PROFILES)
+
+    # Handle lookup: with or without @, first duplicate wins
+    assert index.by_handle("mleng_sarah")["name"] == "Sarah Chen"
+    assert index.by_handle("@rivera_dev")["name"] == "Maria  RIVERA"
+    assert index.by_handle("nobody") is None
+
+    # Name matching returns the best match, not the first one sharing a word
+    queries = [
+        ("Li Chen", "Li Chen"),             # exact, although "Sarah Chen" comes first
+        ("chen, li", "Li Chen"),            # order, case and punctuation don't matter
+        ("Maria Rivera", "Maria  RIVERA"),  # although "Alex Rivera" comes first
+        ("Jonathon Park", "Jonathan Park"), # typo
+        ("Tom Rivera", None),               # shared surname alone is below threshold
+        ("Zed Q", None),
+        ("", None)
+    ]
+    for name, expected in queries:
+        match = index.match_name(name)
+        found = match[0]["name"] if match else None
+        print(f"   {name!r:16} → {found} ({match[1] if match else '-'})")
+        assert found == expected, f"{name}: expected {expected}, got {found}"
+
+    # Confidence threshold is adjustable; ties go to the earlier profile
+    assert index.match_name("Tom Rivera", threshold=0.3)[0]["name"] == "Alex Rivera"
+    assert index.by_name("Sarah Chen") is PROFILES[0]
+    assert similarity(name_trigrams("Sarah Chen"), name_trigrams("chen sarah")) == 1.0
+
+    print("\n✅ LINKEDIN PROFILE INDEX TEST PASSED")
+
+def test_profile_sources():
+    print("=" * 60)
+    print("TESTING STREAMED PROFILE SOURCES")
+    print("=" * 60)
+
+    directory = tempfile.mkdtemp()
+    jsonl_path = os.path.join(directory, "profiles.jsonl")
+    with open(jsonl_path, "w") as f:
+        for profile in PROFILES:
+            f.write(json.dumps(profile) + "\n")
+            f.write("\n")  # Blank lines are skipped
+    db_path = os.path.join(directory, "profiles.db")
+    assert write_sqlite_store(iter(PROFILES), db_path, batch_size=4) == len(PROFILES)
+
+    for source in (JsonlProfileSource(jsonl_path), SqliteProfileSource(db_path)):
+        loads = []
+        load = source.load
+        source.load = lambda position: loads.append(position) or load(position)
+
+        index = LinkedInProfileIndex(source)
+        print(f"   {type(source).__name__}: {len(index)} profiles, {len(loads)} bodies loaded")
+        assert len(index) == len(PROFILES)
+        assert loads == [], "Building the index must not load profile bodies"
+
+        assert index.by_handle("mleng_sarah") == PROFILES[0]
+        assert index.match_name("chen, li")[0] == PROFILES[2]
+        assert index.match_name("Tom Rivera") is None
+        assert loads == [0, 2], f"Only matched bodies are loaded, got {loads}"
+
+        index.by_handle("mleng_sarah")
+        assert loads == [0, 2], "Matched bodies are cached"
+
+    print("\n✅ PROFILE SOURCES TEST PASSED")
+
+if __name__ == "__main__":
+    test_linkedin_profile_index()
+    test_profile_sources()
@@ -3,9 +3,14 @@ Test X Outreach Service
 """
 import sys
 import os
+import tempfile
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Use a throwaway database, never the developer's (tests/conftest.py does the same under pytest)
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test_outreach.db")
+
+from app.db.database import init_db
 from app.services.x_outreach_service import generate_outreach_message, send_outreach_batch
 
 def test_outreach():
@@ -27,7 +32,7 @@ def test_outreach():
     
     print(f"Fast-track message:\n{message}\n")
     
-    # Test batch outreach (dry run)
+    # Test batch outreach (dry run, queued in the outbox)
     print("\n📧 Test 2: Batch Outreach (Dry Run)")
     print("-" * 60)
     
@@ -58,6 +63,7 @@ def test_outreach():
         }
     ]
     
+    init_db()
     results = send_outreach_batch(
         candidates=test_candidates,
         job_title="Senior ML Engineer",
@@ -66,18 +72,23 @@ def test_outreach():
     )
     
     print(f"\n✅ Results:")
-    print(f"   Sent: {results['sent']}")
-    print(f"   Failed: {results['failed']}")
-    print(f"   Total processed: {len(results['results'])}")
-    
-    print(f"\n📊 Breakdown:")
-    for result in results['results']:
-        status = "✅" if result['success'] else "❌"
-        print(f"   {status} @{result['username']} - {result['recommendation']}")
+    print(f"   Queued: {results['queued']}")
+    print(f"   Skipped (already queued or sent): {results['skipped']}")
     
     # Validate
-    assert results['sent'] == 3, "Should send to 3 candidates (not rejected one)"
-    assert results['failed'] == 0, "Dry run should not fail"
+    assert results['queued'] == 3, "Should queue 3 candidates (not rejected one)"
+    assert results['skipped'] == 0
+    assert len(results['message_ids']) == 3
+
+    # Queueing the same batch again is deduplicated
+    again = send_outreach_batch(
+        candidates=test_candidates,
+        job_title="Senior ML Engineer",
+        job_link="https://jobs.example.com/ml-engineer",
+        dry_run=True
+    )
+    print(f"   Second batch: queued {again['queued']}, skipped {again['skipped']}")
+    assert again['queued'] == 0 and again['skipped'] == 3, "Already queued candidates should be skipped"
     
     print("\n✅ OUTREACH TEST PASSED")
 
@@ -0,0 +1,55 @@
+"""
+Test X search query planner (offline, no API calls)
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.x_query_planner import plan_queries, attribute_tweet
+
+def test_query_planner():
+    print("=" * 60)
+    print("TESTING X QUERY PLANNER")
+    print("=" * 60)
+
+    queries = [
+        "optimizing LLM inference",
+        "PyTorch performance tuning",
+        "distributed training setup"
+    ]
+    topics = ["LLM inference", "machine learning", "backend engineering"]
+
+    already_run = set()
+    planned = plan_queries(queries + topics, already_run)
+
+    print(f"\n📝 {len(queries + topics)} terms → {len(planned)} requests")
+    for plan in planned:
+        print(f"   {plan['query']}")
+
+    # Everything fits in one request, with noise filters
+    assert len(planned) == 1, "Terms should merge into a single query"
+    assert planned[0]['query'].endswith("-is:retweet lang:en"), "Noise filters missing"
+
+    # "optimizing llm inference" is covered by the broader "llm inference"
+    assert "optimizing llm inference" not in planned[0]['terms']
+    assert "llm inference" in planned[0]['terms']
+
+    # Terms already run are dropped
+    assert plan_queries(["machine learning", "LLM inference tricks"], already_run) == []
+
+    # Length limit is respected
+    many = [f"distributed systems topic {i}" for i in range(60)]
+    for plan in plan_queries(many, max_length=512):
+        assert len(plan['query']) <= 512, "Query exceeds length limit"
+
+    # Tweets are attributed back to the term they match
+    terms = planned[0]['terms']
+    matched = attribute_tweet("New blog post: PyTorch performance tuning for #LLM inference", terms)
+    print(f"\n🔗 Attributed to: {matched}")
+    assert matched == ["pytorch performance tuning", "llm inference"]
+
+    print("\n✅ QUERY PLANNER TEST PASSED")
+
+if __name__ == "__main__":
+    test_query_planner()
@@ -0,0 +1,79 @@
+"""
+Test the local role pre-filter (offline, no API calls)
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.role_prefilter import classify_user, PrefilterStats, TECH_KEYWORDS
+
+def post(text):
+    return {"type": "post", "text": text}
+
+def test_role_prefilter():
+    print("=" * 60)
+    print("TESTING ROLE PRE-FILTER")
+    print("=" * 60)
+
+    users = {
+        "news_bot": {
+            "username": "news_bot",
+            "bio": "Breaking news and deals, 24/7. Official account.",
+            "followers": 250000, "following": 10,
+            "signals": [post("Markets open higher today"), post("Giveaway! Retweet to win")]
+        },
+        "ghost": {
+            "username": "ghost", "bio": "", "followers": 3, "following": 40, "signals": []
+        },
+        "rustacean": {
+            "username": "rustacean",
+            "bio": "Systems engineer. Rust compiler contributor. github.com/rustacean",
+            "followers": 1800, "following": 300,
+            "signals": [
+                post("Cut p99 latency in half by moving the parser to async Rust"),
+                post("Debugging a linux kernel deadlock with perf and gdb"),
+                post("Our compiler now emits SIMD for the hot loop")
+            ]
+        },
+        "maybe": {
+            "username": "maybe",
+            "bio": "Curious about everything",
+            "followers": 500, "following": 400,
+            "signals": [post("Trying out python for a side project this weekend"), post("Great coffee today")]
+        }
+    }
+
+    stats = PrefilterStats()
+    decisions = {}
+    for name, user in users.items():
+        decision, classification = classify_user(user)
+        stats.record(decision)
+        decisions[name] = decision
+        print(f"   @{name}: {decision} (score {classification['prefilter_score']:.0f})")
+
+    assert decisions["news_bot"] == "drop", "News bot should be dropped"
+    assert decisions["ghost"] == "drop", "Zero-post profile should be dropped"
+    assert decisions["rustacean"] == "pass", "Clear developer should pass without Grok"
+    assert decisions["maybe"] == "llm", "Ambiguous user should go to Grok"
+
+    # Clear positives get a Grok-shaped classification
+    _, classification = classify_user(users["rustacean"])
+    assert classification["is_developer"] is True
+    assert classification["role_type"] == "systems"
+    assert 0 < classification["confidence"] <= 95
+
+    # Its signals are tech skills (Step 5 copies them into the profile's skills)
+    print(f"\n🛠️ Signals: {classification['signals']}")
+    assert classification["signals"], "Passed user should have skill signals"
+    assert all(signal in TECH_KEYWORDS for signal in classification["signals"])
+    assert {"rust", "compiler", "linux"} <= set(classification["signals"])
+
+    summary = stats.summary()
+    print(f"\n🧹 {summary}")
+    assert summary["dropped"] == 2 and summary["llm_calls_saved"] == 3
+
+    print("\n✅ ROLE PRE-FILTER TEST PASSED")
+
+if __name__ == "__main__":
+    test_role_prefilter()
@@ -0,0 +1,83 @@
+"""
+Test incremental X signal refresh planning (offline, no API calls)
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Use a throwaway database, never the developer's (tests/conftest.py does the same under pytest)
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test_x_signal_store.db")
+
+from app.db.database import init_db
+from app.services import x_signal_store
+from app.services.x_signal_store import (
+    SNOWFLAKE_EPOCH_MS, _plan_refresh_queries, _tweet_id_time, persist_signals, refresh_known_users
+)
+
+def tweet_id_at(posted_at):
+    """Snowflake tweet ID for a post at posted_at"""
+    ms = int((posted_at - datetime(1970, 1, 1)).total_seconds() * 1000)
+    return str((ms - SNOWFLAKE_EPOCH_MS) << 22)
+
+def test_x_signal_store():
+    print("=" * 60)
+    print("TESTING X SIGNAL REFRESH PLANNING")
+    print("=" * 60)
+
+    now = datetime.utcnow()
+    since_ids = {
+        "quiet_dev": tweet_id_at(now - timedelta(days=30)),
+        "active_dev": tweet_id_at(now - timedelta(hours=2)),
+        "weekly_dev": tweet_id_at(now - timedelta(days=3)),
+    }
+
+    # Snowflake IDs carry their post time
+    assert abs(_tweet_id_time(since_ids["weekly_dev"]) - (now - timedelta(days=3))) < timedelta(seconds=1)
+
+    plans = _plan_refresh_queries(since_ids, now)
+    for group, since_id, start_time in plans:
+        print(f"   {group} since_id={since_id} start_time={start_time}")
+
+    # The quiet user's aged-out ID never widens (or breaks) the active users' query
+    assert plans[0] == (["quiet_dev"], None, plans[0][2])
+    assert now - timedelta(days=7) < plans[0][2] < now
+    assert plans[1] == (["weekly_dev", "active_dev"], since_ids["weekly_dev"], None)
+
+    # A refresh of the mixed-age group sends X no out-of-window since_id
+    init_db()
+    persist_signals([
+        {"username": username, "user_id": str(i + 1), "signals": [{"type": "post", "tweet_id": since_id, "text": "..."}]}
+        for i, (username, since_id) in enumerate(since_ids.items())
+    ])
+
+    requests = []
+    def search_page(query, max_results=100, next_token=None, since_id=None, start_time=None):
+        requests.append((query, since_id, start_time))
+        if since_id and _tweet_id_time(since_id) < now - timedelta(days=7):
+            raise ValueError("400: since_id is older than 7 days")
+        username = "quiet_dev" if "quiet_dev" in query else "active_dev"
+        return [{
+            "tweet_id": tweet_id_at(now - timedelta(minutes=len(requests))), "username": username,
+            "user_id": "1", "tweet_text": "Shipped a new Rust release", "engagement": {},
+            "created_at": now.isoformat()
+        }], None
+
+    original_search_page = x_signal_store.search_recent_tweets_page
+    x_signal_store.search_recent_tweets_page = search_page
+    try:
+        result = refresh_known_users(usernames=list(since_ids), force=True)
+    finally:
+        x_signal_store.search_recent_tweets_page = original_search_page
+    print(f"\n🔁 {result}")
+
+    assert len(requests) == 2
+    assert result["users_refreshed"] == 3 and result["users_incomplete"] == 0
+    assert result["signals_inserted"] == 2
+
+    print("\n✅ X SIGNAL STORE TEST PASSED")
+
+if __name__ == "__main__":
+    test_x_signal_store()
@@ -31,6 +31,9 @@ interface PipelineStatus {
   status: string;
 }
 
+// A cancelling pipeline is still running until it saves its partial results
+const isRunningStatus = (status?: string) => status === "running" || status === "cancelling";
+
 export function SourcingControl({ job, onPipelineStart, onPipelineComplete }: SourcingControlProps) {
   const [status, setStatus] = useState<PipelineStatus | null>(null);
   const [loading, setLoading] = useState(false);
@@ -39,22 +42,32 @@ export function SourcingControl({ job, onPipelineStart, onPipelineComplete }: So
   const [jobLink, setJobLink] = useState("");
   const [lastResult, setLastResult] = useState<string | null>(null);
 
-  // Poll pipeline status
+  // Follow pipeline status over the job's event stream
   useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        const statusData = await api.sourcing.getStatus(job.id);
-        setStatus(statusData);
-      } catch (error) {
-        console.error("Error checking pipeline status:", error);
+    const unsubscribe = api.events.subscribe(
+      { jobId: job.id },
+      (event) => {
+        if (event.type !== "pipeline") return;
+        const pipelineStatus = event.data.status;
+        const active = pipelineStatus === "queued" || pipelineStatus === "running" || pipelineStatus === "cancelling";
+        setStatus({
+          job_id: job.id,
+          is_running: isRunningStatus(pipelineStatus),
+          pipeline_id: active ? event.pipeline_id ?? undefined : undefined,
+          status: active ? pipelineStatus : "idle",
+        });
+      },
+      (snapshot) => {
+        const pipeline = snapshot.pipeline;
+        setStatus({
+          job_id: job.id,
+          is_running: isRunningStatus(pipeline?.status),
+          pipeline_id: pipeline?.pipeline_id,
+          status: pipeline?.status ?? "idle",
+        });
       }
-    };
-
-    checkStatus();
-    
-    // Poll every 2 seconds if pipeline is running
-    const interval = setInterval(checkStatus, 2000);
-    return () => clearInterval(interval);
+    );
+    return unsubscribe;
   }, [job.id]);
 
   const handleStartPipeline = async () => {
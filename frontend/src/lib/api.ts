@@ -434,6 +434,45 @@ export const teamsApi = {
   },
 };
 
+// Live events API (Server-Sent Events)
+export interface PipelineEvent {
+  id: string;
+  type: "pipeline" | "step" | "candidate" | "counters" | "log";
+  pipeline_id: string | null;
+  job_id: number | null;
+  job_ids: number[];
+  timestamp: string;
+  data: Record<string, any>;
+}
+
+export const eventsApi = {
+  // Subscribe to a channel; EventSource reconnects and resumes from the last event id by itself.
+  // Returns a function that closes the stream.
+  subscribe(
+    channel: { jobId?: number; pipelineId?: string },
+    onEvent: (event: PipelineEvent) => void,
+    onSnapshot?: (snapshot: Record<string, any>) => void
+  ): () => void {
+    const path = channel.jobId !== undefined
+      ? `/events/jobs/${channel.jobId}`
+      : channel.pipelineId
+        ? `/events/pipelines/${channel.pipelineId}`
+        : "/events/stream";
+    const source = new EventSource(`${API_BASE_URL}${path}`);
+
+    source.addEventListener("snapshot", (message) => {
+      onSnapshot?.(JSON.parse((message as MessageEvent).data));
+    });
+    for (const type of ["pipeline", "step", "candidate", "counters", "log"]) {
+      source.addEventListener(type, (message) => {
+        onEvent(JSON.parse((message as MessageEvent).data));
+      });
+    }
+
+    return () => source.close();
+  }
+};
+
 // Export all APIs
 export const api = {
   jobs: jobsApi,
@@ -443,4 +482,5 @@ export const api = {
   sourcing: sourcingApi,
   interviews: interviewsApi,
   teams: teamsApi,
+  events: eventsApi,
 };
\ No newline at end of file
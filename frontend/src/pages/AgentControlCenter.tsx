@@ -125,9 +125,11 @@ export default function AgentControlCenter() {
 
     loadData();
 
-    // Auto-refresh every 5 seconds
-    const interval = setInterval(fetchPipelines, 5000);
-    return () => clearInterval(interval);
+    // Refresh when a pipeline is queued, starts or finishes
+    const unsubscribe = api.events.subscribe({}, (event) => {
+      if (event.type === "pipeline") fetchPipelines();
+    });
+    return unsubscribe;
   }, []);
 
   return (